@@ -0,0 +1,107 @@
+import time
+
+from agents.grader import GRADE_SCHEMA
+from agents.profiler import PROFILE_SCHEMA
+from services.agent_json import AgentJSON, field, validate
+
+
+COMBINED_INSTRUCTIONS = """
+You are a COMBINED ASSESSMENT AGENT. You perform two independent assessments of the same candidate turn in one pass:
+
+PART 1 is the behavioral profile of the candidate's input, exactly as the BEHAVIORAL PROFILER below would produce it.
+PART 2 is the evaluation of the candidate's answer, exactly as the EVALUATION AGENT below would produce it.
+
+Apply each part's instructions, rubric and output format on its own; do not let one assessment influence the other.
+Respond with ONE JSON object and nothing else:
+
+{"profile": <PART 1 JSON object>, "grade": <PART 2 JSON object>}
+"""
+
+
+class AssessorAgent:
+    """
+    Profiles and grades a candidate turn with a single model call.
+
+    The request carries the profiler's and grader's own instructions and asks for both JSON
+    objects at once; each half is normalized by the agent it came from, so callers get exactly
+    what ProfilerAgent.analyze and GraderAgent.evaluate return. Turns the profiler can classify
+    locally skip the combined call, and a failed or malformed combined call falls back to the
+    two separate calls.
+    """
+
+    def __init__(self, client, profiler, grader):
+        self.client = client
+        self.profiler = profiler
+        self.grader = grader
+        # No fix-up retry: a reply that cannot be repaired falls back to the two separate calls
+        self.output = AgentJSON(client, "assessor", {"profile": field(dict, required=True),
+                                                     "grade": field(dict, required=True)}, retry=False)
+
+    def assess(self, user_input, context_history, grader_args, grade=True):
+        """Return (profile_data, grader_data); grader_data is {} when the turn is not graded."""
+        shortcut = self.profiler._shortcut(user_input)
+        if shortcut is not None:
+            return shortcut, self.grader.evaluate(*grader_args) if grade and self._gradable(shortcut) else {}
+        if not grade:
+            return self.profiler._llm_analysis(user_input, context_history), {}
+
+        llm_start = time.perf_counter()
+        try:
+            completion = self.client.complete("assessor", **self._request(user_input, context_history, grader_args))
+            return self._parse(completion, llm_start)
+        except Exception as e:
+            self.client.record_fallback("assessor", e)
+        profile_data = self.profiler._llm_analysis(user_input, context_history)
+        return profile_data, self.grader.evaluate(*grader_args) if self._gradable(profile_data) else {}
+
+    async def assess_async(self, user_input, context_history, grader_args, grade=True):
+        """assess() for the ASGI app; `client` and both agents must use an AsyncLLMClient."""
+        shortcut = self.profiler._shortcut(user_input)
+        if shortcut is not None:
+            return shortcut, await self.grader.evaluate_async(*grader_args) if grade and self._gradable(shortcut) else {}
+        if not grade:
+            return await self.profiler._llm_analysis_async(user_input, context_history), {}
+
+        llm_start = time.perf_counter()
+        try:
+            completion = await self.client.complete("assessor", **self._request(user_input, context_history, grader_args))
+            return self._parse(completion, llm_start)
+        except Exception as e:
+            self.client.record_fallback("assessor", e)
+        profile_data = await self.profiler._llm_analysis_async(user_input, context_history)
+        return profile_data, await self.grader.evaluate_async(*grader_args) if self._gradable(profile_data) else {}
+
+    @staticmethod
+    def _gradable(profile_data):
+        return profile_data['is_relevant'] and profile_data['persona'] != 'silent'
+
+    def _request(self, user_input, context_history, grader_args):
+        """Keyword arguments for the combined completion."""
+        answer, current_question, jd_text, resume_text, score_stats = grader_args
+        system_prompt = (
+            COMBINED_INSTRUCTIONS
+            + "\n### PART 1: BEHAVIORAL PROFILE\n" + self.profiler._system_prompt()
+            + "\n### PART 2: ANSWER EVALUATION\n" + self.grader._system_prompt(current_question, jd_text, resume_text, score_stats)
+        )
+        user_prompt = (
+            self.profiler._user_prompt(user_input, context_history)
+            + "\n\nEvaluate this response comprehensively based on the question and job requirements."
+            + '\n\nReturn {"profile": ..., "grade": ...}.'
+        )
+        return dict(
+            model="openai/gpt-oss-20b",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.1  # The grader's (lower) temperature; the profile tolerates it
+        )
+
+    def _parse(self, completion, llm_start):
+        result = self.output.parse(completion.choices[0].message.content)
+        profile_data = validate(result["profile"], PROFILE_SCHEMA)
+        grader_data = validate(result["grade"], GRADE_SCHEMA)
+        self.profiler._record_llm_latency(llm_start)
+        profile_data = self.profiler._normalize(profile_data)
+        return profile_data, self.grader._normalize(grader_data) if self._gradable(profile_data) else {}
@@ -0,0 +1,100 @@
+import re
+
+
+SUMMARY_HEADER = "Summary of earlier interview exchanges:\n"
+
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token) used for prompt budgeting."""
+    return len(text) // 4 + 1
+
+
+def strip_analysis(content):
+    """Keep only the spoken [RESPONSE] part of an interviewer message."""
+    if "[RESPONSE]" in content:
+        return content.split("[RESPONSE]")[-1].strip()
+    return content.replace("[ANALYSIS]", "").strip()
+
+
+class ConversationWindow:
+    """
+    Token-budgeted view of the conversation history for the interviewer prompt.
+
+    The last `max_turns` exchanges are sent verbatim (assistant messages reduced to their
+    [RESPONSE] text). Older messages are folded into a rolling summary kept in a per-session
+    `state` dict, so each message is summarized once as it ages out of the window rather than
+    re-processed every turn. If the result still exceeds `token_budget` (summary header
+    included), the oldest verbatim messages are summarized for this request as well, then the
+    oldest summary lines are dropped; a lone message over the budget is cut to its most recent text.
+    """
+
+    def __init__(self, max_turns=6, token_budget=2000, summary_budget=500, line_chars=160):
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.line_chars = line_chars
+
+    def build(self, history, state):
+        """Return (messages, stats) for the given history, updating the rolling summary in `state`."""
+        cleaned = [
+            {"role": msg["role"], "content": strip_analysis(msg["content"]) if msg["role"] == "assistant" else msg["content"]}
+            for msg in history
+            if msg.get("content")
+        ]
+
+        split = max(0, len(cleaned) - self.max_turns * 2)
+        folded = state.get("folded", 0)
+        if split < folded:
+            # History was reset or replaced; start the summary over
+            state["summary_lines"] = []
+            folded = 0
+        summary_lines = state.setdefault("summary_lines", [])
+        for msg in cleaned[folded:split]:
+            summary_lines.append(self._summarize(msg))
+        state["folded"] = split
+        self._trim(summary_lines)
+
+        recent = cleaned[split:]
+        extra_lines = []
+        while len(recent) > 1 and self._cost(summary_lines + extra_lines, recent) > self.token_budget:
+            extra_lines.append(self._summarize(recent.pop(0)))
+
+        lines = summary_lines + extra_lines
+        while lines and self._cost(lines, recent) > self.token_budget:
+            lines = lines[1:]
+        if recent and self._cost(lines, recent) > self.token_budget:
+            # A single message over the budget on its own keeps only its most recent text
+            chars = max(0, (self.token_budget - 1) * 4)
+            recent[0] = {**recent[0], "content": recent[0]["content"][-chars:] if chars else ""}
+
+        messages = self._messages(lines, recent)
+        stats = {
+            "history_messages": len(history),
+            "verbatim_messages": len(recent),
+            "summarized_messages": split + len(extra_lines),
+            "history_tokens": sum(estimate_tokens(m["content"]) for m in messages)
+        }
+        return messages, stats
+
+    @staticmethod
+    def _messages(lines, recent):
+        messages = []
+        if lines:
+            messages.append({"role": "system", "content": SUMMARY_HEADER + "\n".join(lines)})
+        messages.extend(recent)
+        return messages
+
+    def _summarize(self, msg):
+        text = re.sub(r"\s+", " ", msg["content"]).strip()
+        if len(text) > self.line_chars:
+            text = text[:self.line_chars].rsplit(" ", 1)[0] + "..."
+        speaker = "Interviewer" if msg["role"] == "assistant" else "Candidate"
+        return f"- {speaker}: {text}"
+
+    def _trim(self, lines):
+        while len(lines) > 1 and sum(estimate_tokens(line) for line in lines) > self.summary_budget:
+            lines.pop(0)
+
+    def _cost(self, lines, recent):
+        """Tokens of the window built from `lines` and `recent`, summary header included."""
+        return sum(estimate_tokens(m["content"]) for m in self._messages(lines, recent))
@@ -0,0 +1,167 @@
+import re
+import threading
+
+
+# Short utterances that carry no gradeable content but are clearly part of the interview
+READY = re.compile(
+    r"^((i'?m |i am )?ready( to (begin|start))?|let'?s (begin|start|go)|go ahead)[\s.!]*$",
+    re.IGNORECASE
+)
+
+ACKNOWLEDGEMENT = re.compile(
+    r"^(ok(ay)?|yes|yeah|yep|yup|sure|alright|all right|got it|sounds good|no|nope|thanks?( you)?|cool|great|perfect)[\s.!]*$",
+    re.IGNORECASE
+)
+
+CLARIFICATION = re.compile(
+    r"\b(can|could|would) you (please )?(repeat|rephrase|clarify|explain|say) (that|the question|it|again|what you mean)\b|"
+    r"\bwhat do you mean\b|\b(sorry|pardon),? (what|come again)\b|\bi didn'?t (get|understand|catch) (that|the question|it)\b|"
+    r"^(pardon|sorry|come again|huh|what)\?*$",
+    re.IGNORECASE
+)
+
+DONT_KNOW = re.compile(
+    r"^(i )?(really )?(don'?t|do not) know( (that|this|the answer))?[\s.!]*$|^(no|not) (idea|sure)[\s.!]*$|"
+    r"^i'?m not sure[\s.!]*$|^i have no (idea|clue)[\s.!]*$|^no clue[\s.!]*$",
+    re.IGNORECASE
+)
+
+INSTRUCTION_ATTACK = re.compile(
+    r"\bignore (all |any |your |the )?(previous |prior |above )?instructions\b|\byou are now\b|"
+    r"\b(reveal|show|print) (me )?(your|the) (system )?prompt\b|\bpretend (to be|you are)\b",
+    re.IGNORECASE
+)
+
+OFF_TOPIC_REQUEST = re.compile(
+    r"\b(tell|give) me a (joke|story|riddle)\b|\bwrite (me )?an? (poem|story|song|haiku|essay)\b|"
+    r"\bsing (me )?a song\b|\bwhat'?s the weather\b|\bhow (do|can) i (cook|make|bake)\b",
+    re.IGNORECASE
+)
+
+# Keyword model: lexical evidence for each persona (weights are log-odds style votes)
+PERSONA_KEYWORDS = {
+    "edge_case": {
+        "weather": 2.0, "joke": 2.0, "poem": 2.5, "song": 2.0, "recipe": 2.5, "movie": 1.5, "movies": 1.5,
+        "pizza": 2.0, "pasta": 2.0, "football": 1.5, "soccer": 1.5, "cricket": 1.5, "basketball": 1.5,
+        "vacation": 1.0, "horoscope": 2.5, "lottery": 2.0, "girlfriend": 1.5, "boyfriend": 1.5, "celebrity": 1.5
+    },
+    "confused": {
+        "confused": 2.0, "unsure": 1.5, "understand": 1.0, "repeat": 1.5, "rephrase": 2.0, "clarify": 1.5,
+        "sorry": 0.5, "know": 0.5, "idea": 0.5
+    }
+}
+
+# Vocabulary that suggests the candidate is actually talking about work; it vetoes off-topic votes
+DOMAIN_TERMS = {
+    "api", "database", "sql", "python", "java", "design", "system", "project", "team", "code", "model",
+    "data", "cloud", "deploy", "test", "testing", "customer", "product", "service", "architecture", "cache",
+    "latency", "pipeline", "experience", "implemented", "built", "scalability", "security", "metric", "metrics"
+}
+
+WORD = re.compile(r"[a-z']+")
+
+
+class FastPathClassifier:
+    """
+    Local pre-classifier for turns whose profile is obvious (acknowledgements, clarification
+    requests, "I don't know", off-topic or instruction-breaking requests).
+
+    classify() returns (result, confidence). `result` has the same shape as ProfilerAgent's
+    output, or is None when the turn needs the model. Only short messages are considered;
+    anything longer goes to the LLM, which is better at nuance.
+    """
+
+    def __init__(self, threshold=0.85, max_words=25):
+        self.threshold = threshold
+        self.max_words = max_words
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.llm_latency_ms = None  # EWMA of the profiler LLM call, used to estimate time saved
+
+    def classify(self, user_input):
+        text = user_input.strip()
+        words = WORD.findall(text.lower())
+        if not words or len(words) > self.max_words:
+            return None, 0.0
+
+        if INSTRUCTION_ATTACK.search(text):
+            return self._profile("edge_case", False, sentiment="neutral", needs_redirection=True,
+                                 risk_factors=["Attempted to override interview instructions"],
+                                 red_flags=["Instruction override attempt"]), 0.97
+        if OFF_TOPIC_REQUEST.search(text) and not DOMAIN_TERMS.intersection(words):
+            return self._profile("edge_case", False, needs_redirection=True,
+                                 risk_factors=["Off-topic request"]), 0.95
+        if READY.match(text):
+            return self._profile("normal", True, sentiment="positive", communication_quality="good"), 0.95
+        if ACKNOWLEDGEMENT.match(text):
+            return self._profile("efficient", True, engagement_level="medium"), 0.9
+        if CLARIFICATION.search(text):
+            return self._profile("confused", True, confidence="low", needs_encouragement=True), 0.92
+        if DONT_KNOW.match(text):
+            return self._profile("confused", True, confidence="low", needs_encouragement=True,
+                                 knowledge_gaps_detected=True, specificity_score=0.1), 0.9
+
+        persona, confidence = self._keyword_vote(words)
+        if persona == "edge_case":
+            return self._profile("edge_case", False, needs_redirection=True), confidence
+        if persona == "confused":
+            return self._profile("confused", True, confidence="low", needs_encouragement=True), confidence
+        return None, confidence
+
+    def _keyword_vote(self, words):
+        scores = {persona: sum(weights.get(w, 0.0) for w in words) for persona, weights in PERSONA_KEYWORDS.items()}
+        persona, best = max(scores.items(), key=lambda item: item[1])
+        if best <= 0:
+            return None, 0.0
+        runner_up = max([s for p, s in scores.items() if p != persona] or [0.0])
+        domain_hits = len(DOMAIN_TERMS.intersection(words))
+        margin = best - runner_up - 1.5 * domain_hits
+        # Map the vote margin to (0, 1); a margin of ~3 clears the default threshold
+        confidence = margin / (margin + 0.5) if margin > 0 else 0.0
+        return persona, confidence
+
+    def _profile(self, persona, is_relevant, **overrides):
+        result = {
+            "persona": persona,
+            "is_relevant": is_relevant,
+            "sentiment": "neutral",
+            "confidence": "medium",
+            "communication_quality": "fair",
+            "engagement_level": "medium" if is_relevant else "low",
+            "needs_encouragement": False,
+            "needs_redirection": not is_relevant,
+            "risk_factors": [],
+            "positive_indicators": [],
+            "memorization_detected": False,
+            "knowledge_gaps_detected": False,
+            "authenticity_score": 0.7,
+            "specificity_score": 0.3,
+            "red_flags": [],
+            "consistency_issues": []
+        }
+        result.update(overrides)
+        return result
+
+    def record(self, hit):
+        """Count a turn classified here (hit) or handed to the LLM (miss)."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def record_llm_latency(self, llm_ms):
+        """Track the observed cost of the LLM path, used to estimate the time hits save."""
+        with self._lock:
+            self.llm_latency_ms = llm_ms if self.llm_latency_ms is None else 0.9 * self.llm_latency_ms + 0.1 * llm_ms
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "llm_calls": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "estimated_ms_saved": round(self.hits * (self.llm_latency_ms or 0.0), 1)
+            }
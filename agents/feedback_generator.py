@@ -6,7 +6,7 @@ class FeedbackGeneratorAgent:
     def __init__(self, client):
         self.client = client
 
-    def generate_comprehensive_feedback(self, interview_history, resume, jd, all_scores, question_count):
+    def generate_comprehensive_feedback(self, interview_history, resume, jd, score_stats, question_count):
         """
         Generate comprehensive post-interview feedback report.
         
@@ -14,20 +14,81 @@ class FeedbackGeneratorAgent:
             interview_history: List of conversation exchanges
             resume: Candidate resume text
             jd: Job description text
-            all_scores: List of all scores from the interview
+            score_stats: RunningScoreStats over the interview's scores
             question_count: Total number of questions asked
         """
+        try:
+            completion = self.client.complete("feedback", **self._request(interview_history, resume, jd, score_stats, question_count))
+            return completion.choices[0].message.content
+        except Exception as e:
+            return self._fallback(e, score_stats)
+
+    async def generate_comprehensive_feedback_async(self, interview_history, resume, jd, score_stats, question_count):
+        """generate_comprehensive_feedback() for the ASGI app; `client` must be an AsyncLLMClient."""
+        try:
+            completion = await self.client.complete("feedback", **self._request(interview_history, resume, jd, score_stats, question_count))
+            return completion.choices[0].message.content
+        except Exception as e:
+            return self._fallback(e, score_stats)
+
+    def draft_feedback(self, notes, resume, jd, score_stats, question_count, previous_draft=None, covered=0):
+        """
+        Build the report from per-question notes, or update `previous_draft` (written when the
+        first `covered` notes existed) with the newer ones. Unlike generate_comprehensive_feedback(),
+        errors are raised so a background job can keep its last good draft.
+        """
+        completion = self.client.complete("feedback", **self._request(
+            None, resume, jd, score_stats, question_count, notes, previous_draft, covered))
+        return completion.choices[0].message.content
+
+    @staticmethod
+    def question_note(question, answer, grader_data):
+        """Compact record of one graded answer, built from the grader output without a model call."""
+        return {
+            "question": question[:200],
+            "answer": answer[:300],
+            "score": grader_data.get('score'),
+            "depth_level": grader_data.get('depth_level'),
+            "strengths": grader_data.get('strengths', [])[:3],
+            "improvements": grader_data.get('improvements', [])[:3],
+            "critical_gaps": grader_data.get('critical_gaps', [])[:3],
+            "red_flags": grader_data.get('red_flags', [])[:3],
+            "memorization_detected": grader_data.get('memorization_detected', False)
+        }
+
+    @staticmethod
+    def _format_note(number, note):
+        lines = [
+            f"Q{number} ({note['score']}/100, {note['depth_level']}): {note['question']}",
+            f"A: {note['answer']}"
+        ]
+        for label, key in (("Strengths", "strengths"), ("Improvements", "improvements"),
+                           ("Critical gaps", "critical_gaps"), ("Red flags", "red_flags")):
+            if note.get(key):
+                lines.append(f"{label}: {'; '.join(note[key])}")
+        if note.get('memorization_detected'):
+            lines.append("Memorization suspected")
+        return "\n".join(lines)
+
+    def _request(self, interview_history, resume, jd, score_stats, question_count, notes=None, previous_draft=None, covered=0):
+        """
+        Keyword arguments for the feedback completion. With `notes`, the prompt is built from the
+        per-question notes instead of the transcript, and `previous_draft` is revised rather than
+        the report being written from scratch.
+        """
+        # Statistics are maintained incrementally by the session
+        summary = score_stats.summary()
         
-        # Calculate statistics
-        avg_score = sum(all_scores) / len(all_scores) if all_scores else 0
-        max_score = max(all_scores) if all_scores else 0
-        min_score = min(all_scores) if all_scores else 0
-        
-        # Build conversation summary
-        conversation_summary = "\n".join([
-            f"Q: {ex['content'][:200]}" if ex['role'] == 'assistant' else f"A: {ex['content'][:200]}"
-            for ex in interview_history[-20:]  # Last 20 exchanges
-        ])
+        if notes is not None:
+            conversation_title = "Per-Question Notes"
+            conversation_summary = "\n\n".join(self._format_note(i, note) for i, note in enumerate(notes, 1))
+        else:
+            # Build conversation summary
+            conversation_title = "Interview Conversation"
+            conversation_summary = "\n".join([
+                f"Q: {ex['content'][:200]}" if ex['role'] == 'assistant' else f"A: {ex['content'][:200]}"
+                for ex in interview_history[-20:]  # Last 20 exchanges
+            ])
         
         system_prompt = f"""
 You are an ELITE INTERVIEW FEEDBACK ANALYST with 20+ years of experience providing STRICT, COMPREHENSIVE, and 
@@ -46,12 +107,14 @@ knowledge gaps, memorization, and areas needing improvement.
 
 **Interview Statistics:**
 - Total Questions: {question_count}
-- Average Score: {avg_score:.1f}/100
-- Highest Score: {max_score}/100
-- Lowest Score: {min_score}/100
-- Score Range: {max_score - min_score} points
-
-**Interview Conversation:**
+- Average Score: {summary['average']:.1f}/100
+- Highest Score: {summary['highest']}/100
+- Lowest Score: {summary['lowest']}/100
+- Score Range: {summary['highest'] - summary['lowest']} points
+- Consistency: ±{summary['stdev']} points (standard deviation)
+- Trend: {summary['trend']} ({summary['trend_delta']:+} points per answer; recent-weighted average {summary['ewma']})
+
+**{conversation_title}:**
 {conversation_summary}
 
 ### STRICT FEEDBACK GENERATION FRAMEWORK
@@ -120,21 +183,25 @@ Use emojis sparingly for visual clarity (📊, ✅, ⚠️, 💡).
 Be specific, constructive, and encouraging. Balance honesty with support.
 """
 
-        try:
-            user_prompt = """Generate a comprehensive post-interview feedback report based on the interview context provided above."""
-            
-            completion = self.client.chat.completions.create(
-                model="openai/gpt-oss-20b",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7  # Higher temp for more natural, comprehensive writing
-            )
-            
-            return completion.choices[0].message.content
-        except Exception as e:
-            return f"""
+        user_prompt = """Generate a comprehensive post-interview feedback report based on the interview context provided above."""
+        if previous_draft:
+            user_prompt = f"""Below is the report drafted when questions 1-{covered} had been answered. Update it with the notes for questions {covered + 1}-{len(notes)} and the current statistics, keeping the same structure, and return the complete report.
+
+{previous_draft}"""
+
+        return dict(
+            model="openai/gpt-oss-20b",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.7  # Higher temp for more natural, comprehensive writing
+        )
+
+    def _fallback(self, error, score_stats):
+        self.client.record_fallback("feedback", error)
+        avg_score = score_stats.mean
+        return f"""
 # Interview Feedback Report
 
 ## Overall Assessment
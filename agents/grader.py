@@ -1,21 +1,69 @@
-import json
+from services.agent_json import NUMBER, AgentJSON, field
+
+# What a grader reply must look like; anything else is repaired or re-asked (services.agent_json)
+GRADE_SCHEMA = {
+    "score": field(NUMBER, required=True),
+    "is_correct": field(bool),
+    "requires_followup": field(bool),
+    "technical_accuracy": field(NUMBER),
+    "communication_quality": field(NUMBER),
+    "relevance": field(NUMBER),
+    "depth_level": field(str, choices=("surface", "intermediate", "advanced", "expert")),
+    "feedback_internal": field(str),
+    "strengths": field(list),
+    "improvements": field(list),
+    "followup_suggestions": field(list),
+    "confidence": field(NUMBER),
+    "memorization_detected": field(bool),
+    "vague_answer": field(bool),
+    "red_flags": field(list),
+    "critical_gaps": field(list),
+}
 
 
 class GraderAgent:
 
     def __init__(self, client):
         self.client = client
+        self.output = AgentJSON(client, "grader", GRADE_SCHEMA)
 
-    def evaluate(self, user_input, current_question, jd_text, resume_text="", previous_scores=None):
+    def evaluate(self, user_input, current_question, jd_text, resume_text="", score_stats=None):
+        try:
+            completion = self.client.complete("grader", **self._request(user_input, current_question, jd_text, resume_text, score_stats))
+            return self._normalize(self.output.parse(completion.choices[0].message.content))
+        except Exception as e:
+            return self._fallback(e)
+
+    async def evaluate_async(self, user_input, current_question, jd_text, resume_text="", score_stats=None):
+        """evaluate() for the ASGI app; `client` must be an AsyncLLMClient."""
+        try:
+            completion = await self.client.complete("grader", **self._request(user_input, current_question, jd_text, resume_text, score_stats))
+            return self._normalize(await self.output.parse_async(completion.choices[0].message.content))
+        except Exception as e:
+            return self._fallback(e)
+
+    def _request(self, user_input, current_question, jd_text, resume_text="", score_stats=None):
+        """Keyword arguments for the grader completion."""
+        return dict(
+            model="openai/gpt-oss-20b",
+            messages=[
+                {"role": "system", "content": self._system_prompt(current_question, jd_text, resume_text, score_stats)},
+                {"role": "user", "content": self._user_prompt(user_input)}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.1  # Even lower temp for stricter, more consistent evaluation
+        )
+
+    def _system_prompt(self, current_question, jd_text, resume_text="", score_stats=None):
         # Build comprehensive context
         jd_summary = jd_text[:800] if len(jd_text) > 800 else jd_text
         resume_summary = resume_text[:500] if resume_text else "No resume context"
         
-        # Calculate average score for trend analysis
-        avg_previous = sum(previous_scores) / len(previous_scores) if previous_scores and len(previous_scores) > 0 else None
-        trend = "improving" if avg_previous and len(previous_scores) > 1 and previous_scores[-1] > previous_scores[0] else "stable" if avg_previous else "baseline"
+        # Previous average and trend from the session's running score statistics
+        avg_previous = round(score_stats.mean, 1) if score_stats else None
+        trend = score_stats.trend() if score_stats else "baseline"
 
-        system_prompt = f"""
+        return f"""
 You are an ELITE EVALUATION AGENT (Agent B) with 20+ years of experience conducting rigorous technical assessments 
 for top-tier companies (Google, Microsoft, Amazon, Meta). You are known for your STRICT but FAIR evaluation standards. 
 Your role is to provide comprehensive, critical, and nuanced evaluation of candidate responses with ZERO tolerance for 
@@ -256,61 +304,53 @@ Score: 58
 Reasoning: Basic understanding but lacks depth, needs follow-up to assess real knowledge
 """
 
-        try:
-            user_prompt = f"""Candidate Answer: {user_input}
+    def _user_prompt(self, user_input):
+        return f"""Candidate Answer: {user_input}
 
 Evaluate this response comprehensively based on the question and job requirements."""
-            
-            completion = self.client.chat.completions.create(
-                model="openai/gpt-oss-20b",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1  # Even lower temp for stricter, more consistent evaluation
-            )
-
-            result = json.loads(completion.choices[0].message.content)
-            
-            # Ensure all required fields with safe defaults
-            score = result.get("score", 50)
-            # Apply strict penalty adjustments if needed
-            if result.get("memorization_detected", False):
-                score = max(0, score - 15)  # Penalize memorization
-            if result.get("vague_answer", False):
-                score = max(0, score - 10)  # Penalize vagueness
-            
-            return {
-                "score": max(0, min(100, score)),  # Ensure score is in valid range
-                "is_correct": result.get("is_correct", True),
-                "requires_followup": result.get("requires_followup", False),
-                "technical_accuracy": result.get("technical_accuracy", result.get("score", 50)),
-                "communication_quality": result.get("communication_quality", result.get("score", 50)),
-                "relevance": result.get("relevance", result.get("score", 50)),
-                "depth_level": result.get("depth_level", "intermediate"),
-                "feedback_internal": result.get("feedback_internal", "Standard evaluation"),
-                "strengths": result.get("strengths", []),
-                "improvements": result.get("improvements", []),
-                "followup_suggestions": result.get("followup_suggestions", []),
-                "confidence": result.get("confidence", 0.7),
-                "memorization_detected": result.get("memorization_detected", False),
-                "red_flags": result.get("red_flags", []),
-                "critical_gaps": result.get("critical_gaps", [])
-            }
-        except Exception as e:
-            # Fallback with safe defaults
-            return {
-                "score": 50,
-                "is_correct": True,
-                "requires_followup": False,
-                "technical_accuracy": 50,
-                "communication_quality": 50,
-                "relevance": 50,
-                "depth_level": "intermediate",
-                "feedback_internal": "Evaluation error - using default",
-                "strengths": [],
-                "improvements": [],
-                "followup_suggestions": [],
-                "confidence": 0.5
-            }
+
+    def _normalize(self, result):
+        # Ensure all required fields with safe defaults
+        score = result.get("score", 50)
+        # Apply strict penalty adjustments if needed
+        if result.get("memorization_detected", False):
+            score = max(0, score - 15)  # Penalize memorization
+        if result.get("vague_answer", False):
+            score = max(0, score - 10)  # Penalize vagueness
+        
+        return {
+            "score": max(0, min(100, score)),  # Ensure score is in valid range
+            "is_correct": result.get("is_correct", True),
+            "requires_followup": result.get("requires_followup", False),
+            "technical_accuracy": result.get("technical_accuracy", result.get("score", 50)),
+            "communication_quality": result.get("communication_quality", result.get("score", 50)),
+            "relevance": result.get("relevance", result.get("score", 50)),
+            "depth_level": result.get("depth_level", "intermediate"),
+            "feedback_internal": result.get("feedback_internal", "Standard evaluation"),
+            "strengths": result.get("strengths", []),
+            "improvements": result.get("improvements", []),
+            "followup_suggestions": result.get("followup_suggestions", []),
+            "confidence": result.get("confidence", 0.7),
+            "memorization_detected": result.get("memorization_detected", False),
+            "red_flags": result.get("red_flags", []),
+            "critical_gaps": result.get("critical_gaps", [])
+        }
+
+    def _fallback(self, error):
+        self.client.record_fallback("grader", error)
+        # Fallback with safe defaults
+        return {
+            "score": 50,
+            "is_correct": True,
+            "requires_followup": False,
+            "technical_accuracy": 50,
+            "communication_quality": 50,
+            "relevance": 50,
+            "depth_level": "intermediate",
+            "feedback_internal": "Evaluation error - using default",
+            "fallback": True,  # Not a real grade: kept out of the session's scores
+            "strengths": [],
+            "improvements": [],
+            "followup_suggestions": [],
+            "confidence": 0.5
+        }
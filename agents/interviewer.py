@@ -1,9 +1,112 @@
+from agents.conversation_window import ConversationWindow, estimate_tokens
+
+
+RESPONSE_MARKER = "[RESPONSE]"
+
+
+class ResponseStreamParser:
+    """
+    Incremental parser for streamed interviewer output.
+
+    The model writes an [ANALYSIS] block before the [RESPONSE] marker. Everything up to and
+    including the marker is held back; only the spoken response is forwarded. If the stream
+    ends without a marker, the whole text is released on close() (same as the non-streaming path).
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.in_response = False
+        self.emitted_any = False
+
+    def feed(self, chunk):
+        """Consume a chunk of model output and return any text safe to forward."""
+        if not chunk:
+            return ""
+        if self.in_response:
+            return self._emit(chunk)
+
+        self.buffer += chunk
+        idx = self.buffer.find(RESPONSE_MARKER)
+        if idx == -1:
+            return ""
+        self.in_response = True
+        remainder = self.buffer[idx + len(RESPONSE_MARKER):]
+        self.buffer = ""
+        return self._emit(remainder)
+
+    def close(self):
+        """Flush at end of stream; returns the held-back text if no marker ever arrived."""
+        if self.in_response:
+            return ""
+        text = self.buffer.replace("[ANALYSIS]", "").strip()
+        self.buffer = ""
+        return text
+
+    def _emit(self, text):
+        # Strip the whitespace that follows the marker before the first forwarded token
+        if not self.emitted_any:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self.emitted_any = True
+        return text
+
+
 class InterviewerAgent:
 
-    def __init__(self, client):
+    def __init__(self, client, window=None):
         self.client = client
+        self.window = window or ConversationWindow()
+
+    def generate_response(self, user_input, history, resume, jd, profiler_data, grader_data, interview_phase=None, question_count=0, role_info=None, window_state=None):
+        messages = self.build_messages(user_input, history, resume, jd, profiler_data, grader_data, interview_phase, question_count, role_info, window_state)
+
+        completion = self.client.complete("interviewer", **self._request(messages))
+
+        return completion.choices[0].message.content
+
+    async def generate_response_async(self, user_input, history, resume, jd, profiler_data, grader_data, interview_phase=None, question_count=0, role_info=None, window_state=None):
+        """generate_response() for the ASGI app; `client` must be an AsyncLLMClient."""
+        messages = self.build_messages(user_input, history, resume, jd, profiler_data, grader_data, interview_phase, question_count, role_info, window_state)
+
+        completion = await self.client.complete("interviewer", **self._request(messages))
+
+        return completion.choices[0].message.content
+
+    def stream_response(self, user_input, history, resume, jd, profiler_data, grader_data, interview_phase=None, question_count=0, role_info=None, window_state=None):
+        """Same as generate_response, but yields text deltas as the model produces them."""
+        messages = self.build_messages(user_input, history, resume, jd, profiler_data, grader_data, interview_phase, question_count, role_info, window_state)
+
+        stream = self.client.complete("interviewer", **self._request(messages), stream=True)
+
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        finally:
+            # An abandoned reply closes the client's stream (and its connection) right away
+            stream.close()
+
+    def _request(self, messages):
+        return dict(
+            model="openai/gpt-oss-20b",
+            messages=messages,
+            temperature=0.65  # Slightly lower for more focused, challenging questions while maintaining natural flow
+        )
+
+    def build_messages(self, user_input, history, resume, jd, profiler_data, grader_data, interview_phase=None, question_count=0, role_info=None, window_state=None):
+        """
+        Assemble the prompt. History goes through the token-budgeted ConversationWindow;
+        `window_state` is the per-session dict holding its rolling summary, and receives
+        this turn's prompt size under 'last_turn'.
+        """
+        # The current message is already the last entry of the session history; don't send it twice
+        if history and history[-1].get('role') == 'user' and history[-1].get('content') == user_input:
+            history = history[:-1]
 
-    def generate_response(self, user_input, history, resume, jd, profiler_data, grader_data, interview_phase=None, question_count=0, role_info=None):
         # Extract full context from resume and JD
         resume_summary = resume[:1500] if len(resume) > 1500 else resume
         jd_summary = jd[:1500] if len(jd) > 1500 else jd
@@ -245,14 +348,17 @@ Generate your [ANALYSIS] section first, then your [RESPONSE].
 Remember: You are Byte, an expert recruiter. Be professional, insightful, and adaptive.
 """
 
+        if window_state is None:
+            window_state = {}
+        history_messages, window_stats = self.window.build(history, window_state)
+
         messages = [{"role": "system", "content": system_prompt}]
-        messages.extend(history)  # Attach previous conversation
+        messages.extend(history_messages)  # Attach windowed conversation
         messages.append({"role": "user", "content": user_input})
 
-        completion = self.client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=messages,
-            temperature=0.65  # Slightly lower for more focused, challenging questions while maintaining natural flow
-        )
+        window_state['last_turn'] = {
+            **window_stats,
+            "prompt_tokens": sum(estimate_tokens(m["content"]) for m in messages)
+        }
 
-        return completion.choices[0].message.content
+        return messages
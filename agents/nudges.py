@@ -0,0 +1,116 @@
+import random
+import re
+
+
+# A question the interviewer asked: the last sentence ending in "?" that is not inside a quote.
+# Sentences only break at . ! ? followed by whitespace, so "Node.js" or "3.5" stay in one piece.
+QUESTION = re.compile(r'(?:[^.!?\n"]|[.!?](?=[^\s"]))*\?')
+
+SILENT_INTRO_TEMPLATES = (
+    "Whenever you're ready to begin the {role} interview, just let me know.",
+    "Still there? Say \"ready\" when you'd like to start and we'll begin with a little about your background.",
+    "No rush. The {role} interview starts whenever you are ready.",
+)
+
+SILENT_TEMPLATES = (
+    "Take your time, there's no rush.{recap} If it would help, I can rephrase the question or break it into smaller parts.",
+    "Are you still with me? Whenever you're ready, go ahead.{recap} {hint}",
+    "No pressure, this kind of question can take a moment to think through.{recap} {hint}",
+    "It's fine to think out loud; I'm interested in how you reason, not just the final answer.{recap}",
+    "Just checking in. If you'd rather come back to this one later, say so and we can move on to a different topic.",
+)
+
+EDGE_CASE_TEMPLATES = (
+    "I appreciate the curiosity, but I'm here to conduct your {role} interview, so let's keep our focus there.{recap}",
+    "That's outside the scope of this interview. Let's get back to assessing your fit for the {role} role.{recap}",
+    "I'll have to set that aside. We have limited time, and I want to make sure we cover your {role} experience.{recap}",
+    "I can't help with that here; my job today is to interview you for the {role} position.{recap}",
+    "Let's stay on track with the interview, please.{recap}",
+)
+
+# Extra encouragement for a silent candidate, per interview phase
+PHASE_HINTS = {
+    "Introduction": "A short overview of your background is a good place to start.",
+    "Technical": "Even a rough outline of your approach is a good place to start.",
+    "Behavioral": "Try picking one specific situation and walk me through it: situation, task, action, result.",
+    "Deep_Dive": "Feel free to start from the high-level design and we'll dig into the details together.",
+}
+
+# What to ask when there is no pending question to come back to
+OPENING_QUESTION = "To start, could you tell me a little about yourself and your background?"
+
+
+def pending_question(text):
+    """
+    The last question in an interviewer reply, or "" if it asked none.
+
+    >>> pending_question("Great. How have you used Node.js in production?")
+    'How have you used Node.js in production?'
+    >>> pending_question("Python 3.12 is out. Did you try it?")
+    'Did you try it?'
+    """
+    questions = QUESTION.findall(text or "")
+    return questions[-1].strip() if questions else ""
+
+
+class NudgeResponder:
+    """
+    Canned interviewer replies for turns that do not need the model: silence timeouts and
+    off-topic or instruction-breaking messages.
+
+    Replies are filled in with the role, the interview phase and the question still waiting
+    for an answer. Each session draws templates without repeats; once a session has used up a
+    pool, respond() returns None when `llm_when_exhausted` is set (the caller falls back to the
+    interviewer model) and otherwise starts the pool over.
+    """
+
+    def __init__(self, llm_when_exhausted=True, rng=None):
+        self.llm_when_exhausted = llm_when_exhausted
+        self.rng = rng or random.Random()
+
+    @staticmethod
+    def kind(profile_data):
+        """"silent" or "edge_case" for turns a template can answer, otherwise None."""
+        persona = profile_data.get('persona')
+        return persona if persona in ("silent", "edge_case") else None
+
+    @staticmethod
+    def recap_question(kind, question):
+        """The question a `kind` reply puts to the candidate: `question`, or the opening one when an off-topic turn has none."""
+        if kind == "edge_case" and not question:
+            return OPENING_QUESTION
+        return question
+
+    def respond(self, kind, used, role_info, phase, question):
+        """
+        Interviewer output ([ANALYSIS] and [RESPONSE] blocks) for a `kind` turn, or None.
+
+        `used` is the session's {pool name: [template indexes]} record and is updated in place.
+        """
+        role = role_info['name'] if role_info else "this"
+        if kind == "silent":
+            pool_name, pool = ("silent_intro", SILENT_INTRO_TEMPLATES) if not question else ("silent", SILENT_TEMPLATES)
+            recap = f' To recap: "{question}"' if question else ""
+        else:
+            pool_name, pool = "edge_case", EDGE_CASE_TEMPLATES
+            recap = f' Back to my question: "{question}"' if question else " " + self.recap_question(kind, question)
+
+        taken = used.setdefault(pool_name, [])
+        available = [i for i in range(len(pool)) if i not in taken]
+        if not available:
+            if self.llm_when_exhausted:
+                return None
+            taken.clear()
+            available = list(range(len(pool)))
+        index = self.rng.choice(available)
+        taken.append(index)
+
+        text = pool[index].format(role=role, recap=recap, hint=PHASE_HINTS.get(phase, "")).strip()
+        return (
+            "[ANALYSIS]\n"
+            f"- Phase: {phase}\n"
+            f"- Persona: {kind}\n"
+            f"- Strategic Decision: {'Re-engage a silent candidate' if kind == 'silent' else 'Redirect an off-topic turn'} (template {pool_name}/{index})\n"
+            "[RESPONSE]\n"
+            f"{text}"
+        )
@@ -1,12 +1,71 @@
-import json
+import time
+
+from services.agent_json import NUMBER, AgentJSON, field
+
+PERSONAS = ("confused", "efficient", "chatty", "edge_case", "normal", "silent", "anxious", "overconfident")
+
+# What a profiler reply must look like; anything else is repaired or re-asked (services.agent_json)
+PROFILE_SCHEMA = {
+    "persona": field(str, required=True, choices=PERSONAS),
+    "is_relevant": field(bool, required=True),
+    "sentiment": field(str),
+    "confidence": field((str, int, float)),
+    "communication_quality": field(str),
+    "engagement_level": field(str),
+    "needs_encouragement": field(bool),
+    "needs_redirection": field(bool),
+    "risk_factors": field(list),
+    "positive_indicators": field(list),
+    "memorization_detected": field(bool),
+    "knowledge_gaps_detected": field(bool),
+    "authenticity_score": field(NUMBER),
+    "specificity_score": field(NUMBER),
+    "red_flags": field(list),
+    "consistency_issues": field(list),
+}
 
 
 class ProfilerAgent:
 
-    def __init__(self, client):
+    def __init__(self, client, fast_path=None):
         self.client = client
+        self.fast_path = fast_path
+        self.output = AgentJSON(client, "profiler", PROFILE_SCHEMA)
 
     def analyze(self, user_input, context_history):
+        shortcut = self._shortcut(user_input)
+        if shortcut is not None:
+            return shortcut
+        return self._llm_analysis(user_input, context_history)
+
+    async def analyze_async(self, user_input, context_history):
+        """analyze() for the ASGI app; `client` must be an AsyncLLMClient."""
+        shortcut = self._shortcut(user_input)
+        if shortcut is not None:
+            return shortcut
+        return await self._llm_analysis_async(user_input, context_history)
+
+    def _llm_analysis(self, user_input, context_history):
+        """The model's profile of a turn _shortcut() could not classify."""
+        llm_start = time.perf_counter()
+        try:
+            completion = self.client.complete("profiler", **self._request(user_input, context_history))
+            self._record_llm_latency(llm_start)
+            return self._normalize(self.output.parse(completion.choices[0].message.content))
+        except Exception as e:
+            return self._fallback(e)
+
+    async def _llm_analysis_async(self, user_input, context_history):
+        llm_start = time.perf_counter()
+        try:
+            completion = await self.client.complete("profiler", **self._request(user_input, context_history))
+            self._record_llm_latency(llm_start)
+            return self._normalize(await self.output.parse_async(completion.choices[0].message.content))
+        except Exception as e:
+            return self._fallback(e)
+
+    def _shortcut(self, user_input):
+        """Classify silence and obvious turns without a model call; None when the LLM is needed."""
         # Detect Silence Token from Frontend
         if "[SYSTEM_TIMEOUT]" in user_input:
             return {
@@ -17,11 +76,32 @@ class ProfilerAgent:
                 "sentiment": "neutral"
             }
 
-        # Build conversation context for better analysis
-        recent_history = context_history[-5:] if len(context_history) > 5 else context_history
-        context_str = "\n".join([f"{msg['role']}: {msg['content'][:200]}" for msg in recent_history])
-
-        system_prompt = """
+        # Obvious turns are classified locally without a model call
+        if self.fast_path is not None:
+            result, confidence = self.fast_path.classify(user_input)
+            if result is not None and confidence >= self.fast_path.threshold:
+                self.fast_path.record(hit=True)
+                result["classified_by"] = "fast_path"
+                return result
+            # Counted before the model call, so a call that falls back is still a miss
+            self.fast_path.record(hit=False)
+
+        return None
+
+    def _request(self, user_input, context_history):
+        """Keyword arguments for the profiler completion."""
+        return dict(
+            model="openai/gpt-oss-20b",
+            messages=[
+                {"role": "system", "content": self._system_prompt()},
+                {"role": "user", "content": self._user_prompt(user_input, context_history)}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.15  # Even lower temp for stricter, more consistent classification
+        )
+
+    def _system_prompt(self):
+        return """
 You are an ELITE BEHAVIORAL PROFILER (Agent A) with 20+ years of expertise in psycholinguistics, human-computer 
 interaction, and interview assessment. Your role is to analyze user input with ULTRA-SOPHISTICATED nuance, detecting not 
 just surface-level patterns but DEEP underlying behavioral traits, emotional states, communication styles, and 
@@ -187,56 +267,57 @@ Input: "I implemented a distributed caching system using Redis to reduce databas
 → Persona: "normal", Confidence: "high", Communication Quality: "excellent"
 """
 
-        try:
-            user_prompt = f"""User Input: {user_input}
+    def _user_prompt(self, user_input, context_history):
+        # Build conversation context for better analysis
+        recent_history = context_history[-5:] if len(context_history) > 5 else context_history
+        context_str = "\n".join([f"{msg['role']}: {msg['content'][:200]}" for msg in recent_history])
+
+        return f"""User Input: {user_input}
 
 Recent Conversation Context:
 {context_str if context_str else "No previous context"}
 
 Analyze this input comprehensively."""
-            
-            completion = self.client.chat.completions.create(
-                model="openai/gpt-oss-20b",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.15  # Even lower temp for stricter, more consistent classification
-            )
-
-            result = json.loads(completion.choices[0].message.content)
-            
-            # Ensure all required fields with defaults
-            return {
-                "persona": result.get("persona", "normal"),
-                "is_relevant": result.get("is_relevant", True),
-                "sentiment": result.get("sentiment", "neutral"),
-                "confidence": result.get("confidence", "medium"),
-                "communication_quality": result.get("communication_quality", "good"),
-                "engagement_level": result.get("engagement_level", "medium"),
-                "needs_encouragement": result.get("needs_encouragement", False),
-                "needs_redirection": result.get("needs_redirection", False),
-                "risk_factors": result.get("risk_factors", []),
-                "positive_indicators": result.get("positive_indicators", []),
-                "memorization_detected": result.get("memorization_detected", False),
-                "knowledge_gaps_detected": result.get("knowledge_gaps_detected", False),
-                "authenticity_score": result.get("authenticity_score", 0.7),
-                "specificity_score": result.get("specificity_score", 0.7),
-                "red_flags": result.get("red_flags", []),
-                "consistency_issues": result.get("consistency_issues", [])
-            }
-        except Exception as e:
-            # Fallback with safe defaults
-            return {
-                "persona": "normal",
-                "is_relevant": True,
-                "sentiment": "neutral",
-                "confidence": "medium",
-                "communication_quality": "good",
-                "engagement_level": "medium",
-                "needs_encouragement": False,
-                "needs_redirection": False,
-                "risk_factors": [],
-                "positive_indicators": []
-            }
+
+    def _record_llm_latency(self, llm_start):
+        if self.fast_path is not None:
+            self.fast_path.record_llm_latency((time.perf_counter() - llm_start) * 1000)
+
+    def _normalize(self, result):
+        # Ensure all required fields with defaults
+        return {
+            "persona": result.get("persona", "normal"),
+            "is_relevant": result.get("is_relevant", True),
+            "sentiment": result.get("sentiment", "neutral"),
+            "confidence": result.get("confidence", "medium"),
+            "communication_quality": result.get("communication_quality", "good"),
+            "engagement_level": result.get("engagement_level", "medium"),
+            "needs_encouragement": result.get("needs_encouragement", False),
+            "needs_redirection": result.get("needs_redirection", False),
+            "risk_factors": result.get("risk_factors", []),
+            "positive_indicators": result.get("positive_indicators", []),
+            "memorization_detected": result.get("memorization_detected", False),
+            "knowledge_gaps_detected": result.get("knowledge_gaps_detected", False),
+            "authenticity_score": result.get("authenticity_score", 0.7),
+            "specificity_score": result.get("specificity_score", 0.7),
+            "red_flags": result.get("red_flags", []),
+            "consistency_issues": result.get("consistency_issues", []),
+            "classified_by": "llm"
+        }
+
+    def _fallback(self, error):
+        self.client.record_fallback("profiler", error)
+        # Fallback with safe defaults
+        return {
+            "persona": "normal",
+            "is_relevant": True,
+            "sentiment": "neutral",
+            "confidence": "medium",
+            "communication_quality": "good",
+            "engagement_level": "medium",
+            "needs_encouragement": False,
+            "needs_redirection": False,
+            "risk_factors": [],
+            "positive_indicators": [],
+            "fallback": True
+        }
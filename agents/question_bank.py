@@ -0,0 +1,192 @@
+import json
+import os
+import random
+import re
+import string
+
+# Interview phases whose first question can come from the bank
+PHASES = ("Introduction", "Technical", "Behavioral", "Deep_Dive")
+
+# Placeholders a template may use; all but role and focus_area come from the parsed resume
+FIELDS = ("role", "focus_area", "skill", "project", "recent_role", "years")
+
+# Role-agnostic templates, used for any (role, phase, focus area) the bank file does not cover
+DEFAULT_TEMPLATES = {
+    "Introduction": (
+        "Welcome, and thanks for joining. I'm Byte, and I'll be interviewing you for the {role} role today. "
+        "We'll cover some technical questions, a few behavioral ones, and then go deeper into one area. "
+        "To start, could you walk me through your background and what draws you to this role?",
+        "Welcome! I'm Byte, and I'll be running your {role} interview today: technical questions first, then "
+        "behavioral, then a deeper dive. I see you're currently working as {recent_role}. Could you start by "
+        "telling me about that role and the work you're proudest of there?",
+        "Thanks for joining. I'm Byte, and today's {role} interview covers technical, behavioral and in-depth "
+        "questions. You have about {years} years of experience; could you give me a quick tour of it, focusing on "
+        "what's most relevant to this role?",
+    ),
+    "Technical": (
+        "Thanks, that's a helpful overview. Let's move into the technical part, starting with {focus_area}. "
+        "What is the hardest {focus_area} problem you've worked on, and how did you approach it?",
+        "Thanks. Let's get into the technical side, starting with {focus_area}. You list {skill} on your resume: "
+        "how have you used it in practice, and what trade-offs did you run into?",
+        "Great, let's start the technical questions with {project}, from your resume. What were the key "
+        "technical decisions there, and which of them would you make differently today?",
+    ),
+    "Behavioral": (
+        "Let's switch to some behavioral questions. Tell me about a time you disagreed with a teammate on an "
+        "important decision. What was the situation, what did you do, and how did it turn out?",
+        "Now for a few behavioral questions. Tell me about a project that didn't go as planned. What happened, "
+        "what was your role, and what did you change afterwards?",
+        "Let's move to behavioral questions. During your time as {recent_role}, when did you have to deliver "
+        "under a tight deadline or with unclear requirements? Walk me through the situation, your actions and "
+        "the result.",
+    ),
+    "Deep_Dive": (
+        "For the last part, let's go deep on {focus_area}. Walk me through how you would approach it for a "
+        "system ten times the size of your current one: the main decisions, the risks, and how you'd validate "
+        "them.",
+        "Let's do a deep dive. In {project}, take me through the design end to end: the main components, how "
+        "they interact, and what you would change if it had to handle ten times the load.",
+        "Let's dig deeper into {skill}. Describe the most complex thing you've built with it, the failure modes "
+        "you had to handle, and how you'd explain the key trade-offs to a new teammate.",
+    ),
+}
+
+WORD = re.compile(r"[a-z0-9+#]{3,}")
+
+# Resume skills that speak to a focus area whose words start with the key
+RELATED_SKILLS = {
+    "api": ("REST", "GraphQL", "gRPC", "FastAPI", "Django", "Flask", "Spring", "Node.js"),
+    "cloud": ("AWS", "GCP", "Azure", "Terraform", "Kubernetes"),
+    "container": ("Docker", "Kubernetes"),
+    "database": ("PostgreSQL", "MySQL", "MongoDB", "Redis", "Cassandra", "DynamoDB", "SQL"),
+    "microservice": ("Kubernetes", "Docker", "Kafka", "gRPC", "RabbitMQ"),
+    "scalab": ("Kafka", "Redis", "Kubernetes", "Cassandra", "Distributed systems"),
+    "pipeline": ("Airflow", "Kafka", "Spark", "dbt", "Jenkins", "GitHub Actions", "CI/CD"),
+    "monitor": ("Prometheus", "Grafana", "Observability"),
+    "etl": ("Airflow", "dbt", "Spark", "ETL"),
+    "warehous": ("Snowflake", "BigQuery", "dbt"),
+    "big": ("Spark", "Hadoop", "Kafka"),
+    "javascript": ("JavaScript", "TypeScript", "React", "Angular", "Vue", "Next.js"),
+    "test": ("pytest", "Selenium", "Cypress", "Playwright", "Jest", "Test automation"),
+    "model": ("PyTorch", "TensorFlow", "scikit-learn", "MLOps"),
+    "mlops": ("MLOps", "Kubernetes", "Docker"),
+    "feature": ("Pandas", "NumPy", "Spark"),
+    "statistic": ("R", "Python", "Pandas"),
+    "visualization": ("Tableau", "Power BI", "Excel"),
+    "metric": ("A/B testing", "SQL", "Tableau"),
+    "security": ("Security", "OAuth", "Networking"),
+    "encryption": ("Security", "OAuth"),
+    "programming": ("Python", "Java", "Go", "Rust", "C++", "C#", "TypeScript", "Kotlin"),
+}
+
+
+def related(skill, focus_area):
+    """Whether a resume skill speaks to `focus_area`: shared words, or a RELATED_SKILLS match."""
+    focus = set(WORD.findall(focus_area.lower()))
+    if set(WORD.findall(skill.lower())) & focus:
+        return True
+    return any(word.startswith(key) and skill in skills for word in focus for key, skills in RELATED_SKILLS.items())
+
+
+def template_fields(template):
+    """Placeholder names used by `template`; raises ValueError for a malformed template."""
+    return {name for _, name, _, _ in string.Formatter().parse(template) if name}
+
+
+def valid_template(template):
+    """A usable bank entry: a question that only uses known placeholders."""
+    try:
+        return isinstance(template, str) and "?" in template and template_fields(template) <= set(FIELDS)
+    except ValueError:
+        return False
+
+
+def opens_phase(question_count, phase_for):
+    """The phase whose first question the reply at `question_count` asks, or None."""
+    phase = phase_for(question_count)
+    if phase in PHASES and (question_count == 0 or phase != phase_for(question_count - 1)):
+        return phase
+    return None
+
+
+def resume_fields(resume_profile, focus_area):
+    """Template values the parsed resume can supply; missing ones are left out."""
+    if not resume_profile:
+        return {}
+    values = {}
+    # Only a skill that fits the focus area, so "starting with databases ... you list Python" cannot happen
+    skills = [skill for skill in resume_profile.get('skills') or [] if related(skill, focus_area)]
+    if skills:
+        values['skill'] = skills[0]
+    projects = resume_profile.get('projects') or []
+    if projects:
+        values['project'] = re.split(r"[:(–—]| - ", projects[0])[0].strip()[:60]
+    experience = resume_profile.get('experience') or []
+    if experience:
+        values['recent_role'] = re.split(r"[,(|]| at ", experience[0]['role'])[0].strip()[:60]
+    if resume_profile.get('years'):
+        values['years'] = resume_profile['years']
+    return {key: value for key, value in values.items() if value}
+
+
+class QuestionBank:
+    """
+    Opening and phase-transition questions served without a model call.
+
+    Templates are indexed by role key, phase and focus area and loaded from a JSON file built
+    offline by tools.build_question_bank ({"roles": {role: {phase: {focus area: [templates]}}}});
+    anything the file does not cover uses DEFAULT_TEMPLATES. A template is personalized from the
+    parsed resume and is only used when every placeholder it names can be filled; of those, the
+    most personalized ones are preferred. Each session asks about each focus area at most once.
+    """
+
+    def __init__(self, path=None, rng=None):
+        self.rng = rng or random.Random()
+        self.roles = {}
+        if path and os.path.exists(path):
+            with open(path) as handle:
+                self.roles = json.load(handle).get("roles", {})
+
+    def templates(self, role_key, phase, focus_area):
+        banked = self.roles.get(role_key, {}).get(phase, {}).get(focus_area)
+        return [template for template in banked if valid_template(template)] if banked else list(DEFAULT_TEMPLATES[phase])
+
+    def question(self, role_key, role_info, phase, resume_profile, used):
+        """
+        Interviewer output ([ANALYSIS] and [RESPONSE] blocks) opening `phase`, or None.
+
+        `used` is the session's list of focus areas already asked about, updated in place.
+        """
+        if phase not in PHASES or not role_info:
+            return None
+        areas = [area for area in role_info.get('focus_areas', []) if area not in used] or role_info.get('focus_areas', [])
+        focus_area = self._pick_area(areas, resume_profile) if areas else role_info['name']
+
+        # Mid-sentence lower case, except names with capitals inside ("CI/CD pipelines", "MLOps")
+        spoken_area = focus_area if any(c.isupper() for c in focus_area[1:]) else focus_area.lower()
+        values = dict(resume_fields(resume_profile, focus_area), role=role_info['name'], focus_area=spoken_area)
+        fillable = [template for template in self.templates(role_key, phase, focus_area)
+                    if template_fields(template) <= set(values)]
+        if not fillable:
+            return None
+        most = max(len(template_fields(template)) for template in fillable)
+        template = self.rng.choice([template for template in fillable if len(template_fields(template)) == most])
+        topic = ""
+        if template_fields(template) & {"focus_area", "skill"}:
+            used.append(focus_area)
+            topic = f" on {focus_area}"
+
+        return (
+            "[ANALYSIS]\n"
+            f"- Phase: {phase}\n"
+            f"- Strategic Decision: Open the {phase} phase{topic} (question bank)\n"
+            "[RESPONSE]\n"
+            f"{template.format(**values)}"
+        )
+
+    def _pick_area(self, areas, resume_profile):
+        """The focus area the candidate's skills and experience say the most about; ties broken at random."""
+        skills = (resume_profile or {}).get('skills', [])
+        scored = [(sum(related(skill, area) for skill in skills), area) for area in areas]
+        best = max(score for score, _ in scored)
+        return self.rng.choice([area for score, area in scored if score == best])
@@ -1,65 +1,192 @@
 import os
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, g, render_template, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
-from groq import Groq
 from dotenv import load_dotenv
-from pypdf import PdfReader
 from io import BytesIO
 import re
 import json
+import time
 import datetime
-
-# Optional PDF export (requires reportlab)
-try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-    from reportlab.lib import colors
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
+import uuid
+import contextvars
+import copy
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
 # Import Agents
 from agents.profiler import ProfilerAgent
+from agents.assessor import AssessorAgent
+from agents.fast_classifier import FastPathClassifier
 from agents.grader import GraderAgent
-from agents.interviewer import InterviewerAgent
+from agents.interviewer import InterviewerAgent, ResponseStreamParser
+from agents.conversation_window import ConversationWindow, estimate_tokens
 from agents.feedback_generator import FeedbackGeneratorAgent
+from agents.nudges import NudgeResponder, pending_question
+from agents.question_bank import QuestionBank, opens_phase
+from services.llm_client import LLMClient, DEFAULT_TIMEOUTS
+from services.llm_scheduler import LLMScheduler, DEFAULT_PRIORITIES, llm_session
+from services.model_router import ModelRouter
+from services.session_store import SessionManager, InMemorySessionBackend
+from services.saved_sessions import SavedSessionStore
+from services.pdf_extraction import ResumeExtractor, ExtractionError
+from services.metrics import MetricsRegistry
+from services.feedback_drafts import FeedbackDrafts
+from services.score_stats import RunningScoreStats, SCORE_BUCKETS
+from services.candidate_profile import parse_resume, parse_jd, resume_digest, jd_digest
+from services.retrieval import BM25Index
+from services.lru_cache import LRUCache
+from services.learning_resources import LearningResourceCache, prewarm_profiles, resource_profile
+from services.pdf_reports import ReportRenderer, RenderError, PDF_AVAILABLE, report_key
 
 load_dotenv()
 
 app = Flask(__name__)
 CORS(app)
 
-client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+# Process-wide metrics, scraped from /metrics in Prometheus text format
+metrics = MetricsRegistry()
+request_latency = metrics.histogram("http_request_duration_seconds", "Time to produce a response, per route", ["route", "method", "status"])
+request_exceptions = metrics.counter("http_request_exceptions_total", "Unhandled exceptions raised by a route", ["route", "exception"])
+turn_stage_latency = metrics.histogram("interview_turn_stage_seconds", "Wall time of each stage of a chat turn", ["stage"])
+
+# Process-wide rate limiting for model calls: RPM/TPM token buckets, served by agent priority
+# (interviewer first) and round-robin across sessions within a priority
+llm_scheduler = LLMScheduler(
+    requests_per_minute=float(os.environ.get("LLM_RPM", "0")) or None,
+    tokens_per_minute=float(os.environ.get("LLM_TPM", "0")) or None,
+    priorities={
+        agent: int(os.environ[f"LLM_PRIORITY_{agent.upper()}"])
+        for agent in DEFAULT_PRIORITIES
+        if f"LLM_PRIORITY_{agent.upper()}" in os.environ
+    },
+    metrics=metrics
+)
+
+def model_route(agent):
+    """LLM_MODEL_<AGENT>, LLM_MAX_TOKENS_<AGENT>, LLM_SLO_MS_<AGENT> and LLM_FALLBACK_MODEL_<AGENT> (or LLM_FALLBACK_MODEL)."""
+    name = agent.upper()
+    route = {
+        "model": os.environ.get(f"LLM_MODEL_{name}") or None,
+        "max_tokens": int(os.environ.get(f"LLM_MAX_TOKENS_{name}", "0")) or None,
+        "slo_ms": float(os.environ.get(f"LLM_SLO_MS_{name}", "0")) or None,
+        "fallback": os.environ.get(f"LLM_FALLBACK_MODEL_{name}") or os.environ.get("LLM_FALLBACK_MODEL") or None
+    }
+    return {key: value for key, value in route.items() if value is not None}
+
+
+# Per-agent model choice: each agent's model and max_tokens can be configured, and an agent whose
+# rolling p90 latency breaches its SLO is moved to its fallback model for LLM_SLO_COOLDOWN seconds
+model_router = ModelRouter(
+    {agent: model_route(agent) for agent in DEFAULT_TIMEOUTS},
+    window=int(os.environ.get("LLM_SLO_WINDOW", "50")),
+    cooldown=float(os.environ.get("LLM_SLO_COOLDOWN", "60")),
+    metrics=metrics
+)
+
+# Shared LLM client: pooled connections, per-agent timeouts, retries and circuit breaking.
+# LLM_BASE_URL points it at any OpenAI-compatible server (e.g. benchmarks/fake_llm_server.py).
+client = LLMClient(
+    api_key=os.environ.get("GROQ_API_KEY"),
+    base_url=os.environ.get("LLM_BASE_URL") or None,
+    timeouts={
+        agent: float(os.environ[f"LLM_TIMEOUT_{agent.upper()}"])
+        for agent in DEFAULT_TIMEOUTS
+        if f"LLM_TIMEOUT_{agent.upper()}" in os.environ
+    },
+    max_retries=int(os.environ.get("LLM_MAX_RETRIES", "3")),
+    pool_size=int(os.environ.get("LLM_POOL_SIZE", "32")),
+    metrics=metrics,
+    scheduler=llm_scheduler,
+    router=model_router
+)
 
 # Initialize all agents
-profiler = ProfilerAgent(client)
+profiler = ProfilerAgent(
+    client,
+    FastPathClassifier(threshold=float(os.environ.get("FAST_PATH_THRESHOLD", "0.85")))
+    if os.environ.get("FAST_PATH_ENABLED", "true").lower() == "true" else None
+)
 grader = GraderAgent(client)
-interviewer = InterviewerAgent(client)
+assessor = AssessorAgent(client, profiler, grader)
+interviewer = InterviewerAgent(client, ConversationWindow(
+    max_turns=int(os.environ.get("HISTORY_MAX_TURNS", "6")),
+    token_budget=int(os.environ.get("HISTORY_TOKEN_BUDGET", "2000"))
+))
 feedback_generator = FeedbackGeneratorAgent(client)
 
-# Enhanced session context with state tracking
-session_context = {
-    "resume": "",
-    "jd": "",
-    "selected_role": "",
-    "current_question": "Introduction",
-    "interview_phase": "Introduction",
-    "question_count": 0,
-    "all_scores": [],
-    "interview_history": [],
-    "started": False,
-    "edge_cases_detected": [],
-    "red_flags_history": [],
-    "start_time": None,
-    "question_times": [],
-    "session_id": None
-}
+# Silence timeouts and off-topic turns are answered from templates instead of the interviewer
+# model; NUDGE_LLM_WHEN_EXHAUSTED hands them back to the model once a session has used every template
+NUDGE_TEMPLATES = os.environ.get("NUDGE_TEMPLATES", "true").lower() == "true"
+nudges = NudgeResponder(llm_when_exhausted=os.environ.get("NUDGE_LLM_WHEN_EXHAUSTED", "true").lower() == "true")
+nudge_replies = metrics.counter("interview_nudges_total", "Silent and off-topic turns by how the reply was produced", ["kind", "source"])
+
+# The opening question and the first question of each phase come from a per-role question bank
+# (built offline with tools.build_question_bank) filled in from the parsed resume
+QUESTION_BANK = os.environ.get("QUESTION_BANK", "true").lower() == "true"
+question_bank = QuestionBank(os.environ.get("QUESTION_BANK_PATH", "question_bank.json"))
+bank_replies = metrics.counter("interview_bank_questions_total", "Phase-opening questions by how they were produced", ["phase", "source"])
+
+# The server owns the transcript: a chat turn carries only the new message and the client's `seq`
+# (the number of turns it has seen), and a client that has fallen out of step is sent the transcript
+history_resyncs = metrics.counter("interview_history_resyncs_total", "Chat turns refused because the client's seq did not match the session", ["route"])
+
+# Feedback reports are drafted in the background after every graded answer, so the
+# end-of-interview report is usually ready before it is requested
+INCREMENTAL_FEEDBACK = os.environ.get("INCREMENTAL_FEEDBACK", "true").lower() == "true"
+feedback_drafts = FeedbackDrafts(
+    feedback_generator,
+    max_workers=int(os.environ.get("FEEDBACK_WORKERS", "4")),
+    metrics=metrics
+)
+
+# Agent execution mode: "sequential" runs profiler -> grader -> interviewer one after another,
+# "parallel" starts the grader speculatively alongside the profiler and discards its result
+# when the profiler decides the turn should not be graded, and "combined" profiles and grades
+# the turn with a single model call (AssessorAgent).
+AGENT_EXECUTION_MODE = os.environ.get("AGENT_EXECUTION_MODE", "sequential").strip().lower()
+
+# Characters of (resume, JD) context each agent gets, taken from the profiles parsed at upload
+CONTEXT_BUDGETS = {"interviewer": (1000, 900), "grader": (500, 700), "feedback": (900, 800)}
+
+# The grader gets the resume/JD chunks that best match the question and answer, up to this many tokens
+GRADER_CONTEXT_TOKENS = int(os.environ.get("GRADER_CONTEXT_TOKENS", "300"))
+GRADER_CONTEXT_CHUNKS = int(os.environ.get("GRADER_CONTEXT_CHUNKS", "6"))
+agent_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("AGENT_POOL_WORKERS", "8")),
+    thread_name_prefix="agent"
+)
+
+# Per-candidate interview state, keyed by session id (cookie or X-Session-ID header)
+SESSION_COOKIE = "interview_session"
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+sessions = SessionManager(
+    InMemorySessionBackend(),
+    idle_timeout=int(os.environ.get("SESSION_IDLE_TIMEOUT", "3600"))
+)
+metrics.gauge("interview_active_sessions", "Interview sessions held in memory", sessions.active_count)
 
-# In-memory session storage (in production, use database)
-saved_sessions = {}
+# Resume text extraction runs in a process pool with a SHA-256 keyed cache
+resume_extractor = ResumeExtractor(
+    max_workers=int(os.environ.get("PDF_WORKERS", "2")),
+    timeout=float(os.environ.get("PDF_EXTRACTION_TIMEOUT", "20")),
+    cache_entries=int(os.environ.get("PDF_CACHE_ENTRIES", "256")),
+    metrics=metrics
+)
+
+# Feedback report PDFs render in a process pool and are cached by content hash
+report_renderer = ReportRenderer(
+    max_workers=int(os.environ.get("REPORT_WORKERS", "2")),
+    timeout=float(os.environ.get("REPORT_RENDER_TIMEOUT", "30")),
+    cache_entries=int(os.environ.get("REPORT_CACHE_ENTRIES", "256")),
+    metrics=metrics
+)
+
+# Retrieval indexes over each session's resume/JD chunks; sessions hold plain data, so the
+# index is rebuilt from the chunks when a process first needs it
+context_indexes = LRUCache(max_entries=int(os.environ.get("CONTEXT_INDEX_CACHE_ENTRIES", "1024")))
+
+# Saved interview sessions (SQLite, WAL mode, batched writes)
+saved_sessions = SavedSessionStore(os.environ.get("SAVED_SESSIONS_DB", "saved_sessions.db"))
 
 # Available interview roles with descriptions
 AVAILABLE_ROLES = {
@@ -126,9 +253,53 @@ AVAILABLE_ROLES = {
 }
 
 
-def extract_pdf(file):
-    reader = PdfReader(BytesIO(file.read()))
-    return "".join([p.extract_text() for p in reader.pages])
+def resolve_resume(session_context):
+    """Fill in session_context['resume'] and its parsed profile once the background extraction job has finished."""
+    job_id = session_context.get('resume_job')
+    if not job_id:
+        return
+    try:
+        session_context['resume'] = resume_extractor.result(job_id)
+    except ExtractionError as e:
+        # Carry on without resume context rather than failing the interview
+        session_context['resume'] = ""
+        session_context['resume_error'] = str(e)
+    session_context['resume_job'] = None
+    session_context['resume_profile'] = parse_resume(session_context['resume'], datetime.date.today().year)
+    index_context(session_context)
+
+
+def index_context(session_context):
+    """Mark the session's resume/JD chunks as changed; the retrieval index is rebuilt on next use."""
+    session_context['context_index_key'] = uuid.uuid4().hex
+
+
+def context_index(session_context):
+    """
+    The BM25 index over the session's resume and JD chunks. The session only holds the chunks
+    (in its parsed profiles), so the index is built on first use in this process and cached.
+    """
+    key = session_context.get('context_index_key')
+    if key is None:
+        return None
+    index = context_indexes.get(key)
+    if index is None:
+        documents = [session_context.get('resume_profile'), session_context.get('jd_profile')]
+        index = BM25Index(chunk for profile in documents if profile for chunk in profile['chunks'])
+        context_indexes.put(key, index)
+    return index
+
+
+def session_score_stats(session_context):
+    """The session's RunningScoreStats, restored from the plain dict kept in the context."""
+    return RunningScoreStats.from_dict(session_context['score_stats'])
+
+
+def context_digests(session_context, agent, focus=""):
+    """(resume, JD) context for `agent`: digests of the parsed profiles within its budget."""
+    resume_chars, jd_chars = CONTEXT_BUDGETS[agent]
+    return (resume_digest(session_context.get('resume_profile'), resume_chars, focus),
+            jd_digest(session_context.get('jd_profile'), jd_chars, focus))
 
 
 def determine_interview_phase(question_count):
@@ -145,6 +316,91 @@ def determine_interview_phase(question_count):
         return "Feedback"
 
 
+def timed_call(fn, *args):
+    """Run fn(*args) and return (result, elapsed milliseconds)."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, round((time.perf_counter() - start) * 1000, 1)
+
+
+def should_grade(profile_data, started):
+    """The grader only scores relevant, non-silent answers once the interview has started."""
+    return profile_data['is_relevant'] and profile_data['persona'] != 'silent' and started
+
+
+def grader_context(session_context, query):
+    """
+    (resume, JD) for the grader: the indexed chunks that best match `query`, within
+    GRADER_CONTEXT_TOKENS. A document with no matching chunk contributes a short digest instead.
+    """
+    index = context_index(session_context)
+    chunks, used = index.select(query, GRADER_CONTEXT_CHUNKS, GRADER_CONTEXT_TOKENS, estimate_tokens) if index is not None else ([], 0)
+    picked = {"resume": [], "jd": []}
+    for chunk in chunks:
+        picked[chunk['source']].append(chunk['text'])
+    resume_chars, jd_chars = CONTEXT_BUDGETS["grader"]
+    room = max(0, GRADER_CONTEXT_TOKENS - used) * 4
+    return (
+        "\n".join(picked["resume"]) or resume_digest(session_context.get('resume_profile'), min(resume_chars, room // 2), query),
+        "\n".join(picked["jd"]) or jd_digest(session_context.get('jd_profile'), min(jd_chars, room), query)
+    )
+
+
+def grader_inputs(session_context, user_msg):
+    """Positional arguments for GraderAgent.evaluate."""
+    resume, jd = grader_context(session_context, f"{session_context['current_question']} {user_msg}")
+    return (
+        user_msg,
+        session_context['current_question'],
+        jd,
+        resume,
+        session_score_stats(session_context)  # Previous average and trend
+    )
+
+
+def assess_turn(session_context, user_msg):
+    """
+    Run the profiler and grader for one candidate turn.
+
+    Returns (profile_data, grader_data, timings). In parallel mode the grader is launched
+    speculatively on the agent pool while the profiler runs on the request thread; in combined
+    mode one AssessorAgent call does both.
+    """
+    timings = {"mode": AGENT_EXECUTION_MODE}
+    started = session_context['started']
+    history = session_context['interview_history']
+    grader_args = grader_inputs(session_context, user_msg)
+    stage_start = time.perf_counter()
+
+    if AGENT_EXECUTION_MODE == "combined":
+        (profile_data, grader_data), timings['assessor_ms'] = timed_call(assessor.assess, user_msg, history, grader_args, started)
+    elif AGENT_EXECUTION_MODE == "parallel":
+        grader_future = None
+        if started and "[SYSTEM_TIMEOUT]" not in user_msg:
+            # Copy the context so the grader's LLM call lands in this turn's trace
+            grader_future = agent_pool.submit(contextvars.copy_context().run, timed_call, grader.evaluate, *grader_args)
+
+        profile_data, timings['profiler_ms'] = timed_call(profiler.analyze, user_msg, history)
+
+        grader_data = {}
+        if grader_future is not None:
+            if should_grade(profile_data, started):
+                grader_data, timings['grader_ms'] = grader_future.result()
+            else:
+                # Speculative grade is not needed for this turn; drop it
+                grader_future.cancel()
+                timings['grader_discarded'] = True
+    else:
+        profile_data, timings['profiler_ms'] = timed_call(profiler.analyze, user_msg, history)
+
+        grader_data = {}
+        if should_grade(profile_data, started):
+            grader_data, timings['grader_ms'] = timed_call(grader.evaluate, *grader_args)
+
+    timings['assessment_ms'] = round((time.perf_counter() - stage_start) * 1000, 1)
+    return profile_data, grader_data, timings
+
+
 def check_interview_end(user_msg, question_count):
     """Check if user wants to end the interview."""
     end_phrases = [
@@ -156,6 +412,57 @@ def check_interview_end(user_msg, question_count):
     return any(phrase in user_lower for phrase in end_phrases) or question_count >= 12
 
 
+def current_session_id():
+    """Session id from the X-Session-ID header or cookie; a new one is issued if missing."""
+    session_id = request.headers.get("X-Session-ID") or request.cookies.get(SESSION_COOKIE)
+    if not session_id or not SESSION_ID_PATTERN.match(session_id):
+        session_id = g.get('new_session_id') or uuid.uuid4().hex
+        g.new_session_id = session_id
+    return session_id
+
+
+def route_label():
+    return request.url_rule.rule if request.url_rule else "unmatched"
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """Observe route latency. Streaming routes are measured up to the first byte only."""
+    started = g.get('request_start')
+    if started is not None:
+        request_latency.observe(time.perf_counter() - started, route=route_label(),
+                                method=request.method, status=response.status_code)
+    return response
+
+
+@app.teardown_request
+def record_request_exception(error):
+    if error is not None:
+        request_exceptions.inc(route=route_label(), exception=type(error).__name__)
+
+
+def record_turn_timings(timings):
+    """Feed a turn's stage timings (milliseconds) into the stage latency histogram."""
+    for stage in ("profiler", "grader", "assessor", "assessment", "interviewer", "first_token", "total"):
+        if f"{stage}_ms" in timings:
+            turn_stage_latency.observe(timings[f"{stage}_ms"] / 1000, stage=stage)
+
+
+@app.after_request
+def issue_session_cookie(response):
+    """Hand newly created session ids back to the browser."""
+    session_id = g.get('new_session_id')
+    if session_id:
+        response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite='Lax')
+        response.headers["X-Session-ID"] = session_id
+    return response
+
+
 @app.route('/')
 def home():
     return render_template('index.html')
@@ -168,99 +475,193 @@ def upload():
     selected_role = request.form.get('role', 'software_engineer')
     
     if resume and jd:
-        session_context['resume'] = extract_pdf(resume)
-        session_context['jd'] = jd
-        session_context['selected_role'] = selected_role
-        session_context['question_count'] = 0
-        session_context['all_scores'] = []
-        session_context['interview_history'] = []
-        session_context['started'] = False
-        session_context['interview_phase'] = "Introduction"
-        session_context['edge_cases_detected'] = []
-        session_context['red_flags_history'] = []
+        # Parsing happens in the background; the interview picks the text up when it is ready
+        job_id = resume_extractor.submit(resume.read())
+        with sessions.session(current_session_id()) as session_context:
+            session_context['resume'] = ""
+            session_context['resume_job'] = job_id
+            session_context['resume_error'] = None
+            session_context['resume_profile'] = None
+            session_context['jd'] = jd
+            session_context['jd_profile'] = parse_jd(jd, datetime.date.today().year)
+            index_context(session_context)
+            session_context['selected_role'] = selected_role
+            session_context['question_count'] = 0
+            session_context['all_scores'] = []
+            session_context['score_stats'] = RunningScoreStats().to_dict()
+            session_context['interview_history'] = []
+            session_context['started'] = False
+            session_context['interview_phase'] = "Introduction"
+            session_context['edge_cases_detected'] = []
+            session_context['red_flags_history'] = []
+            session_context['conversation_window'] = {}
+            session_context['feedback_notes'] = []
+            session_context['pending_question'] = ""
+            session_context['nudges_used'] = {}
+            session_context['bank_focus_used'] = []
+            session_context['history_seq'] = 0
+            feedback_drafts.discard(session_context['session_id'])
         
         role_info = AVAILABLE_ROLES.get(selected_role, AVAILABLE_ROLES['software_engineer'])
         
         return jsonify({
             "status": "success",
             "message": f"Byte is ready for {role_info['name']} interview. Let's begin!",
-            "role": role_info['name']
+            "role": role_info['name'],
+            "resume_job": job_id,
+            "resume_status": resume_extractor.status(job_id)['status']
         })
     
     return jsonify({"error": "Missing inputs"}), 400
 
 
-@app.route('/chat', methods=['POST'])
-def chat():
-    data = request.json
-    user_msg = data.get('message', '')
-    history = data.get('history', [])
+@app.route('/upload-status/<job_id>', methods=['GET'])
+def upload_status(job_id):
+    """Poll the resume extraction job started by /upload-context."""
+    return jsonify(resume_extractor.status(job_id))
+
+
+def feedback_inputs(session_context):
+    """Positional arguments for FeedbackGeneratorAgent.generate_comprehensive_feedback."""
+    return (
+        session_context['interview_history'],
+        *context_digests(session_context, "feedback"),
+        session_score_stats(session_context),
+        session_context['question_count']
+    )
+
+
+def draft_inputs(session_context):
+    """Positional arguments for FeedbackDrafts.schedule/finalize after the session id."""
+    return (
+        session_context['feedback_notes'],
+        *context_digests(session_context, "feedback"),
+        session_score_stats(session_context),
+        session_context['question_count']
+    )
+
+
+def final_feedback(session_context):
+    """
+    The end-of-interview report: the background draft (merged with any notes it has not seen
+    yet), or the one-shot transcript report when incremental feedback is off or unavailable.
+    """
+    if INCREMENTAL_FEEDBACK:
+        feedback = feedback_drafts.finalize(session_context['session_id'], *draft_inputs(session_context))
+        if feedback is not None:
+            return feedback
+    return feedback_generator.generate_comprehensive_feedback(*feedback_inputs(session_context))
+
+
+def finish_interview(session_context):
+    """Generate the end-of-interview report and return the /chat payload for it."""
+    return interview_complete_payload(session_context, final_feedback(session_context))
 
-    # Check if interview should end
-    should_end = check_interview_end(user_msg, session_context['question_count'])
+
+def interview_complete_payload(session_context, feedback):
+    """The /chat payload that closes the interview with the given feedback report."""
+    # Add edge cases and red flags summary to feedback
+    edge_cases_summary = ""
+    if session_context['edge_cases_detected']:
+        edge_cases_summary = f"\n\n## Edge Cases Detected ({len(session_context['edge_cases_detected'])})\n"
+        edge_cases_summary += "The following off-topic questions were detected and handled:\n"
+        for i, ec in enumerate(session_context['edge_cases_detected'], 1):
+            edge_cases_summary += f"{i}. {ec['question']}\n"
     
-    if should_end and session_context['question_count'] > 0:
-        # Generate comprehensive feedback
-        feedback = feedback_generator.generate_comprehensive_feedback(
-            session_context['interview_history'],
-            session_context['resume'],
-            session_context['jd'],
-            session_context['all_scores'],
-            session_context['question_count']
-        )
-        
-        # Add edge cases and red flags summary to feedback
-        edge_cases_summary = ""
-        if session_context['edge_cases_detected']:
-            edge_cases_summary = f"\n\n## Edge Cases Detected ({len(session_context['edge_cases_detected'])})\n"
-            edge_cases_summary += "The following off-topic questions were detected and handled:\n"
-            for i, ec in enumerate(session_context['edge_cases_detected'], 1):
-                edge_cases_summary += f"{i}. {ec['question']}\n"
+    red_flags_summary = ""
+    if session_context.get('red_flags_history'):
+        red_flags_summary = f"\n\n## Red Flags & Critical Issues Detected ({len(session_context['red_flags_history'])})\n"
+        red_flags_summary += "The following issues were identified during the interview:\n"
+        memorization_count = sum(1 for rf in session_context['red_flags_history'] if rf.get('memorization_detected'))
+        knowledge_gaps_count = sum(1 for rf in session_context['red_flags_history'] if rf.get('knowledge_gaps'))
         
-        red_flags_summary = ""
-        if session_context.get('red_flags_history'):
-            red_flags_summary = f"\n\n## Red Flags & Critical Issues Detected ({len(session_context['red_flags_history'])})\n"
-            red_flags_summary += "The following issues were identified during the interview:\n"
-            memorization_count = sum(1 for rf in session_context['red_flags_history'] if rf.get('memorization_detected'))
-            knowledge_gaps_count = sum(1 for rf in session_context['red_flags_history'] if rf.get('knowledge_gaps'))
-            
-            if memorization_count > 0:
-                red_flags_summary += f"- **Memorization Detected**: {memorization_count} instances where answers appeared memorized rather than understood\n"
-            if knowledge_gaps_count > 0:
-                red_flags_summary += f"- **Knowledge Gaps**: {knowledge_gaps_count} instances where significant knowledge gaps were identified\n"
-            
-            all_red_flags = []
-            for rf in session_context['red_flags_history']:
-                all_red_flags.extend(rf.get('red_flags', []))
-            if all_red_flags:
-                red_flags_summary += f"- **Specific Red Flags**: {', '.join(set(all_red_flags[:10]))}\n"
+        if memorization_count > 0:
+            red_flags_summary += f"- **Memorization Detected**: {memorization_count} instances where answers appeared memorized rather than understood\n"
+        if knowledge_gaps_count > 0:
+            red_flags_summary += f"- **Knowledge Gaps**: {knowledge_gaps_count} instances where significant knowledge gaps were identified\n"
         
-        feedback = feedback + edge_cases_summary + red_flags_summary
-        
-        return jsonify({
-            "response": feedback,
-            "interview_complete": True,
-            "analytics": {
-                "total_questions": session_context['question_count'],
-                "average_score": sum(session_context['all_scores']) / len(session_context['all_scores']) if session_context['all_scores'] else 0,
-                "highest_score": max(session_context['all_scores']) if session_context['all_scores'] else 0,
-                "lowest_score": min(session_context['all_scores']) if session_context['all_scores'] else 0,
-                "edge_cases_count": len(session_context['edge_cases_detected'])
-            },
-            "debug": {
-                "persona": "feedback",
-                "phase": "Feedback",
-                "edge_cases_detected": len(session_context['edge_cases_detected'])
-            }
-        })
+        all_red_flags = []
+        for rf in session_context['red_flags_history']:
+            all_red_flags.extend(rf.get('red_flags', []))
+        if all_red_flags:
+            red_flags_summary += f"- **Specific Red Flags**: {', '.join(set(all_red_flags[:10]))}\n"
+    
+    feedback = feedback + edge_cases_summary + red_flags_summary
+    
+    scores = session_score_stats(session_context).summary()
+    return {
+        "response": feedback,
+        "interview_complete": True,
+        "analytics": {
+            "total_questions": session_context['question_count'],
+            "average_score": scores['average'],
+            "highest_score": scores['highest'],
+            "lowest_score": scores['lowest'],
+            "score_stdev": scores['stdev'],
+            "trend": scores['trend'],
+            "edge_cases_count": len(session_context['edge_cases_detected'])
+        },
+        "debug": {
+            "persona": "feedback",
+            "phase": "Feedback",
+            "edge_cases_detected": len(session_context['edge_cases_detected'])
+        }
+    }
+
+
+# Session fields a chat turn changes; they are staged on a copy until the reply is complete
+TURN_STATE = ('interview_history', 'edge_cases_detected', 'red_flags_history', 'all_scores', 'score_stats',
+              'feedback_notes', 'nudges_used', 'bank_focus_used', 'conversation_window')
+
+
+def stage_turn(session_context, user_msg):
+    """
+    Working copy of the session for one candidate turn, with the message recorded.
 
+    Everything the turn records (history, scores, notes, nudge/bank/window state) goes on the
+    copy, and commit_turn writes it back once the reply is complete, so a turn that fails or is
+    abandoned midway leaves the session as it was.
+    """
+    turn = dict(session_context)
+    for key in TURN_STATE:
+        if key in session_context:
+            turn[key] = copy.deepcopy(session_context[key])
+    # Only set again if the interviewer model builds a prompt (not on nudge or question-bank turns)
+    turn.get('conversation_window', {}).pop('last_turn', None)
+    record_user_message(turn, user_msg)
+    return turn
+
+
+def begin_turn(session_context, user_msg):
+    """
+    Stage the candidate's message and run the profiler/grader stage.
+
+    Returns (turn, profile_data, grader_data, timings); `turn` is the staged copy of the session
+    for the interviewer stage and commit_turn.
+    """
+    resolve_resume(session_context)
+    turn = stage_turn(session_context, user_msg)
+
+    # 1. PROFILE THE USER + 2. GRADE THE ANSWER (only if relevant & not silent)
+    profile_data, grader_data, timings = assess_turn(turn, user_msg)
+    record_assessment(turn, user_msg, profile_data, grader_data)
+
+    return turn, profile_data, grader_data, timings
+
+
+def record_user_message(session_context, user_msg):
     # Update interview history
     if user_msg and user_msg != "[SYSTEM_TIMEOUT]":
         session_context['interview_history'].append({"role": "user", "content": user_msg})
 
-    # 1. PROFILE THE USER
-    profile_data = profiler.analyze(user_msg, history)
-    
+
+def scored(grader_data):
+    """Whether the grader produced a real score (a fallback's placeholder score is not the candidate's)."""
+    return 'score' in grader_data and not grader_data.get('fallback')
+
+
+def record_assessment(session_context, user_msg, profile_data, grader_data):
+    """Track edge cases, red flags and the score from the profiler/grader stage."""
     # Track edge cases explicitly
     if profile_data.get('persona') == 'edge_case' or not profile_data.get('is_relevant', True):
         edge_case_entry = {
@@ -282,65 +683,119 @@ def chat():
             "knowledge_gaps": profile_data.get('knowledge_gaps_detected', False)
         })
 
-    # 2. GRADE THE ANSWER (Only if relevant & not silent)
-    grader_data = {}
-    if profile_data['is_relevant'] and profile_data['persona'] != 'silent' and session_context['started']:
-        grader_data = grader.evaluate(
-            user_msg,
-            session_context['current_question'],
-            session_context['jd'],
-            session_context['resume'],
-            session_context['all_scores']  # Pass previous scores for trend analysis
-        )
-        
-        # Store score
-        if 'score' in grader_data:
-            session_context['all_scores'].append(grader_data['score'])
+    # Store score
+    if scored(grader_data):
+        score_stats = session_score_stats(session_context)
+        score_stats.add(grader_data['score'])
+        session_context['all_scores'].append(grader_data['score'])
+        session_context['score_stats'] = score_stats.to_dict()
+        session_context['feedback_notes'].append(
+            feedback_generator.question_note(session_context['current_question'], user_msg, grader_data))
+
 
-    # 3. GENERATE RESPONSE
+def interviewer_args(session_context, user_msg, profile_data, grader_data):
+    """Positional arguments shared by InterviewerAgent.generate_response and stream_response."""
     role_info = AVAILABLE_ROLES.get(session_context.get('selected_role', 'software_engineer'), AVAILABLE_ROLES['software_engineer'])
-    raw_response = interviewer.generate_response(
+    resume, jd = context_digests(session_context, "interviewer", f"{session_context['pending_question']} {user_msg}")
+    return (
         user_msg,
-        history,
-        session_context['resume'],
-        session_context['jd'],
+        session_context['interview_history'],
+        resume,
+        jd,
         profile_data,
         grader_data,
         session_context['interview_phase'],
         session_context['question_count'],
-        role_info
+        role_info,
+        session_context['conversation_window']
     )
 
+
+def nudge_response(session_context, profile_data):
+    """Template reply for a silent or off-topic turn, or None when the interviewer model should answer."""
+    kind = nudges.kind(profile_data)
+    if kind is None:
+        return None
+    response = None
+    if NUDGE_TEMPLATES:
+        role_info = AVAILABLE_ROLES.get(session_context.get('selected_role'))
+        pending = session_context['pending_question']
+        response = nudges.respond(kind, session_context['nudges_used'], role_info, session_context['interview_phase'], pending)
+        asked = nudges.recap_question(kind, pending)
+        if response is not None and asked != pending:
+            # The nudge asked the opening question itself; the candidate's next message answers it
+            session_context['pending_question'] = session_context['current_question'] = asked
+    nudge_replies.inc(kind=kind, source="llm" if response is None else "template")
+    return response
+
+
+def bank_question(session_context, profile_data, grader_data):
+    """Question-bank reply opening a new interview phase, or None when the interviewer model should answer."""
+    phase = opens_phase(session_context['question_count'], determine_interview_phase)
+    # Follow-ups and turns that need the model to adapt (confusion, silence, off-topic) are not banked,
+    # nor is the opening once the interview has started (a nudge already asked it)
+    if (phase is None or (session_context['question_count'] == 0 and session_context['started'])
+            or grader_data.get('requires_followup', False) or not profile_data.get('is_relevant', True)
+            or profile_data.get('persona') in ('confused', 'silent', 'edge_case')):
+        return None
+    response = None
+    if QUESTION_BANK:
+        role_key = session_context.get('selected_role')
+        response = question_bank.question(role_key, AVAILABLE_ROLES.get(role_key), phase,
+                                          session_context.get('resume_profile'), session_context['bank_focus_used'])
+    bank_replies.inc(phase=phase, source="llm" if response is None else "bank")
+    return response
+
+
+def commit_turn(session_context, turn, user_msg, raw_response, profile_data, grader_data, nudged=False):
+    """
+    Apply the interviewer's reply to the staged turn (phase, question count, history) and write
+    the turn back to the session.
+
+    A template nudge does not ask a new question, so it leaves the question count and the
+    pending question alone.
+    """
     # Extract response text (remove analysis section for storage)
     response_text = raw_response
     if "[RESPONSE]" in raw_response:
         response_text = raw_response.split("[RESPONSE]")[-1].strip()
     
     # Update interview state
-    if session_context['started'] or (user_msg and user_msg != "[SYSTEM_TIMEOUT]"):
-        session_context['started'] = True
+    if turn['started'] or (user_msg and user_msg != "[SYSTEM_TIMEOUT]"):
+        turn['started'] = True
         # Increment question count if this is a new question (not a follow-up)
-        if profile_data.get('persona') != 'silent' and not grader_data.get('requires_followup', False):
-            session_context['question_count'] += 1
-            session_context['interview_phase'] = determine_interview_phase(session_context['question_count'])
+        if not nudged and profile_data.get('persona') != 'silent' and not grader_data.get('requires_followup', False):
+            turn['question_count'] += 1
+            turn['interview_phase'] = determine_interview_phase(turn['question_count'])
     
     # Store current question for next turn's context
-    session_context['current_question'] = response_text[:200]
+    if not nudged:
+        turn['current_question'] = response_text[:200]
+        turn['pending_question'] = pending_question(response_text)
     
-    # Update interview history
-    session_context['interview_history'].append({"role": "assistant", "content": raw_response})
+    # Update interview history (spoken text only; the [ANALYSIS] block is not replayed to the model)
+    turn['interview_history'].append({"role": "assistant", "content": response_text})
+    turn['history_seq'] += 1
 
-    # Enhanced debug information
-    return jsonify({
+    session_context.update(turn)
+    if INCREMENTAL_FEEDBACK and scored(grader_data):
+        feedback_drafts.schedule(session_context['session_id'], *draft_inputs(session_context))
+
+
+def turn_payload(session_context, raw_response, profile_data, grader_data, timings, llm_calls):
+    """Build the /chat response body for a completed turn."""
+    score_stats = session_score_stats(session_context)
+    return {
         "response": raw_response,
+        "seq": session_context['history_seq'],
         "interview_complete": False,
-            "debug": {
+        "debug": {
             "persona": profile_data.get('persona', 'normal'),
-            "score": grader_data.get('score', 'N/A'),
+            "score": 'N/A' if grader_data.get('fallback') else grader_data.get('score', 'N/A'),
             "follow_up": grader_data.get('requires_followup', False),
             "phase": session_context['interview_phase'],
             "question_count": session_context['question_count'],
-            "average_score": sum(session_context['all_scores']) / len(session_context['all_scores']) if session_context['all_scores'] else 'N/A',
+            "average_score": score_stats.mean if score_stats else 'N/A',
             "confidence": profile_data.get('confidence', 'medium'),
             "communication_quality": profile_data.get('communication_quality', 'good'),
             "is_edge_case": profile_data.get('persona') == 'edge_case' or not profile_data.get('is_relevant', True),
@@ -349,30 +804,198 @@ def chat():
             "red_flags": profile_data.get('red_flags', []) + grader_data.get('red_flags', []),
             "knowledge_gaps": profile_data.get('knowledge_gaps_detected', False),
             "authenticity_score": profile_data.get('authenticity_score', 0.7),
-            "specificity_score": profile_data.get('specificity_score', 0.7)
+            "specificity_score": profile_data.get('specificity_score', 0.7),
+            "timings": timings,
+            "prompt_tokens": session_context['conversation_window'].get('last_turn', {}),
+            "classified_by": profile_data.get('classified_by', 'llm'),
+            "fast_path": profiler.fast_path.stats() if profiler.fast_path else None,
+            "llm_calls": llm_calls,
+            "model_routes": model_router.snapshot()
         },
         "analytics": {
             "total_questions": session_context['question_count'],
             "scores": session_context['all_scores'],
-            "trend": "improving" if len(session_context['all_scores']) > 1 and session_context['all_scores'][-1] > session_context['all_scores'][0] else "stable"
-        } if session_context['all_scores'] else {}
-    })
+            "trend": score_stats.trend()
+        } if score_stats else {}
+    }
 
 
-@app.route('/get-feedback', methods=['POST'])
-def get_feedback():
-    """Explicit endpoint to generate feedback at any time."""
-    if session_context['question_count'] == 0:
-        return jsonify({"error": "No interview conducted yet"}), 400
+def history_resync(session_context, data, route):
+    """
+    The resync body for a chat turn whose `seq` does not match the session, or None.
+
+    `seq` is the number of turns the client has seen, as returned by the previous turn. A
+    mismatch means a reply was lost or a message was sent twice, so the turn is refused and
+    the client gets the server's transcript and seq to continue from. Requests without `seq`
+    (older clients still posting `history`) are accepted; their history is ignored.
+    """
+    seq = data.get('seq')
+    if seq is None or seq == session_context['history_seq']:
+        return None
+    history_resyncs.inc(route=route)
+    return {
+        "error": "out_of_sync",
+        "seq": session_context['history_seq'],
+        "history": session_context['interview_history']
+    }
+
+
+def sse_event(event, data):
+    """Format one server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.route('/chat', methods=['POST'])
+def chat():
+    turn_start = time.perf_counter()
+    data = request.json
+    user_msg = data.get('message', '')
+
+    session_id = current_session_id()
+    with sessions.session(session_id) as session_context, client.trace() as llm_calls, llm_session(session_id):
+        resync = history_resync(session_context, data, "chat")
+        if resync:
+            return jsonify(resync), 409
+
+        # Check if interview should end
+        should_end = check_interview_end(user_msg, session_context['question_count'])
     
-    feedback = feedback_generator.generate_comprehensive_feedback(
-        session_context['interview_history'],
-        session_context['resume'],
-        session_context['jd'],
-        session_context['all_scores'],
-        session_context['question_count']
+        if should_end and session_context['question_count'] > 0:
+            # Generate comprehensive feedback
+            return jsonify(finish_interview(session_context))
+
+        turn, profile_data, grader_data, timings = begin_turn(session_context, user_msg)
+
+        # 3. GENERATE RESPONSE (silent and off-topic turns are usually answered from a template)
+        interviewer_start = time.perf_counter()
+        nudge = nudge_response(turn, profile_data)
+        banked = None if nudge else bank_question(turn, profile_data, grader_data)
+        raw_response = nudge or banked or interviewer.generate_response(*interviewer_args(turn, user_msg, profile_data, grader_data))
+        timings['interviewer_ms'] = round((time.perf_counter() - interviewer_start) * 1000, 1)
+        timings['nudge'] = nudge is not None
+        timings['question_bank'] = banked is not None
+
+        commit_turn(session_context, turn, user_msg, raw_response, profile_data, grader_data, nudged=nudge is not None)
+        timings['total_ms'] = round((time.perf_counter() - turn_start) * 1000, 1)
+        record_turn_timings(timings)
+
+        # Enhanced debug information
+        return jsonify(turn_payload(session_context, raw_response, profile_data, grader_data, timings, llm_calls))
+
+
+def stream_turn(session_context, user_msg, turn_start, llm_calls):
+    """
+    Generator for one /chat-stream turn: yields `token` events and returns the closing event.
+
+    The turn is staged by begin_turn and only written to the session by commit_turn after the
+    last token, so an interviewer error, or the client going away mid-stream (GeneratorExit at a
+    yield), leaves the session exactly as it was.
+    """
+    turn, profile_data, grader_data, timings = begin_turn(session_context, user_msg)
+
+    parser = ResponseStreamParser()
+    raw_parts = []
+    interviewer_start = time.perf_counter()
+    nudge = nudge_response(turn, profile_data)
+    banked = None if nudge else bank_question(turn, profile_data, grader_data)
+    timings['nudge'] = nudge is not None
+    timings['question_bank'] = banked is not None
+    deltas = ()
+    try:
+        deltas = [nudge or banked] if nudge or banked else interviewer.stream_response(
+            *interviewer_args(turn, user_msg, profile_data, grader_data))
+        for delta in deltas:
+            raw_parts.append(delta)
+            text = parser.feed(delta)
+            if text:
+                if 'first_token_ms' not in timings:
+                    timings['first_token_ms'] = round((time.perf_counter() - turn_start) * 1000, 1)
+                yield sse_event("token", {"text": text})
+        tail = parser.close()
+        if tail:
+            timings.setdefault('first_token_ms', round((time.perf_counter() - turn_start) * 1000, 1))
+            yield sse_event("token", {"text": tail})
+    except Exception as e:
+        return sse_event("error", {"message": str(e)})
+    finally:
+        # Closing an abandoned model stream settles it now rather than whenever it is collected
+        if hasattr(deltas, 'close'):
+            deltas.close()
+        timings['interviewer_ms'] = round((time.perf_counter() - interviewer_start) * 1000, 1)
+
+    raw_response = "".join(raw_parts)
+    commit_turn(session_context, turn, user_msg, raw_response, profile_data, grader_data, nudged=nudge is not None)
+    timings['total_ms'] = round((time.perf_counter() - turn_start) * 1000, 1)
+    record_turn_timings(timings)
+    return sse_event("done", turn_payload(session_context, raw_response, profile_data, grader_data, timings, llm_calls))
+
+
+@app.route('/chat-stream', methods=['POST'])
+def chat_stream():
+    """
+    Streaming variant of /chat served as server-sent events.
+
+    Emits `token` events carrying [RESPONSE] text as it is generated (the [ANALYSIS] block is
+    held back), then a single `done` event with the same body /chat would have returned. A turn
+    whose `seq` is out of step gets a single `resync` event instead.
+    Session state is only committed once the stream has finished; see stream_turn().
+    """
+    turn_start = time.perf_counter()
+    data = request.json
+    user_msg = data.get('message', '')
+
+    session_id = current_session_id()
+
+    def generate():
+        # The closing event is sent after the session is saved, so a client that disconnects
+        # while reading it cannot cost the committed turn
+        with sessions.session(session_id) as session_context, client.trace() as llm_calls, llm_session(session_id):
+            resync = history_resync(session_context, data, "chat-stream")
+            if resync:
+                closing = sse_event("resync", resync)
+            # Check if interview should end
+            elif check_interview_end(user_msg, session_context['question_count']) and session_context['question_count'] > 0:
+                closing = sse_event("done", finish_interview(session_context))
+            else:
+                closing = yield from stream_turn(session_context, user_msg, turn_start, llm_calls)
+        yield closing
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
-    
+
+
+@app.route('/get-feedback', methods=['POST'])
+def get_feedback():
+    """
+    Explicit endpoint to generate feedback at any time.
+
+    Returns the latest background draft straight away when there is one (`up_to_date` says
+    whether it covers every graded answer); otherwise the report is generated now.
+    """
+    session_id = current_session_id()
+    with sessions.session(session_id) as session_context, llm_session(session_id):
+        if session_context['question_count'] == 0:
+            return jsonify({"error": "No interview conducted yet"}), 400
+
+        draft = feedback_drafts.latest(session_context['session_id']) if INCREMENTAL_FEEDBACK else None
+        if draft:
+            up_to_date = draft['version'] >= len(session_context['feedback_notes'])
+            return jsonify(feedback_payload(session_context, draft['report'], up_to_date))
+        return jsonify(feedback_payload(session_context, final_feedback(session_context)))
+
+
+@app.route('/feedback-status', methods=['GET'])
+def feedback_status():
+    """State of the background feedback draft for this session."""
+    with sessions.session(current_session_id()) as session_context:
+        return jsonify(feedback_drafts.status(session_context['session_id'], len(session_context['feedback_notes'])))
+
+
+def feedback_payload(session_context, feedback, up_to_date=True):
+    """The /get-feedback response body for a generated report."""
     # Add edge cases summary to feedback
     if session_context['edge_cases_detected']:
         edge_cases_summary = f"\n\n## Edge Cases Detected ({len(session_context['edge_cases_detected'])})\n"
@@ -380,42 +1003,40 @@ def get_feedback():
         for i, ec in enumerate(session_context['edge_cases_detected'], 1):
             edge_cases_summary += f"{i}. {ec['question']}\n"
         feedback = feedback + edge_cases_summary
-    
-    return jsonify({
+
+    scores = session_score_stats(session_context).summary()
+    return {
         "feedback": feedback,
+        "up_to_date": up_to_date,
+        "feedback_job": feedback_drafts.status(session_context['session_id'], len(session_context['feedback_notes'])),
         "analytics": {
             "total_questions": session_context['question_count'],
-            "average_score": sum(session_context['all_scores']) / len(session_context['all_scores']) if session_context['all_scores'] else 0,
-            "highest_score": max(session_context['all_scores']) if session_context['all_scores'] else 0,
-            "lowest_score": min(session_context['all_scores']) if session_context['all_scores'] else 0,
-            "score_distribution": {
-                "excellent": len([s for s in session_context['all_scores'] if s >= 90]),
-                "good": len([s for s in session_context['all_scores'] if 70 <= s < 90]),
-                "satisfactory": len([s for s in session_context['all_scores'] if 50 <= s < 70]),
-                "needs_improvement": len([s for s in session_context['all_scores'] if s < 50])
-            },
+            "average_score": scores['average'],
+            "highest_score": scores['highest'],
+            "lowest_score": scores['lowest'],
+            "score_stdev": scores['stdev'],
+            "trend": scores['trend'],
+            "score_distribution": scores['distribution'],
             "edge_cases_count": len(session_context['edge_cases_detected'])
         }
-    })
+    }
 
 
 @app.route('/reset', methods=['POST'])
 def reset():
     """Reset interview session."""
-    session_context['resume'] = ""
-    session_context['jd'] = ""
-    session_context['selected_role'] = ""
-    session_context['current_question'] = "Introduction"
-    session_context['interview_phase'] = "Introduction"
-    session_context['question_count'] = 0
-    session_context['all_scores'] = []
-    session_context['interview_history'] = []
-    session_context['started'] = False
-    session_context['edge_cases_detected'] = []
-    session_context['red_flags_history'] = []
+    session_id = current_session_id()
+    sessions.reset(session_id)
+    feedback_drafts.discard(session_id)
     
     return jsonify({"status": "success", "message": "Session reset"})
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape endpoint."""
+    return Response(metrics.render(), content_type=MetricsRegistry.CONTENT_TYPE)
+
+
 @app.route('/get-roles', methods=['GET'])
 def get_roles():
     """Get available interview roles."""
@@ -427,52 +1048,85 @@ def get_roles():
 def save_session():
     """Save current interview session."""
     try:
-        session_id = request.json.get('session_id') or f"session_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        session_data = {
-            "session_id": session_id,
-            "timestamp": datetime.datetime.now().isoformat(),
-            "role": session_context.get('selected_role', ''),
-            "resume": session_context.get('resume', '')[:500],  # Store summary
-            "jd": session_context.get('jd', '')[:500],
-            "question_count": session_context.get('question_count', 0),
-            "all_scores": session_context.get('all_scores', []),
-            "average_score": sum(session_context.get('all_scores', [])) / len(session_context.get('all_scores', [])) if session_context.get('all_scores') else 0,
-            "interview_history": session_context.get('interview_history', [])[-50:],  # Last 50 messages
-            "edge_cases_count": len(session_context.get('edge_cases_detected', [])),
-            "duration": sum(session_context.get('question_times', [])) if session_context.get('question_times') else 0
-        }
-        saved_sessions[session_id] = session_data
-        return jsonify({"status": "success", "session_id": session_id, "message": "Session saved successfully"})
+        with sessions.session(current_session_id()) as session_context:
+            resolve_resume(session_context)
+            session_id = request.json.get('session_id') or f"session_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            session_data = {
+                "session_id": session_id,
+                "timestamp": datetime.datetime.now().isoformat(),
+                "role": session_context.get('selected_role', ''),
+                "resume": session_context.get('resume', '')[:500],  # Store summary
+                "jd": session_context.get('jd', '')[:500],
+                "question_count": session_context.get('question_count', 0),
+                "all_scores": list(session_context.get('all_scores', [])),
+                "average_score": session_score_stats(session_context).mean,
+                "score_stats": session_context['score_stats'],
+                "interview_history": session_context.get('interview_history', [])[-50:],  # Last 50 messages
+                "edge_cases_count": len(session_context.get('edge_cases_detected', [])),
+                "feedback": (feedback_drafts.latest(session_context['session_id']) or {}).get('report', ''),
+                "duration": sum(session_context.get('question_times', [])) if session_context.get('question_times') else 0
+            }
+            saved_sessions.save(session_data)
+            return jsonify({"status": "success", "session_id": session_id, "message": "Session saved successfully"})
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @app.route('/load-session/<session_id>', methods=['GET'])
 def load_session(session_id):
     """Load a saved interview session."""
-    if session_id in saved_sessions:
-        return jsonify({"status": "success", "session": saved_sessions[session_id]})
+    session_data = saved_sessions.load(session_id)
+    if session_data is not None:
+        return jsonify({"status": "success", "session": session_data})
     return jsonify({"status": "error", "message": "Session not found"}), 404
 
 @app.route('/list-sessions', methods=['GET'])
 def list_sessions():
-    """List all saved sessions."""
-    sessions_list = [
-        {
-            "session_id": sid,
-            "timestamp": data.get('timestamp', ''),
-            "role": data.get('role', ''),
-            "question_count": data.get('question_count', 0),
-            "average_score": data.get('average_score', 0),
-            "duration": data.get('duration', 0)
-        }
-        for sid, data in saved_sessions.items()
-    ]
-    sessions_list.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-    return jsonify({"status": "success", "sessions": sessions_list})
+    """
+    List saved sessions, newest first.
+
+    Query params: limit (default 50, max 200), cursor (from a previous page's next_cursor),
+    role, min_score, max_score.
+    """
+    try:
+        limit = max(1, min(int(request.args.get('limit', 50)), 200))
+        min_score = request.args.get('min_score', type=float)
+        max_score = request.args.get('max_score', type=float)
+        sessions_list, next_cursor = saved_sessions.list(
+            limit=limit,
+            cursor=request.args.get('cursor'),
+            role=request.args.get('role'),
+            min_score=min_score,
+            max_score=max_score
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({"status": "success", "sessions": sessions_list, "next_cursor": next_cursor})
+
+def report_timestamp():
+    return datetime.datetime.now().strftime('%B %d, %Y at %I:%M %p')
+
+
+def pdf_response(report_id, pdf):
+    response = send_file(
+        BytesIO(pdf),
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=f'interview-feedback-{datetime.datetime.now().strftime("%Y%m%d")}.pdf',
+        etag=report_id,
+        conditional=True
+    )
+    response.headers['Content-Location'] = f'/export-pdf/{report_id}'
+    return response
+
 
 @app.route('/export-pdf', methods=['POST'])
 def export_pdf():
-    """Export interview feedback as PDF."""
+    """
+    Export interview feedback as PDF.
+
+    The response carries an ETag (the report's content hash); a repeat export with a matching
+    If-None-Match gets a 304, and the rendered file stays available at /export-pdf/<report_id>.
+    """
     if not PDF_AVAILABLE:
         return jsonify({"status": "error", "message": "PDF export requires reportlab library. Install with: pip install reportlab"}), 500
     try:
@@ -480,146 +1134,171 @@ def export_pdf():
         feedback_text = data.get('feedback', '')
         analytics = data.get('analytics', {})
         role = data.get('role', 'Interview')
-        
-        # Create PDF
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        story = []
-        
-        # Styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#9333ea'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#a855f7'),
-            spaceAfter=12
-        )
-        
-        # Title
-        story.append(Paragraph(f"{role} Interview Feedback Report", title_style))
-        story.append(Spacer(1, 0.2*inch))
-        story.append(Paragraph(f"Generated on {datetime.datetime.now().strftime('%B %d, %Y at %I:%M %p')}", styles['Normal']))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Analytics Summary
-        if analytics:
-            story.append(Paragraph("Performance Summary", heading_style))
-            summary_data = [
-                ['Metric', 'Value'],
-                ['Total Questions', str(analytics.get('total_questions', 0))],
-                ['Average Score', f"{analytics.get('average_score', 0):.1f}%"],
-                ['Highest Score', f"{analytics.get('highest_score', 0):.1f}%"],
-                ['Lowest Score', f"{analytics.get('lowest_score', 0):.1f}%"],
-            ]
-            if analytics.get('edge_cases_count', 0) > 0:
-                summary_data.append(['Edge Cases Detected', str(analytics.get('edge_cases_count', 0))])
-            
-            summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
-            summary_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#9333ea')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#1f2937')),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.whitesmoke),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#4b5563')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#1f2937'), colors.HexColor('#111827')])
-            ]))
-            story.append(summary_table)
-            story.append(Spacer(1, 0.3*inch))
-        
-        # Feedback Content
-        story.append(Paragraph("Detailed Feedback", heading_style))
-        # Simple text formatting for feedback
-        feedback_paragraphs = feedback_text.split('\n\n')
-        for para in feedback_paragraphs:
-            if para.strip():
-                # Remove markdown formatting for PDF
-                clean_para = para.replace('**', '').replace('#', '').replace('|', ' ')
-                if clean_para.strip().startswith('##'):
-                    clean_para = clean_para.replace('##', '').strip()
-                    story.append(Paragraph(clean_para, heading_style))
-                elif clean_para.strip().startswith('#'):
-                    clean_para = clean_para.replace('#', '').strip()
-                    story.append(Paragraph(clean_para, heading_style))
-                else:
-                    story.append(Paragraph(clean_para, styles['Normal']))
-                story.append(Spacer(1, 0.1*inch))
-        
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
-        
-        return send_file(
-            buffer,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=f'interview-feedback-{datetime.datetime.now().strftime("%Y%m%d")}.pdf'
-        )
+
+        report_id = report_key(feedback_text, analytics, role)
+        if report_id in request.if_none_match:
+            response = Response(status=304)
+            response.set_etag(report_id)
+            return response
+
+        report_id, pdf = report_renderer.render(feedback_text, analytics, role, report_timestamp())
+        return pdf_response(report_id, pdf)
+    except RenderError as e:
+        return jsonify({"status": "error", "message": f"Could not render report: {e}"}), 503
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
-@app.route('/get-learning-resources', methods=['POST'])
-def get_learning_resources():
-    """Generate AI-powered learning resource recommendations based on interview performance."""
-    try:
-        data = request.json
-        scores = data.get('scores', [])
-        feedback = data.get('feedback', '')
-        role = data.get('role', '')
-        
-        # Analyze gaps and generate recommendations
-        avg_score = sum(scores) / len(scores) if scores else 0
-        weak_areas = []
-        
-        if avg_score < 60:
-            weak_areas.append("Fundamental concepts")
-        if any(s < 50 for s in scores):
-            weak_areas.append("Core technical skills")
-        
-        # Generate recommendations using AI
-        prompt = f"""Based on this interview performance:
-- Role: {role}
-- Average Score: {avg_score:.1f}%
-- Feedback: {feedback[:500]}
+
+@app.route('/export-pdf/<report_id>', methods=['GET'])
+def get_exported_pdf(report_id):
+    """Serve a previously exported report from the cache (supports If-None-Match)."""
+    pdf = report_renderer.cached(report_id)
+    if pdf is None:
+        return jsonify({"status": "error", "message": "Report not found; export it again"}), 404
+    return pdf_response(report_id, pdf)
+
+
+@app.route('/export-pdf/batch', methods=['POST'])
+def export_pdf_batch():
+    """
+    Render the reports of several saved sessions in parallel and return them as one zip.
+
+    Body: {"session_ids": [...]} (up to 200). Sessions that are missing or fail to render are
+    listed in errors.json inside the archive.
+    """
+    if not PDF_AVAILABLE:
+        return jsonify({"status": "error", "message": "PDF export requires reportlab library. Install with: pip install reportlab"}), 500
+    session_ids = (request.json or {}).get('session_ids') or []
+    if not isinstance(session_ids, list) or not session_ids or len(session_ids) > 200:
+        return jsonify({"status": "error", "message": "session_ids must be a list of 1-200 saved session ids"}), 400
+
+    errors = {}
+    found = []
+    for session_id in session_ids:
+        session_data = saved_sessions.load(session_id)
+        if session_data is None:
+            errors[session_id] = "Session not found"
+        else:
+            found.append((session_id, saved_session_report(session_data)))
+
+    results = report_renderer.render_many([report for _, report in found], report_timestamp())
+    archive = BytesIO()
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as bundle:
+        for (session_id, _), (_, pdf, error) in zip(found, results):
+            if error:
+                errors[session_id] = error
+            else:
+                bundle.writestr(f'{session_id}.pdf', pdf)
+        if errors:
+            bundle.writestr('errors.json', json.dumps(errors, indent=2))
+    archive.seek(0)
+
+    return send_file(
+        archive,
+        mimetype='application/zip',
+        as_attachment=True,
+        download_name=f'interview-feedback-{datetime.datetime.now().strftime("%Y%m%d")}.zip'
+    )
+
+
+def saved_session_report(session_data):
+    """(feedback, analytics, role) for a saved session, in the shape /export-pdf takes."""
+    if session_data.get('score_stats'):
+        scores = RunningScoreStats.from_dict(session_data['score_stats']).summary()
+    else:
+        scores = RunningScoreStats.from_scores(session_data.get('all_scores', [])).summary()
+    role_info = AVAILABLE_ROLES.get(session_data.get('role'))
+    analytics = {
+        "total_questions": session_data.get('question_count', 0),
+        "average_score": scores['average'],
+        "highest_score": scores['highest'],
+        "lowest_score": scores['lowest'],
+        "edge_cases_count": session_data.get('edge_cases_count', 0)
+    }
+    feedback = session_data.get('feedback') or "No feedback report was saved with this session."
+    return feedback, analytics, role_info['name'] if role_info else 'Interview'
+
+FALLBACK_LEARNING_RESOURCES = {
+    "recommendations": [
+        {"title": "LeetCode", "type": "platform", "description": "Practice coding problems", "priority": "high"},
+        {"title": "System Design Interview", "type": "book", "description": "Learn system design concepts", "priority": "medium"}
+    ]
+}
+
+
+def learning_resources_profile(data):
+    """(role, score band, weak areas) for a /get-learning-resources request body."""
+    role = (data.get('role') or '').strip()
+    if role not in AVAILABLE_ROLES:
+        # Accept a role's display name too, so both spellings share cache entries
+        role = next((key for key, info in AVAILABLE_ROLES.items() if info['name'].lower() == role.lower()), role[:64])
+    return resource_profile(data.get('scores', []), role)
+
+
+def learning_resources_request(profile):
+    """Completion keyword arguments for a learning-resources profile."""
+    role, band, weak_areas = profile
+    role_name = AVAILABLE_ROLES[role]['name'] if role in AVAILABLE_ROLES else role or 'General'
+    lower = 0
+    for name, upper in SCORE_BUCKETS:
+        if name == band:
+            score_range = f"{lower}-{upper}%" if upper is not None else f"{lower}% and above"
+            break
+        lower = upper
+
+    # Only the profile goes into the prompt: the answer is cached and shared by every
+    # candidate with the same role, band and weak areas
+    prompt = f"""Based on this interview performance:
+- Role: {role_name}
+- Performance Band: {band.replace('_', ' ')} (average score {score_range})
+- Weak Areas: {', '.join(weak_areas) or 'None identified'}
 
 Generate 5-7 specific, actionable learning resources (courses, books, practice platforms) that would help improve performance. Format as JSON with: title, type (course/book/platform), description, url (if applicable), priority (high/medium/low).
 """
-        
-        completion = client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are a learning advisor. Provide specific, actionable learning resource recommendations."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7
-        )
-        
-        resources = json.loads(completion.choices[0].message.content)
-        return jsonify({"status": "success", "resources": resources})
+
+    return dict(
+        model="openai/gpt-oss-20b",
+        messages=[
+            {"role": "system", "content": "You are a learning advisor. Provide specific, actionable learning resource recommendations."},
+            {"role": "user", "content": prompt}
+        ],
+        response_format={"type": "json_object"},
+        temperature=0.7
+    )
+
+
+def fetch_learning_resources(profile):
+    completion = client.complete("learning_resources", **learning_resources_request(profile))
+    return json.loads(completion.choices[0].message.content)
+
+
+# Learning resources depend only on (role, score band, weak areas), so they are cached per
+# profile; LEARNING_RESOURCES_PREWARM=all (or a comma-separated list of role keys) generates
+# them for those roles in the background at startup
+learning_resources = LearningResourceCache(
+    fetch_learning_resources,
+    ttl=float(os.environ.get("LEARNING_RESOURCES_TTL", "86400")),
+    max_entries=int(os.environ.get("LEARNING_RESOURCES_CACHE_ENTRIES", "1024")),
+    metrics=metrics
+)
+LEARNING_RESOURCES_PREWARM = os.environ.get("LEARNING_RESOURCES_PREWARM", "").strip()
+if LEARNING_RESOURCES_PREWARM:
+    learning_resources.prewarm(prewarm_profiles(
+        list(AVAILABLE_ROLES) if LEARNING_RESOURCES_PREWARM.lower() == "all"
+        else [role.strip() for role in LEARNING_RESOURCES_PREWARM.split(",") if role.strip() in AVAILABLE_ROLES]
+    ))
+
+
+@app.route('/get-learning-resources', methods=['POST'])
+def get_learning_resources():
+    """Learning resource recommendations for the candidate's role and performance band."""
+    try:
+        with llm_session(current_session_id()):
+            resources, cached = learning_resources.get(learning_resources_profile(request.json))
+        return jsonify({"status": "success", "resources": resources, "cached": cached})
     except Exception as e:
         # Fallback recommendations
-        return jsonify({
-            "status": "success",
-            "resources": {
-                "recommendations": [
-                    {"title": "LeetCode", "type": "platform", "description": "Practice coding problems", "priority": "high"},
-                    {"title": "System Design Interview", "type": "book", "description": "Learn system design concepts", "priority": "medium"}
-                ]
-            }
-        })
+        return jsonify({"status": "success", "resources": FALLBACK_LEARNING_RESOURCES})
 
 
 if __name__ == '__main__':
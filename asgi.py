@@ -0,0 +1,232 @@
+"""
+ASGI entry point with native asyncio handlers for /chat, /get-feedback and
+/get-learning-resources. Every other route is served by the Flask app mounted underneath.
+
+    uvicorn asgi:app --port 5000
+
+The async handlers await the LLM through AsyncLLMClient, so an interview waiting on the
+model holds a coroutine rather than an OS thread. Sessions, metrics, the resume extractor
+and all turn bookkeeping are shared with app.py, so both paths can serve the same process.
+"""
+import asyncio
+import contextvars
+import json
+import os
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+from agents.assessor import AssessorAgent
+from agents.feedback_generator import FeedbackGeneratorAgent
+from agents.grader import GraderAgent
+from agents.interviewer import InterviewerAgent
+from agents.profiler import ProfilerAgent
+from app import (
+    AGENT_EXECUTION_MODE, FALLBACK_LEARNING_RESOURCES, INCREMENTAL_FEEDBACK, SESSION_COOKIE, SESSION_ID_PATTERN,
+    app as flask_app, bank_question, check_interview_end, client, commit_turn, draft_inputs, feedback_drafts, feedback_inputs,
+    feedback_payload, grader_inputs, history_resync, interview_complete_payload, interviewer, interviewer_args,
+    learning_resources, learning_resources_profile, learning_resources_request, metrics, nudge_response, profiler,
+    record_assessment, record_turn_timings, request_exceptions, request_latency, resolve_resume, sessions,
+    should_grade, stage_turn, turn_payload
+)
+from services.llm_client import AsyncLLMClient
+from services.llm_scheduler import llm_session
+
+
+async_client = AsyncLLMClient(
+    api_key=os.environ.get("GROQ_API_KEY"),
+    base_url=os.environ.get("LLM_BASE_URL") or None,
+    timeouts=client.timeouts,
+    max_retries=client.max_retries,
+    pool_size=int(os.environ.get("LLM_ASYNC_POOL_SIZE", "200")),
+    metrics=metrics,
+    scheduler=client.scheduler,  # One rate limit and one set of model routes for the whole process
+    router=client.router
+)
+
+# Same agents as app.py, bound to the async client; fast-path stats and the window are shared
+async_profiler = ProfilerAgent(async_client, profiler.fast_path)
+async_grader = GraderAgent(async_client)
+async_assessor = AssessorAgent(async_client, async_profiler, async_grader)
+async_interviewer = InterviewerAgent(async_client, interviewer.window)
+async_feedback_generator = FeedbackGeneratorAgent(async_client)
+
+
+async def timed_await(fn, *args):
+    """Await fn(*args) and return (result, elapsed milliseconds)."""
+    start = time.perf_counter()
+    result = await fn(*args)
+    return result, round((time.perf_counter() - start) * 1000, 1)
+
+
+def session_id_for(request):
+    """Session id from the X-Session-ID header or cookie; a new one is issued if missing."""
+    session_id = request.headers.get("X-Session-ID") or request.cookies.get(SESSION_COOKIE)
+    if not session_id or not SESSION_ID_PATTERN.match(session_id):
+        session_id = uuid.uuid4().hex
+        request.state.new_session_id = session_id
+    return session_id
+
+
+def route(path, handler):
+    """Register `handler` with the same latency/exception metrics and cookie handling as Flask."""
+    async def endpoint(request):
+        start = time.perf_counter()
+        try:
+            response = await handler(request)
+        except Exception as e:
+            request_exceptions.inc(route=path, exception=type(e).__name__)
+            raise
+        new_session_id = getattr(request.state, "new_session_id", None)
+        if new_session_id:
+            response.set_cookie(SESSION_COOKIE, new_session_id, httponly=True, samesite="lax")
+            response.headers["X-Session-ID"] = new_session_id
+        request_latency.observe(time.perf_counter() - start, route=path, method=request.method,
+                                status=response.status_code)
+        return response
+    # The mounted Flask app applies flask-cors itself; only these routes need the middleware
+    return Route(path, endpoint, methods=["POST"], middleware=[
+        Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+    ])
+
+
+async def assess_turn_async(session_context, user_msg):
+    """Async assess_turn(): in parallel mode the speculative grade runs as a task."""
+    timings = {"mode": AGENT_EXECUTION_MODE}
+    started = session_context['started']
+    history = session_context['interview_history']
+    grader_args = grader_inputs(session_context, user_msg)
+    stage_start = time.perf_counter()
+
+    if AGENT_EXECUTION_MODE == "combined":
+        (profile_data, grader_data), timings['assessor_ms'] = await timed_await(
+            async_assessor.assess_async, user_msg, history, grader_args, started)
+    elif AGENT_EXECUTION_MODE == "parallel":
+        grader_task = None
+        if started and "[SYSTEM_TIMEOUT]" not in user_msg:
+            grader_task = asyncio.ensure_future(timed_await(async_grader.evaluate_async, *grader_args))
+
+        profile_data, timings['profiler_ms'] = await timed_await(async_profiler.analyze_async, user_msg, history)
+
+        grader_data = {}
+        if grader_task is not None:
+            if should_grade(profile_data, started):
+                grader_data, timings['grader_ms'] = await grader_task
+            else:
+                grader_task.cancel()
+                timings['grader_discarded'] = True
+    else:
+        profile_data, timings['profiler_ms'] = await timed_await(async_profiler.analyze_async, user_msg, history)
+
+        grader_data = {}
+        if should_grade(profile_data, started):
+            grader_data, timings['grader_ms'] = await timed_await(async_grader.evaluate_async, *grader_args)
+
+    timings['assessment_ms'] = round((time.perf_counter() - stage_start) * 1000, 1)
+    return profile_data, grader_data, timings
+
+
+async def final_feedback_async(session_context):
+    """Async final_feedback(): finalizing a draft may wait on its job, so it runs off the event loop."""
+    if INCREMENTAL_FEEDBACK:
+        # copy_context() so the merge call keeps this request's session for the LLM scheduler
+        feedback = await asyncio.get_running_loop().run_in_executor(
+            None, contextvars.copy_context().run, feedback_drafts.finalize,
+            session_context['session_id'], *draft_inputs(session_context))
+        if feedback is not None:
+            return feedback
+    return await async_feedback_generator.generate_comprehensive_feedback_async(*feedback_inputs(session_context))
+
+
+async def chat(request):
+    turn_start = time.perf_counter()
+    data = await request.json()
+    user_msg = data.get('message', '')
+
+    session_id = session_id_for(request)
+    async with sessions.async_session(session_id) as session_context:
+        with async_client.trace() as llm_calls, llm_session(session_id):
+            resync = history_resync(session_context, data, "chat")
+            if resync:
+                return JSONResponse(resync, status_code=409)
+
+            if check_interview_end(user_msg, session_context['question_count']) and session_context['question_count'] > 0:
+                feedback = await final_feedback_async(session_context)
+                return JSONResponse(interview_complete_payload(session_context, feedback))
+
+            if session_context.get('resume_job'):
+                # Waiting on the extraction future blocks, so do it off the event loop
+                await asyncio.get_running_loop().run_in_executor(None, resolve_resume, session_context)
+            turn = stage_turn(session_context, user_msg)
+
+            profile_data, grader_data, timings = await assess_turn_async(turn, user_msg)
+            record_assessment(turn, user_msg, profile_data, grader_data)
+
+            interviewer_start = time.perf_counter()
+            nudge = nudge_response(turn, profile_data)
+            banked = None if nudge else bank_question(turn, profile_data, grader_data)
+            raw_response = nudge or banked or await async_interviewer.generate_response_async(
+                *interviewer_args(turn, user_msg, profile_data, grader_data))
+            timings['interviewer_ms'] = round((time.perf_counter() - interviewer_start) * 1000, 1)
+            timings['nudge'] = nudge is not None
+            timings['question_bank'] = banked is not None
+
+            commit_turn(session_context, turn, user_msg, raw_response, profile_data, grader_data, nudged=nudge is not None)
+            timings['total_ms'] = round((time.perf_counter() - turn_start) * 1000, 1)
+            record_turn_timings(timings)
+
+            return JSONResponse(turn_payload(session_context, raw_response, profile_data, grader_data, timings, llm_calls))
+
+
+async def get_feedback(request):
+    session_id = session_id_for(request)
+    async with sessions.async_session(session_id) as session_context:
+        if session_context['question_count'] == 0:
+            return JSONResponse({"error": "No interview conducted yet"}, status_code=400)
+
+        draft = feedback_drafts.latest(session_context['session_id']) if INCREMENTAL_FEEDBACK else None
+        if draft:
+            up_to_date = draft['version'] >= len(session_context['feedback_notes'])
+            return JSONResponse(feedback_payload(session_context, draft['report'], up_to_date))
+        with llm_session(session_id):
+            feedback = await final_feedback_async(session_context)
+        return JSONResponse(feedback_payload(session_context, feedback))
+
+
+async def fetch_learning_resources_async(profile):
+    completion = await async_client.complete("learning_resources", **learning_resources_request(profile))
+    return json.loads(completion.choices[0].message.content)
+
+
+async def get_learning_resources(request):
+    try:
+        profile = learning_resources_profile(await request.json())
+        with llm_session(session_id_for(request)):
+            resources, cached = await learning_resources.get_async(profile, fetch_learning_resources_async)
+        return JSONResponse({"status": "success", "resources": resources, "cached": cached})
+    except Exception:
+        return JSONResponse({"status": "success", "resources": FALLBACK_LEARNING_RESOURCES})
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await async_client.aclose()
+
+
+app = Starlette(
+    routes=[
+        route('/chat', chat),
+        route('/get-feedback', get_feedback),
+        route('/get-learning-resources', get_learning_resources),
+        Mount("/", app=WSGIMiddleware(flask_app, workers=int(os.environ.get("WSGI_WORKERS", "32")))),
+    ],
+    lifespan=lifespan
+)
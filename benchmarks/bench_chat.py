@@ -0,0 +1,374 @@
+"""End-to-end latency/throughput benchmark for the interview pipeline.
+
+Every simulated candidate uploads a resume, runs a multi-turn interview through /chat
+(or /chat-stream) and asks for /get-feedback, each with its own X-Session-ID. The LLM is
+the fake server from fake_llm_server, so numbers reflect the app's own overhead plus the
+configured model latency rather than network conditions.
+
+    python -m benchmarks.bench_chat --candidates 16 --turns 6 --latency-ms 300 --jitter-ms 120 \\
+        --distribution lognormal --output bench_results.json
+
+By default the Flask app runs in-process behind the test client; pass --target
+http://host:port to drive a running server instead (start it with LLM_BASE_URL pointing
+at a fake server). Results are printed and optionally written as JSON; --tracemalloc adds
+the Python heap peak on top of max RSS.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+
+from benchmarks.fake_llm_server import parse_agent_latency, start_server
+
+
+ANSWERS = [
+    "Ready to begin.",
+    "I led the migration of our order service to Kubernetes and cut deploy time from an hour to ten minutes.",
+    "We used Redis as a write-through cache in front of Postgres, with a TTL per key family.",
+    "The trickiest part was idempotency: every consumer stored the message id before acknowledging.",
+    "I'm not sure, I haven't worked with that directly.",
+    "I profiled the hot path with py-spy and replaced a quadratic merge with a heap, p99 dropped by 40%.",
+    "We split the monolith along billing boundaries and ran both paths in shadow mode for two weeks.",
+    "Can you repeat the question?",
+]
+
+JD = "Backend engineer: Python, distributed systems, Postgres, Redis, Kubernetes, observability."
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list; None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples):
+    """Latency summary in milliseconds for one endpoint."""
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples), 2) if samples else None,
+        "p50_ms": _round(percentile(samples, 50)),
+        "p95_ms": _round(percentile(samples, 95)),
+        "p99_ms": _round(percentile(samples, 99)),
+        "max_ms": _round(max(samples) if samples else None),
+    }
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+
+def resume_pdf(candidate):
+    """A small one-page resume; the candidate number keeps each file (and its hash) distinct."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    lines = [
+        f"Candidate {candidate} - Senior Backend Engineer",
+        "Experience: 6 years building Python services on Postgres and Redis.",
+        "Led a Kubernetes migration; owned on-call and SLO dashboards.",
+        "Skills: Python, Go, Kafka, Terraform, Prometheus, system design.",
+    ]
+    y = 740
+    for line in lines:
+        pdf.drawString(72, y, line)
+        y -= 18
+    pdf.save()
+    return buffer.getvalue()
+
+
+class InProcessClient:
+    """One candidate talking to the app through Flask's test client."""
+
+    def __init__(self, flask_app, session_id):
+        self.client = flask_app.test_client()
+        self.headers = {"X-Session-ID": session_id}
+
+    def upload(self, pdf, jd, role):
+        data = {"resume": (io.BytesIO(pdf), "resume.pdf"), "jd": jd, "role": role}
+        response = self.client.post("/upload-context", data=data, headers=self.headers,
+                                    content_type="multipart/form-data")
+        return response.status_code, response.get_json()
+
+    def get(self, path):
+        response = self.client.get(path, headers=self.headers)
+        return response.status_code, response.get_json()
+
+    def post(self, path, payload):
+        response = self.client.post(path, json=payload, headers=self.headers)
+        return response.status_code, response.get_json()
+
+    def stream(self, path, payload):
+        """POST an SSE request; returns (status, first-token seconds or None, raw body)."""
+        started = time.perf_counter()
+        response = self.client.post(path, json=payload, headers=self.headers, buffered=False)
+        first_token, chunks = None, []
+        for chunk in response.response:
+            text = chunk.decode() if isinstance(chunk, bytes) else chunk
+            if first_token is None and "event: token" in text:
+                first_token = time.perf_counter() - started
+            chunks.append(text)
+        response.close()
+        return response.status_code, first_token, "".join(chunks)
+
+
+class HttpClient:
+    """One candidate talking to a running server over HTTP."""
+
+    def __init__(self, base_url, session_id, timeout):
+        import httpx
+        self.client = httpx.Client(base_url=base_url, headers={"X-Session-ID": session_id}, timeout=timeout)
+
+    def upload(self, pdf, jd, role):
+        response = self.client.post("/upload-context", files={"resume": ("resume.pdf", pdf, "application/pdf")},
+                                    data={"jd": jd, "role": role})
+        return response.status_code, response.json()
+
+    def get(self, path):
+        response = self.client.get(path)
+        return response.status_code, response.json()
+
+    def post(self, path, payload):
+        response = self.client.post(path, json=payload)
+        return response.status_code, response.json()
+
+    def stream(self, path, payload):
+        started = time.perf_counter()
+        first_token, chunks = None, []
+        with self.client.stream("POST", path, json=payload) as response:
+            for text in response.iter_text():
+                if first_token is None and "event: token" in text:
+                    first_token = time.perf_counter() - started
+                chunks.append(text)
+            return response.status_code, first_token, "".join(chunks)
+
+
+def parse_done_event(body):
+    """Pull the JSON payload of the final `done` event out of an SSE body."""
+    for block in body.split("\n\n"):
+        if block.startswith("event: done"):
+            for line in block.splitlines():
+                if line.startswith("data: "):
+                    return json.loads(line[len("data: "):])
+    return None
+
+
+class Recorder:
+    """Thread-safe collection of per-endpoint latencies and errors."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+        self.requests = 0
+
+    def add(self, name, seconds, ok=True):
+        with self.lock:
+            self.requests += 1
+            self.samples.setdefault(name, []).append(seconds * 1000)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+
+def timed(recorder, name, fn, *args):
+    started = time.perf_counter()
+    try:
+        result = fn(*args)
+    except Exception:
+        recorder.add(name, time.perf_counter() - started, ok=False)
+        raise
+    recorder.add(name, time.perf_counter() - started, ok=result[0] < 400)
+    return result
+
+
+def run_candidate(client, candidate, args, recorder, barrier):
+    """Upload, interview for `args.turns` turns, then fetch feedback."""
+    barrier.wait()
+    started = time.perf_counter()
+    status, body = timed(recorder, "upload-context", client.upload, resume_pdf(candidate), JD, args.role)
+    job = (body or {}).get("resume_job")
+    if job and body.get("resume_status") == "pending":
+        deadline = time.perf_counter() + 30
+        while time.perf_counter() < deadline:
+            status, state = timed(recorder, "upload-status", client.get, f"/upload-status/{job}")
+            if state.get("status") != "pending":
+                break
+            time.sleep(0.5)  # same interval as the frontend
+    recorder.add("resume-ready", time.perf_counter() - started)
+
+    seq = 0
+    for turn in range(args.turns):
+        message = ANSWERS[(candidate + turn) % len(ANSWERS)] if turn else ANSWERS[0]
+        payload = {"message": message, "seq": seq}
+        turn_started = time.perf_counter()
+        if args.stream:
+            status, first_token, raw = client.stream("/chat-stream", payload)
+            elapsed = time.perf_counter() - turn_started
+            data = parse_done_event(raw) or {}
+            recorder.add("chat-stream", elapsed, ok=status < 400 and "response" in data)
+            if first_token is not None:
+                recorder.add("chat-stream-first-token", first_token)
+        else:
+            status, data = client.post("/chat", payload)
+            recorder.add("chat", time.perf_counter() - turn_started, ok=status < 400)
+            data = data or {}
+        seq = data.get("seq", seq)
+        if data.get("interview_complete"):
+            break
+
+    timed(recorder, "get-feedback", client.post, "/get-feedback", {})
+    recorder.add("candidate-total", time.perf_counter() - started)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def max_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run(args):
+    fake_server = None
+    if args.target:
+        make_client = lambda sid: HttpClient(args.target, sid, args.timeout)
+    else:
+        fake_server, fake_url = start_server(
+            latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+            seed=args.seed, distribution=args.distribution,
+            agent_latency_ms=parse_agent_latency(args.agent_latency),
+            completion_tokens=args.completion_tokens,
+        )
+        os.environ["LLM_BASE_URL"] = fake_url
+        os.environ.setdefault("GROQ_API_KEY", "fake")
+        workdir = args.workdir or tempfile.mkdtemp(prefix="bench_chat_")
+        os.makedirs(workdir, exist_ok=True)
+        os.environ.setdefault("SAVED_SESSIONS_DB", os.path.join(workdir, "bench_saved_sessions.db"))
+        import app as interview_app
+        make_client = lambda sid: InProcessClient(interview_app.app, sid)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    recorder = Recorder()
+    barrier = threading.Barrier(args.candidates)
+    failures = []
+
+    def worker(candidate):
+        client = make_client(f"bench-{uuid.uuid4().hex[:16]}")
+        try:
+            run_candidate(client, candidate, args, recorder, barrier)
+        except Exception as exc:
+            failures.append(f"candidate {candidate}: {exc!r}")
+
+    threads = [threading.Thread(target=worker, args=(i,), name=f"candidate-{i}") for i in range(args.candidates)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    peak = None
+    if args.tracemalloc:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    # Status polling is a benchmark artifact, so it is left out of the request rate
+    endpoint_names = [name for name in recorder.samples
+                      if name not in ("resume-ready", "candidate-total", "upload-status", "chat-stream-first-token")]
+    http_requests = sum(len(recorder.samples[name]) for name in endpoint_names)
+    turns = len(recorder.samples.get("chat", recorder.samples.get("chat-stream", [])))
+
+    results = {
+        "config": {
+            "target": args.target or "in-process",
+            "candidates": args.candidates,
+            "turns": args.turns,
+            "stream": args.stream,
+            "role": args.role,
+            "llm": None if args.target else {
+                "distribution": args.distribution, "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms, "agent_latency_ms": parse_agent_latency(args.agent_latency),
+                "completion_tokens": args.completion_tokens, "error_rate": args.error_rate, "seed": args.seed,
+            },
+            "env": {name: os.environ[name] for name in sorted(os.environ)
+                    if name.startswith(("AGENT_", "HISTORY_", "FAST_PATH_", "PDF_", "LLM_"))
+                    and name != "LLM_BASE_URL"},
+        },
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "wall_seconds": round(wall, 3),
+        "throughput": {
+            "requests_per_second": round(http_requests / wall, 2) if wall else None,
+            "chat_turns_per_second": round(turns / wall, 2) if wall else None,
+            "candidates_per_minute": round(args.candidates / wall * 60, 2) if wall else None,
+        },
+        "latency": {name: summarize(samples) for name, samples in sorted(recorder.samples.items())},
+        "errors": recorder.errors,
+        "failures": failures,
+        "memory": {
+            "tracemalloc_peak_mb": round(peak / (1024 * 1024), 2) if peak is not None else None,
+            "max_rss_mb": max_rss_mb(),
+        },
+        "fake_llm_requests": fake_server.llm.requests if fake_server else None,
+    }
+    if fake_server:
+        fake_server.shutdown()
+    return results
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", help="Base URL of a running server; default runs the app in-process")
+    parser.add_argument("--candidates", type=int, default=8, help="Concurrent simulated candidates")
+    parser.add_argument("--turns", type=int, default=6, help="Chat turns per candidate")
+    parser.add_argument("--stream", action="store_true", help="Use /chat-stream and record time to first token")
+    parser.add_argument("--role", default="backend_engineer")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--distribution", choices=["fixed", "normal", "lognormal", "uniform"], default="normal")
+    parser.add_argument("--agent-latency", action="append", default=[], metavar="AGENT=MS")
+    parser.add_argument("--completion-tokens", type=int, default=60)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout for --target")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Report tracemalloc peak; forked PDF workers inherit tracing, so latencies inflate")
+    parser.add_argument("--workdir", help="Where the in-process run keeps its SQLite file (default: a new temporary directory)")
+    parser.add_argument("--output", help="Write the JSON report here as well as printing it")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+
+    results = run(args)
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Latency and prompt-size benchmark for the grader's resume/JD retrieval.
+
+Parses a resume and a JD the way /upload-context does, builds the BM25 index over their
+chunks, and runs every (question, answer) pair from the fake interview as a query:
+
+    python -m benchmarks.bench_retrieval --repeat 200
+    python -m benchmarks.bench_retrieval --resume resume.txt --jd jd.txt --output retrieval.json
+
+Reports parse and index build time, per-query latency for search() and for the token-capped
+select() the grader uses, and the tokens injected per query next to the fixed 800 + 500
+character prefixes the grader used to send.
+"""
+import argparse
+import datetime
+import json
+import time
+
+from benchmarks.bench_chat import ANSWERS, percentile
+from benchmarks.fake_llm_server import QUESTIONS
+from services.candidate_profile import parse_jd, parse_resume
+from services.retrieval import BM25Index
+
+RESUME = """Alex Rivera
+Senior Backend Engineer | alex@example.com | github.com/arivera
+
+Summary
+Backend engineer with eight years building Python and Go services for payments and logistics, most recently owning
+the order pipeline end to end: design, on-call and capacity planning.
+
+Experience
+Senior Backend Engineer, ShipFast (2020 - Present)
+- Led the migration of the order service from a monolith to Kubernetes, cutting deploy time from an hour to ten minutes
+- Built an event-driven fulfilment pipeline on Kafka with idempotent consumers and an outbox table in PostgreSQL
+- Introduced Redis write-through caching per key family; p99 read latency dropped by 40%
+- Mentored four engineers and ran the backend interview loop
+Backend Engineer, PayLoop (2017 - 2020)
+- Designed the ledger service on PostgreSQL with serializable transactions and nightly reconciliation
+- Profiled the settlement batch with py-spy and replaced a quadratic merge with a heap
+- Added Prometheus metrics and Grafana dashboards; paged alerts fell by half
+Software Engineer, DataWorks (2015 - 2017)
+- Maintained ETL jobs in Airflow moving 2 TB a day into BigQuery
+- Wrote integration tests with pytest and Docker Compose for the ingestion API
+
+Projects
+- ratelimit: token-bucket rate limiter library in Go, used by three internal teams
+- pgshadow: tool that replays production queries against a shadow PostgreSQL to validate index changes
+
+Skills
+Python, Go, PostgreSQL, Redis, Kafka, Kubernetes, Docker, Terraform, AWS, Prometheus, Grafana, Airflow
+
+Education
+BSc Computer Science, University of Lisbon, 2015
+
+Certifications
+Certified Kubernetes Administrator (CKA)
+"""
+
+JD = """Senior Backend Engineer - Logistics Platform
+
+About the role
+You will own core services of our logistics platform, which routes two million parcels a day.
+
+Responsibilities
+- Design and operate high-throughput Python services on Kubernetes
+- Own data models and query performance for PostgreSQL
+- Build event-driven integrations with carriers over Kafka
+- Improve observability, on-call health and incident response
+
+Requirements
+- 5+ years of backend development in Python or Go
+- Strong knowledge of relational databases, transactions and indexing
+- Experience with distributed systems: idempotency, retries, exactly-once trade-offs
+- Experience running services in production on Kubernetes and AWS
+- Clear written communication and design documents
+
+Nice to have
+- Experience with Redis caching strategies
+- Terraform and infrastructure as code
+
+Benefits
+- Remote-friendly, learning budget, 30 days of holiday
+"""
+
+
+def timed_us(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1e6
+
+
+def latency_summary(samples):
+    """Latency summary in microseconds."""
+    return {
+        "count": len(samples),
+        "mean_us": round(sum(samples) / len(samples), 2) if samples else None,
+        "p50_us": round(percentile(samples, 50), 2) if samples else None,
+        "p99_us": round(percentile(samples, 99), 2) if samples else None,
+        "max_us": round(max(samples), 2) if samples else None,
+    }
+
+
+def run(args):
+    resume_text = open(args.resume).read() if args.resume else RESUME
+    jd_text = open(args.jd).read() if args.jd else JD
+    year = datetime.date.today().year
+
+    (resume_profile, jd_profile), parse_us = timed_us(lambda: (parse_resume(resume_text, year), parse_jd(jd_text, year)))
+    index, build_us = timed_us(BM25Index, resume_profile["chunks"] + jd_profile["chunks"])
+
+    queries = [f"{question} {answer}" for question in QUESTIONS for answer in ANSWERS]
+    for query in queries[:20]:
+        index.select(query, args.k, args.max_tokens)  # warm-up
+
+    search_us, select_us, injected, matched = [], [], [], 0
+    for _ in range(args.repeat):
+        for query in queries:
+            hits, elapsed = timed_us(index.search, query, args.k)
+            search_us.append(elapsed)
+            (chunks, tokens), elapsed = timed_us(index.select, query, args.k, args.max_tokens)
+            select_us.append(elapsed)
+            injected.append(tokens)
+            matched += bool(hits)
+
+    prefix_tokens = (len(jd_text[:800]) + len(resume_text[:500])) // 4
+    return {
+        "resume_chars": len(resume_text),
+        "jd_chars": len(jd_text),
+        "chunks": len(index),
+        "parse_us": round(parse_us, 1),
+        "index_build_us": round(build_us, 1),
+        "queries": len(search_us),
+        "queries_with_matches": round(matched / len(search_us), 3) if search_us else None,
+        "search": latency_summary(search_us),
+        "select": latency_summary(select_us),
+        "tokens_injected_mean": round(sum(injected) / len(injected), 1) if injected else None,
+        "tokens_injected_max": max(injected) if injected else None,
+        "prefix_tokens_before": prefix_tokens,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resume", help="Resume as plain text (default: built-in sample)")
+    parser.add_argument("--jd", help="Job description as plain text (default: built-in sample)")
+    parser.add_argument("--k", type=int, default=6, help="Chunks retrieved per query (GRADER_CONTEXT_CHUNKS)")
+    parser.add_argument("--max-tokens", type=int, default=300, help="Token cap on injected chunks (GRADER_CONTEXT_TOKENS)")
+    parser.add_argument("--repeat", type=int, default=100, help="Passes over the query set")
+    parser.add_argument("--output", help="Write the JSON report here as well as printing it")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+
+    report = json.dumps(run(args), indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Compare the combined profile+grade call (AssessorAgent) with separate profiler and grader calls.
+
+Every record is assessed both ways, alternating which path goes first. The report covers
+latency, model calls and tokens per turn for each path, and how often the combined call agrees
+with the two-call path on persona, relevance, follow-up and score:
+
+    python -m benchmarks.compare_assessment --input answers.jsonl --output assessment.json
+    python -m benchmarks.compare_assessment --fake --latency-ms 400
+
+Records use the tools.bulk_grade format ({"question", "answer", "jd", "resume"}, plus an
+optional "history" list of {"role", "content"}); without --input a built-in set of answers is
+used. Against a real model set GROQ_API_KEY (and LLM_BASE_URL if needed); --fake runs the
+canned fake_llm_server instead, which is only useful for latency and token accounting since
+its scores are random. The fast path is off unless --fast-path is given, so every turn
+reaches the model.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from agents.assessor import AssessorAgent
+from agents.fast_classifier import FastPathClassifier
+from agents.grader import GraderAgent
+from agents.profiler import ProfilerAgent
+from benchmarks.bench_chat import ANSWERS, JD, summarize
+from benchmarks.fake_llm_server import QUESTIONS, start_server
+from services.llm_client import LLMClient
+
+RESUME = "Senior backend engineer, 6 years: Python services on Postgres and Redis, Kubernetes, event-driven systems."
+
+
+def builtin_records():
+    return [
+        {"id": f"builtin-{i}", "question": QUESTIONS[i % len(QUESTIONS)], "answer": answer, "jd": JD, "resume": RESUME}
+        for i, answer in enumerate(ANSWERS)
+    ]
+
+
+def read_records(path, limit=None):
+    records = []
+    with open(path) as handle:
+        for line in handle:
+            if line.strip():
+                records.append(json.loads(line))
+            if limit and len(records) >= limit:
+                break
+    return records
+
+
+class Comparison:
+
+    def __init__(self, client, profiler, grader, assessor):
+        self.client = client
+        self.profiler = profiler
+        self.grader = grader
+        self.assessor = assessor
+
+    def _two_calls(self, answer, history, grader_args):
+        profile_data = self.profiler.analyze(answer, history)
+        gradable = profile_data['is_relevant'] and profile_data['persona'] != 'silent'
+        return profile_data, self.grader.evaluate(*grader_args) if gradable else {}
+
+    def _timed(self, fn, *args):
+        with self.client.trace() as calls:
+            start = time.perf_counter()
+            result = fn(*args)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        return result, {
+            "latency_ms": elapsed_ms,
+            "calls": len(calls),
+            "agents": [call["agent"] for call in calls],
+            "prompt_tokens": sum(call["prompt_tokens"] for call in calls),
+            "completion_tokens": sum(call["completion_tokens"] for call in calls),
+        }
+
+    def compare(self, index, record):
+        answer = record.get("answer", "")
+        history = record.get("history", [])
+        grader_args = (answer, record.get("question", ""), record.get("jd", ""), record.get("resume", ""), None)
+        paths = [("separate", self._two_calls, (answer, history, grader_args)),
+                 ("combined", self.assessor.assess, (answer, history, grader_args))]
+        if index % 2:
+            paths.reverse()
+        results = {name: self._timed(fn, *args) for name, fn, args in paths}
+        return record.get("id", index), results
+
+
+def agreement(pairs):
+    """Label and score agreement of the combined path with the separate path."""
+    matches = {"persona": 0, "is_relevant": 0}
+    graded = score_diffs = followups = 0
+    within_10 = 0
+    for (separate_profile, separate_grade), (combined_profile, combined_grade) in pairs:
+        matches["persona"] += separate_profile.get("persona") == combined_profile.get("persona")
+        matches["is_relevant"] += separate_profile.get("is_relevant") == combined_profile.get("is_relevant")
+        if "score" in separate_grade and "score" in combined_grade:
+            graded += 1
+            diff = abs(separate_grade["score"] - combined_grade["score"])
+            score_diffs += diff
+            within_10 += diff <= 10
+            followups += separate_grade.get("requires_followup") == combined_grade.get("requires_followup")
+    total = len(pairs)
+    return {
+        "turns": total,
+        "persona_agreement": round(matches["persona"] / total, 3) if total else None,
+        "relevance_agreement": round(matches["is_relevant"] / total, 3) if total else None,
+        "graded_by_both": graded,
+        "score_mean_abs_diff": round(score_diffs / graded, 2) if graded else None,
+        "score_within_10": round(within_10 / graded, 3) if graded else None,
+        "followup_agreement": round(followups / graded, 3) if graded else None,
+    }
+
+
+def path_summary(samples):
+    turns = len(samples)
+    summary = summarize([sample["latency_ms"] for sample in samples])
+    summary.update({
+        "calls_per_turn": round(sum(sample["calls"] for sample in samples) / turns, 2) if turns else None,
+        "prompt_tokens_per_turn": round(sum(sample["prompt_tokens"] for sample in samples) / turns, 1) if turns else None,
+        "completion_tokens_per_turn": round(sum(sample["completion_tokens"] for sample in samples) / turns, 1) if turns else None,
+    })
+    return summary
+
+
+def run(args):
+    server = None
+    base_url = os.environ.get("LLM_BASE_URL") or None
+    api_key = os.environ.get("GROQ_API_KEY")
+    if args.fake:
+        server, base_url = start_server(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, seed=args.seed)
+        api_key = "fake"
+
+    client = LLMClient(api_key=api_key, base_url=base_url, max_retries=int(os.environ.get("LLM_MAX_RETRIES", "3")),
+                       pool_size=args.concurrency * 2)
+    profiler = ProfilerAgent(client, FastPathClassifier() if args.fast_path else None)
+    grader = GraderAgent(client)
+    comparison = Comparison(client, profiler, grader, AssessorAgent(client, profiler, grader))
+
+    records = read_records(args.input, args.limit) if args.input else builtin_records()
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            rows = list(pool.map(lambda item: comparison.compare(*item), enumerate(records)))
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    samples = {"separate": [], "combined": []}
+    pairs, turns = [], []
+    for record_id, results in rows:
+        for name, (_, sample) in results.items():
+            samples[name].append(sample)
+        pairs.append((results["separate"][0], results["combined"][0]))
+        turns.append({
+            "id": record_id,
+            **{f"{name}_{key}": value for name in ("separate", "combined")
+               for key, value in (("persona", results[name][0][0].get("persona")), ("score", results[name][0][1].get("score")))},
+            # The combined path only calls the profiler when its own call failed
+            "combined_fell_back": "profiler" in results["combined"][1]["agents"],
+        })
+
+    report = {
+        "records": len(records),
+        "separate": path_summary(samples["separate"]),
+        "combined": path_summary(samples["combined"]),
+        "agreement": agreement(pairs),
+        "combined_fallbacks": sum(turn["combined_fell_back"] for turn in turns),
+    }
+    if args.per_turn:
+        report["turns"] = turns
+    return report
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", help="JSONL records (default: built-in sample answers)")
+    parser.add_argument("--limit", type=int, help="Use only the first N records")
+    parser.add_argument("--concurrency", type=int, default=4, help="Records compared at once")
+    parser.add_argument("--fast-path", action="store_true", help="Let the local classifier answer obvious turns")
+    parser.add_argument("--fake", action="store_true", help="Run against the in-process fake LLM server")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Fake server latency")
+    parser.add_argument("--jitter-ms", type=float, default=50.0, help="Fake server latency jitter")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--per-turn", action="store_true", help="Include each record's labels and scores")
+    parser.add_argument("--output", help="Write the JSON report here as well as printing it")
+    return parser
+
+
+def main():
+    load_dotenv()
+    args = build_parser().parse_args()
+
+    report = json.dumps(run(args), indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
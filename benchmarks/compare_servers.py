@@ -0,0 +1,155 @@
+"""Compare the threaded Flask server with the ASGI app (asgi.py) under the same load.
+
+Starts the fake LLM server and each app server as subprocesses, then runs bench_chat
+against each one at every requested concurrency level:
+
+    python -m benchmarks.compare_servers --candidates 50,200,1000 --turns 4 --latency-ms 800 \\
+        --output compare_results.json
+
+Besides the client-side latency percentiles and throughput, the report includes each
+server process's peak RSS and peak OS thread count, which is where the two models differ most
+when many interviews are waiting on the model at once.
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+
+from benchmarks.bench_chat import build_parser, run
+
+
+SERVERS = {
+    "threaded": lambda port: [sys.executable, "-c", f"from app import app; app.run(port={port}, threaded=True)"],
+    "asgi": lambda port: [sys.executable, "-m", "uvicorn", "asgi:app", "--port", str(port), "--log-level", "warning"],
+}
+
+
+def wait_until_up(url, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def process_status(pid):
+    """Peak RSS (MB) and thread count from /proc; empty off Linux."""
+    try:
+        with open(f"/proc/{pid}/status") as handle:
+            fields = dict(line.split(":", 1) for line in handle if ":" in line)
+    except OSError:
+        return {}
+    return {
+        "peak_rss_mb": round(int(fields["VmHWM"].split()[0]) / 1024, 1),
+        "threads": int(fields["Threads"]),
+    }
+
+
+class ProcessSampler(threading.Thread):
+    """Polls a process's thread count while a run is in progress and keeps the peak."""
+
+    def __init__(self, pid, interval=0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak_threads = 0
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.peak_threads = max(self.peak_threads, process_status(self.pid).get("threads", 0))
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        status = process_status(self.pid)
+        status["peak_threads"] = max(self.peak_threads, status.get("threads", 0))
+        return status
+
+
+def start(command, env):
+    # Own process group, so stop() also reaches forked PDF workers (they inherit the listening socket)
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+def stop(process):
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--servers", default="threaded,asgi", help="Comma-separated subset of: " + ", ".join(SERVERS))
+    parser.add_argument("--candidates", default="20,100", help="Comma-separated concurrency levels")
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--jitter-ms", type=float, default=150.0)
+    parser.add_argument("--distribution", default="lognormal")
+    parser.add_argument("--app-port", type=int, default=5600)
+    parser.add_argument("--llm-port", type=int, default=8400)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    llm = start([sys.executable, "-m", "benchmarks.fake_llm_server", "--port", str(args.llm_port),
+                 "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+                 "--distribution", args.distribution], os.environ.copy())
+    env = {**os.environ, "LLM_BASE_URL": f"http://127.0.0.1:{args.llm_port}", "GROQ_API_KEY": os.environ.get("GROQ_API_KEY", "fake")}
+
+    report = {"llm": {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "distribution": args.distribution}, "runs": []}
+    try:
+        for name in args.servers.split(","):
+            for candidates in [int(n) for n in args.candidates.split(",")]:
+                port = args.app_port
+                db = os.path.join(os.getcwd(), f"bench_{name}_sessions.db")
+                server = start(SERVERS[name](port), {**env, "SAVED_SESSIONS_DB": db})
+                try:
+                    wait_until_up(f"http://127.0.0.1:{port}/get-roles")
+                    bench_args = build_parser().parse_args([
+                        "--target", f"http://127.0.0.1:{port}", "--candidates", str(candidates),
+                        "--turns", str(args.turns)
+                    ])
+                    sampler = ProcessSampler(server.pid)
+                    sampler.start()
+                    result = run(bench_args)
+                    server_status = sampler.stop()
+                    summary = {
+                        "server": name,
+                        "candidates": candidates,
+                        "wall_seconds": result["wall_seconds"],
+                        "throughput": result["throughput"],
+                        "chat": result["latency"].get("chat"),
+                        "get_feedback": result["latency"].get("get-feedback"),
+                        "errors": result["errors"],
+                        "failures": len(result["failures"]),
+                        "server_process": server_status,
+                    }
+                    report["runs"].append(summary)
+                    print(json.dumps(summary), flush=True)
+                finally:
+                    stop(server)
+                    for suffix in ("", "-wal", "-shm"):
+                        if os.path.exists(db + suffix):
+                            os.remove(db + suffix)
+    finally:
+        stop(llm)
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
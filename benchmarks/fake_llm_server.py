@@ -0,0 +1,267 @@
+"""
+Deterministic OpenAI-compatible stand-in for the Groq API.
+
+Serves POST /openai/v1/chat/completions (the path the Groq SDK uses) with canned but
+well-formed answers for each agent, so the app can be exercised without network access:
+
+    python -m benchmarks.fake_llm_server --port 8400 --latency-ms 300 --error-rate 0.05
+    LLM_BASE_URL=http://127.0.0.1:8400 GROQ_API_KEY=fake python app.py
+
+The agent is recognised from its system prompt. Responses, latencies and injected
+failures are driven by a seeded RNG so runs are reproducible. Latency can follow a
+fixed, normal, lognormal or uniform distribution, optionally per agent, and the length
+of free-text answers is set in tokens.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+PROFILE = {
+    "persona": "normal", "is_relevant": True, "sentiment": "neutral", "confidence": "medium",
+    "communication_quality": "good", "engagement_level": "medium", "needs_encouragement": False,
+    "needs_redirection": False, "risk_factors": [], "positive_indicators": ["Specific example"],
+    "memorization_detected": False, "knowledge_gaps_detected": False, "authenticity_score": 0.8,
+    "specificity_score": 0.7, "red_flags": [], "consistency_issues": []
+}
+
+RESOURCES = {
+    "recommendations": [
+        {"title": "Designing Data-Intensive Applications", "type": "book", "description": "Distributed systems fundamentals", "priority": "high"},
+        {"title": "LeetCode", "type": "platform", "description": "Practice coding problems", "priority": "medium"}
+    ]
+}
+
+QUESTIONS = [
+    "Walk me through how you would design a rate limiter for a public API.",
+    "Tell me about a time you disagreed with a teammate on a technical decision. What did you do?",
+    "How would you find the bottleneck in a service whose p99 latency doubled overnight?",
+    "What trade-offs did you weigh when choosing the datastore for your last project?"
+]
+
+
+def grade(score):
+    return {
+        "score": score, "is_correct": score >= 60, "requires_followup": score < 60,
+        "technical_accuracy": score, "communication_quality": score, "relevance": score,
+        "depth_level": "intermediate", "feedback_internal": "Reasonable answer with some gaps.",
+        "strengths": ["Clear structure"], "improvements": ["More detail on trade-offs"],
+        "followup_suggestions": [], "confidence": 0.8
+    }
+
+
+def estimate_tokens(text):
+    return len(text) // 4 + 1
+
+
+def agent_for(messages):
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    if "COMBINED ASSESSMENT" in system:
+        return "assessor"
+    if "BEHAVIORAL PROFILER" in system:
+        return "profiler"
+    if "EVALUATION AGENT" in system:
+        return "grader"
+    if "FEEDBACK ANALYST" in system:
+        return "feedback"
+    if "learning advisor" in system:
+        return "learning_resources"
+    if "interview question templates" in system:
+        return "question_bank"
+    return "interviewer"
+
+
+FILLER = (
+    "Let us dig a little deeper into the design choices, the failure modes you planned for, "
+    "and how you would measure whether the change actually worked in production. "
+)
+
+
+class FakeLLM:
+    """Produces responses for a request body; holds the RNG and failure-injection settings."""
+
+    def __init__(self, latency_ms=200.0, jitter_ms=50.0, error_rate=0.0, seed=7, chunk_chars=12,
+                 distribution="normal", agent_latency_ms=None, completion_tokens=60):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.chunk_chars = chunk_chars
+        self.distribution = distribution
+        self.agent_latency_ms = agent_latency_ms or {}
+        self.completion_tokens = completion_tokens
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def _latency_ms(self, mean):
+        if self.distribution == "fixed":
+            return mean
+        if self.distribution == "uniform":
+            return self.rng.uniform(max(0.0, mean - self.jitter_ms), mean + self.jitter_ms)
+        if self.distribution == "lognormal":
+            # Parameterised so the distribution's mean and stddev match latency/jitter
+            variance = self.jitter_ms ** 2
+            sigma2 = math.log(1 + variance / (mean ** 2)) if mean > 0 else 0.0
+            return self.rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2)) if mean > 0 else 0.0
+        return self.rng.gauss(mean, self.jitter_ms)
+
+    def draw(self, agent):
+        """Return (latency seconds, should_fail, score, question) for the next request."""
+        with self.lock:
+            self.requests += 1
+            latency = max(0.0, self._latency_ms(self.agent_latency_ms.get(agent, self.latency_ms))) / 1000
+            fail = self.rng.random() < self.error_rate
+            score = self.rng.randint(40, 95)
+            question = self.rng.choice(QUESTIONS)
+        return latency, fail, score, question
+
+    def padded(self, text):
+        """Extend free text with filler up to roughly `completion_tokens` tokens."""
+        target_chars = self.completion_tokens * 4
+        while len(text) < target_chars:
+            text += " " + FILLER
+        return text[:max(target_chars, 1)].rstrip()
+
+    def content(self, body, score, question):
+        agent = agent_for(body.get("messages", []))
+        if agent == "profiler":
+            return json.dumps(PROFILE)
+        if agent == "grader":
+            return json.dumps(grade(score))
+        if agent == "assessor":
+            return json.dumps({"profile": PROFILE, "grade": grade(score)})
+        if agent == "learning_resources":
+            return json.dumps(RESOURCES)
+        if agent == "question_bank":
+            return json.dumps({"questions": [f"Let's talk about {{focus_area}}. {q}" for q in QUESTIONS] + ["Not a question {bad}"]})
+        if agent == "feedback":
+            return self.padded("# Interview Feedback Report\n\n## Executive Summary\nSolid fundamentals with room to deepen system design.\n")
+        return (
+            "[ANALYSIS]\n- Phase: Technical\n- Strategic Decision: probe depth\n"
+            f"[RESPONSE]\n{self.padded(f'Thanks, that helps. {question}')}"
+        )
+
+
+def make_handler(llm):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._json(404, {"error": {"message": "Not found"}})
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            latency, fail, score, question = llm.draw(agent_for(body.get("messages", [])))
+            time.sleep(latency)
+            if fail:
+                self._json(503, {"error": {"message": "Injected failure", "type": "server_error"}})
+                return
+
+            content = llm.content(body, score, question)
+            prompt_tokens = sum(estimate_tokens(m.get("content", "")) for m in body.get("messages", []))
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": estimate_tokens(content),
+                "total_tokens": prompt_tokens + estimate_tokens(content)
+            }
+            if body.get("stream"):
+                self._stream(body, content, usage)
+            else:
+                self._json(200, {
+                    "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                    "usage": usage
+                })
+
+        def _json(self, status, payload):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _stream(self, body, content, usage):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            chunk_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            pieces = [content[i:i + llm.chunk_chars] for i in range(0, len(content), llm.chunk_chars)]
+            for i, piece in enumerate(pieces + [None]):
+                event = {
+                    "id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{"index": 0, "delta": {"content": piece} if piece else {}, "finish_reason": None if piece else "stop"}]
+                }
+                if piece is None:
+                    event["x_groq"] = {"id": chunk_id, "usage": usage}
+                self._chunk(f"data: {json.dumps(event)}\n\n")
+            self._chunk("data: [DONE]\n\n")
+            self._chunk("")
+
+        def _chunk(self, text):
+            data = text.encode()
+            self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def start_server(port=0, **options):
+    """Start the fake server on a background thread; returns (server, base_url)."""
+    llm = FakeLLM(**options)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(llm))
+    server.daemon_threads = True
+    server.llm = llm
+    threading.Thread(target=server.serve_forever, name="fake-llm", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def parse_agent_latency(pairs):
+    """Turn ["interviewer=900", ...] into {"interviewer": 900.0}."""
+    overrides = {}
+    for pair in pairs:
+        agent, _, value = pair.partition("=")
+        overrides[agent.strip()] = float(value)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8400)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--distribution", choices=["fixed", "normal", "lognormal", "uniform"], default="normal")
+    parser.add_argument("--agent-latency", action="append", default=[], metavar="AGENT=MS",
+                        help="Override mean latency for one agent, e.g. --agent-latency interviewer=900")
+    parser.add_argument("--completion-tokens", type=int, default=60, help="Length of free-text answers")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    server, url = start_server(args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                               error_rate=args.error_rate, seed=args.seed, distribution=args.distribution,
+                               agent_latency_ms=parse_agent_latency(args.agent_latency),
+                               completion_tokens=args.completion_tokens)
+    print(f"Fake LLM listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
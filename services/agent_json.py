@@ -0,0 +1,212 @@
+import json
+import re
+
+from services.metrics import MetricsRegistry
+
+
+class AgentOutputError(ValueError):
+    """An agent's reply could not be read as JSON matching its schema."""
+
+
+_decoder = json.JSONDecoder(strict=False)
+
+NUMBER = (int, float)
+
+# A number running up to the end of the text, which a cut-off reply may have truncated
+TRAILING_NUMBER = re.compile(r"-?[0-9][0-9.eE+-]*$|-$")
+
+
+def field(types, required=False, choices=None):
+    """Schema entry: accepted type(s), whether the key must be present, and allowed values."""
+    return {"types": types if isinstance(types, tuple) else (types,), "required": required, "choices": choices}
+
+
+def _closed(prefix, stack):
+    """`prefix` cut at a safe point, with dangling separators dropped and containers closed."""
+    text = prefix.rstrip()
+    while text and text[-1] in ",:":
+        if text[-1] == ":":
+            # A key without its value: drop the key as well
+            text = text[:-1].rstrip()
+            if text.endswith('"'):
+                text = text[:text.rindex('"', 0, len(text) - 1)].rstrip()
+        else:
+            text = text[:-1].rstrip()
+    return text + "".join(reversed(stack))
+
+
+def repair_json(text):
+    """
+    Best-effort parse of a JSON object that may be wrapped in prose or code fences, carry
+    trailing commas, or be cut off mid-stream. Returns the object or raises AgentOutputError.
+
+    One pass over the text tracks strings and open containers; the object is then closed at
+    the end of the text, or failing that at successively earlier element boundaries, so a
+    truncated reply keeps every field that arrived complete. A number the text ends in may
+    have been cut short ("7" of "75"), so it is dropped rather than kept.
+    """
+    start = text.find("{")
+    if start == -1:
+        raise AgentOutputError("no JSON object in reply")
+    body = text[start:]
+
+    out = []
+    stack = []
+    cuts = []  # (length of out, open containers) at element boundaries
+    in_string = escaped = False
+    for ch in body:
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+            cuts.append((len(out), tuple(stack)))
+            continue
+        elif ch in "}]":
+            if not stack or ch != stack[-1]:
+                break
+            # Trailing comma before the closing bracket
+            while out and out[-1] in " \t\r\n,":
+                out.pop()
+            out.append(stack.pop())
+            if not stack:
+                break
+            continue
+        elif ch == ",":
+            cuts.append((len(out), tuple(stack)))
+        out.append(ch)
+
+    candidate = "".join(out)
+    if in_string:
+        candidate = (candidate[:-1] if escaped else candidate) + '"'
+    attempts = [(candidate, tuple(stack))] + [("".join(out[:length]), opened) for length, opened in reversed(cuts)]
+    if stack and not in_string and TRAILING_NUMBER.search(candidate):
+        attempts = attempts[1:]
+    for prefix, opened in attempts[:64]:
+        try:
+            value = _decoder.decode(_closed(prefix, list(opened)))
+        except ValueError:
+            continue
+        if isinstance(value, dict):
+            return value
+    raise AgentOutputError("reply is not repairable JSON")
+
+
+def validate(value, schema):
+    """
+    Check a parsed reply against `schema` ({key: field(...)}); returns a cleaned copy.
+
+    Numbers and booleans sent as strings are coerced. A required key that is missing or
+    invalid raises AgentOutputError; an invalid optional key is dropped so the agent's own
+    default applies. Keys not in the schema pass through.
+    """
+    if not isinstance(value, dict):
+        raise AgentOutputError("reply is not a JSON object")
+    cleaned = dict(value)
+    for key, spec in schema.items():
+        if key not in value:
+            if spec["required"]:
+                raise AgentOutputError(f"missing required field {key!r}")
+            continue
+        item = _coerce(value[key], spec["types"])
+        valid = item is not None and (spec["choices"] is None or item in spec["choices"])
+        if valid:
+            cleaned[key] = item
+        elif spec["required"]:
+            raise AgentOutputError(f"invalid value for {key!r}: {value[key]!r}")
+        else:
+            del cleaned[key]
+    return cleaned
+
+
+def _coerce(item, types):
+    if isinstance(item, bool):
+        return item if bool in types else None
+    if isinstance(item, types):
+        return item
+    if isinstance(item, str):
+        text = item.strip()
+        if bool in types and text.lower() in ("true", "false"):
+            return text.lower() == "true"
+        if int in types or float in types:
+            try:
+                number = float(text.rstrip("%").split("/")[0])
+            except ValueError:
+                return None
+            return int(number) if number.is_integer() else number
+    if float in types and isinstance(item, int):
+        return item
+    return None
+
+
+class AgentJSON:
+    """
+    Reads one agent's JSON replies: strict parse, then local repair, then (with `retry`) a
+    single small "fix this JSON" call to the model instead of re-running the whole agent.
+    Outcomes are counted in agent_json_outputs_total{agent, result}.
+    """
+
+    def __init__(self, client, agent, schema, retry=True):
+        self.client = client
+        self.agent = agent
+        self.schema = schema
+        self.retry = retry
+        metrics = getattr(client, "metrics", None) or MetricsRegistry()
+        self._outcomes = metrics.counter(
+            "agent_json_outputs_total", "Agent JSON replies by how they were read", ["agent", "result"])
+
+    def _read(self, content):
+        """Return (value, result, None) or (None, None, error)."""
+        content = content or ""
+        try:
+            return validate(json.loads(content), self.schema), "valid", None
+        except ValueError:
+            pass
+        try:
+            return validate(repair_json(content), self.schema), "repaired", None
+        except AgentOutputError as e:
+            return None, None, e
+
+    def _fix_request(self, content, error):
+        required = ", ".join(key for key, spec in self.schema.items() if spec["required"])
+        return dict(
+            model="openai/gpt-oss-20b",
+            messages=[
+                {"role": "system", "content": "You repair malformed JSON. Reply with only the corrected JSON object, keeping every value that is present."},
+                {"role": "user", "content": f"Problem: {error}\nRequired fields: {required}\n\nJSON to fix:\n{content[:6000]}"}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0
+        )
+
+    def _finish(self, value, result, error):
+        self._outcomes.inc(agent=self.agent, result=result or "failed")
+        if value is None:
+            raise error
+        return value
+
+    def parse(self, content):
+        value, result, error = self._read(content)
+        if value is None and self.retry:
+            fixed = self.client.complete(self.agent, **self._fix_request(content, error))
+            value, result, error = self._read(fixed.choices[0].message.content)
+            result = result and "fixed"
+        return self._finish(value, result, error)
+
+    async def parse_async(self, content):
+        """parse() for agents on an AsyncLLMClient."""
+        value, result, error = self._read(content)
+        if value is None and self.retry:
+            fixed = await self.client.complete(self.agent, **self._fix_request(content, error))
+            value, result, error = self._read(fixed.choices[0].message.content)
+            result = result and "fixed"
+        return self._finish(value, result, error)
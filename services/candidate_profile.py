@@ -0,0 +1,285 @@
+import re
+
+# Section headings, by the name they are stored under
+RESUME_SECTIONS = {
+    "summary": ("summary", "profile", "professional summary", "objective", "about me", "about"),
+    "experience": ("experience", "work experience", "professional experience", "employment", "employment history",
+                   "work history", "career history"),
+    "projects": ("projects", "personal projects", "selected projects", "key projects", "side projects"),
+    "skills": ("skills", "technical skills", "core skills", "key skills", "technologies", "tech stack", "tools",
+               "core competencies", "competencies"),
+    "education": ("education", "academic background", "qualifications"),
+    "certifications": ("certifications", "certificates", "licenses", "courses"),
+}
+
+JD_SECTIONS = {
+    "about": ("about us", "about the company", "who we are", "about the role", "the role", "overview", "summary"),
+    "responsibilities": ("responsibilities", "what you'll do", "what you will do", "your role", "key responsibilities",
+                         "duties", "the job"),
+    "requirements": ("requirements", "qualifications", "what you'll need", "what you will need", "you have",
+                     "must have", "must-have", "minimum qualifications", "required skills", "who you are"),
+    "nice_to_have": ("nice to have", "nice-to-have", "preferred qualifications", "preferred", "bonus points", "bonus",
+                     "pluses", "plus"),
+    "benefits": ("benefits", "perks", "what we offer", "compensation"),
+}
+
+# Technologies and practices recognised anywhere in the text, in their display spelling
+SKILL_TERMS = (
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Golang", "Rust", "C++", "C#", "Ruby", "PHP", "Kotlin", "Swift",
+    "Scala", "SQL", "R", "Bash", "React", "Angular", "Vue", "Node.js", "Next.js", "Django", "Flask", "FastAPI",
+    "Spring", "Rails", ".NET", "GraphQL", "REST", "gRPC", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Cassandra",
+    "DynamoDB", "Elasticsearch", "Kafka", "RabbitMQ", "Spark", "Hadoop", "Airflow", "dbt", "Snowflake", "BigQuery",
+    "AWS", "GCP", "Azure", "Docker", "Kubernetes", "Terraform", "Ansible", "Jenkins", "GitHub Actions", "CI/CD",
+    "Linux", "Git", "Microservices", "Distributed systems", "System design", "Machine learning", "Deep learning",
+    "NLP", "Computer vision", "PyTorch", "TensorFlow", "scikit-learn", "Pandas", "NumPy", "LLM", "MLOps",
+    "Data modeling", "ETL", "Tableau", "Power BI", "Excel", "Selenium", "Cypress", "Playwright", "Jest", "pytest",
+    "Test automation", "Agile", "Scrum", "Kanban", "Jira", "Figma", "A/B testing", "Product roadmap",
+    "Stakeholder management", "Prometheus", "Grafana", "Observability", "Security", "OAuth", "Networking",
+)
+
+# Terms that are also everyday words only count with their capitalisation
+CASE_SENSITIVE_TERMS = {"Go", "R", "Rust", "Swift", "Spring", "Excel", "Rails"}
+
+_SKILL_PATTERNS = [(term, re.compile(r"(?<![\w+#.])" + re.escape(term) + r"(?![\w+#&])",
+                                     0 if term in CASE_SENSITIVE_TERMS else re.IGNORECASE))
+                   for term in SKILL_TERMS]
+
+BULLET = re.compile(r"^\s*(?:[-*•▪●◦‣–]|\d+[.)])\s+")
+STATED_YEARS = re.compile(r"(\d{1,2})\+?\s*(?:years|yrs)", re.IGNORECASE)
+DATE_RANGE = re.compile(r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now)\b", re.IGNORECASE)
+REQUIREMENT_CUES = re.compile(
+    r"\b(?:experience|proficien|knowledge|familiar|must|strong|degree|understanding|ability|expertise|skills?)\w*",
+    re.IGNORECASE)
+SENTENCE_END = re.compile(r"(?<=[.;!?])\s+")
+WORD = re.compile(r"[a-z0-9+#]{3,}")
+
+ENTRY_CHARS = 180
+HEAD_CHARS = 1500
+CHUNK_CHARS = 320
+
+
+def _heading(line, sections):
+    """Section name if `line` is a heading for one of `sections`, else None."""
+    text = line.strip().rstrip(":").strip().lower()
+    if not text or len(text) > 40:
+        return None
+    for name, aliases in sections.items():
+        if text in aliases:
+            return name
+    return None
+
+
+def split_sections(text, sections):
+    """{section name: [lines]}; text before the first heading goes under "header"."""
+    found = {}
+    current = "header"
+    for line in (text or "").splitlines():
+        name = _heading(line, sections)
+        if name is not None:
+            current = name
+            continue
+        if line.strip():
+            found.setdefault(current, []).append(line.strip())
+    return found
+
+
+def entries(lines, limit=None):
+    """Bullet points and lines of a section, bullets stripped and long ones shortened."""
+    items = []
+    for line in lines:
+        item = BULLET.sub("", line).strip()
+        if item:
+            items.append(item if len(item) <= ENTRY_CHARS else item[:ENTRY_CHARS - 3].rstrip() + "...")
+        if limit and len(items) >= limit:
+            break
+    return items
+
+
+def roles(lines, limit=6):
+    """Experience as [{"role", "highlights"}]: a plain line opens a role, bullets under it are its highlights."""
+    found = []
+    for line in lines:
+        if BULLET.match(line) and found:
+            if len(found[-1]["highlights"]) < 6:
+                found[-1]["highlights"].extend(entries([line]))
+        elif len(found) < limit:
+            found.append({"role": entries([line])[0], "highlights": []})
+        else:
+            break
+    return found
+
+
+def chunks(sections, source, skip=(), max_chars=CHUNK_CHARS):
+    """
+    Retrieval chunks ({"source", "section", "text"}) of a parsed document: a plain line after
+    bullets starts a new chunk (the next role or entry), and chunks are cut at `max_chars`.
+    Long unbroken lines are split into sentences first.
+    """
+    found = []
+    for section, lines in sections.items():
+        if section in skip:
+            continue
+        current, has_bullet = [], False
+        for line in lines:
+            bullet = bool(BULLET.match(line))
+            for part in (SENTENCE_END.split(line) if len(line) > max_chars else [line]):
+                size = sum(len(item) + 1 for item in current)
+                if current and ((has_bullet and not bullet) or size + len(part) > max_chars):
+                    found.append({"source": source, "section": section, "text": " ".join(current)})
+                    current, has_bullet = [], False
+                current.append(BULLET.sub("", part).strip()[:max_chars])
+                has_bullet = has_bullet or bullet
+        if current:
+            found.append({"source": source, "section": section, "text": " ".join(current)})
+    return found
+
+
+def find_skills(text, listed=()):
+    """Listed skills first, then recognised terms by how often the text mentions them."""
+    counts = [(len(pattern.findall(text or "")), i, term) for i, (term, pattern) in enumerate(_SKILL_PATTERNS)]
+    found = [term for count, _, term in sorted(counts, key=lambda c: (-c[0], c[1])) if count]
+    skills = []
+    seen = set()
+    for skill in list(listed) + found:
+        key = skill.lower()
+        if key not in seen and len(skill) <= 40:
+            seen.add(key)
+            skills.append(skill)
+    return skills[:30]
+
+
+def years_of_experience(text, current_year, dated=None):
+    """
+    Stated years ("6+ years") in `text` or the span of the date ranges in `dated` (default:
+    `text`), whichever is larger.
+    """
+    stated = [int(n) for n in STATED_YEARS.findall(text or "") if 0 < int(n) < 50]
+    starts, ends = [], []
+    for start, end in DATE_RANGE.findall(text if dated is None else dated):
+        starts.append(int(start))
+        ends.append(current_year if not end[0].isdigit() else int(end))
+    span = max(ends) - min(starts) if starts else 0
+    years = max(stated + [span])
+    return years if 0 < years < 50 else None
+
+
+def parse_resume(text, current_year):
+    """Structured resume: sections, skills, years of experience, roles and projects."""
+    sections = split_sections(text, RESUME_SECTIONS)
+    listed = [skill.strip() for line in sections.get("skills", [])
+              for skill in re.split(r"[,;|•/]|\s{2,}", BULLET.sub("", line).split(":", 1)[-1]) if skill.strip()]
+    return {
+        "summary": " ".join(sections.get("summary", []))[:400],
+        "skills": find_skills(text, listed),
+        # Only jobs' dates count: education and project dates would inflate a student's experience
+        "years": years_of_experience(text, current_year, "\n".join(sections.get("experience", []))),
+        "experience": roles(sections.get("experience", [])),
+        "projects": entries(sections.get("projects", []), 8),
+        "education": entries(sections.get("education", []), 3),
+        "certifications": entries(sections.get("certifications", []), 4),
+        "structured": len(sections) > 1,
+        "head": (text or "")[:HEAD_CHARS],
+        "chunks": chunks(sections, "resume"),
+    }
+
+
+def parse_jd(text, current_year):
+    """Structured job description: requirements, responsibilities, skills and years asked for."""
+    sections = split_sections(text, JD_SECTIONS)
+    requirements = entries(sections.get("requirements", []), 12)
+    if not requirements:
+        # No headings: keep the sentences that read like requirements
+        requirements = entries([sentence for lines in sections.values() for line in lines
+                                for sentence in SENTENCE_END.split(line) if REQUIREMENT_CUES.search(sentence)], 12)
+    return {
+        "title": [title.strip() for title in SENTENCE_END.split((sections.get("header") or [""])[0], 1)[:1]
+                  if title.strip() and len(title) <= 100],
+        "requirements": requirements,
+        "responsibilities": entries(sections.get("responsibilities", []), 8),
+        "nice_to_have": entries(sections.get("nice_to_have", []), 5),
+        "skills": find_skills(text),
+        "years": years_of_experience(" ".join(sections.get("requirements", [])) or text, current_year),
+        "structured": len(sections) > 1,
+        "head": (text or "")[:HEAD_CHARS],
+        # Requirements are short; smaller chunks let each one be retrieved on its own
+        "chunks": chunks(sections, "jd", skip=("benefits",), max_chars=160),
+    }
+
+
+def _terms(text):
+    return set(WORD.findall((text or "").lower()))
+
+
+def _ranked(items, focus, key=str):
+    """`items` with those sharing the most words with `focus` first, otherwise in document order."""
+    if not focus:
+        return list(items)
+    order = sorted(range(len(items)), key=lambda i: (-len(_terms(key(items[i])) & focus), i))
+    return [items[i] for i in order]
+
+
+def _fit(lines, limit):
+    """Join `lines` within `limit` characters; a line that does not fit is shortened or skipped."""
+    out, used = [], 0
+    for line in lines:
+        if not line:
+            continue
+        room = limit - used - 1
+        if len(line) > room:
+            if room < 120:
+                continue
+            line = line[:room - 3].rstrip() + "..."
+        out.append(line)
+        used += len(line) + 1
+    return "\n".join(out)
+
+
+def _list_line(label, items, limit=None):
+    items = items[:limit] if limit else items
+    return f"{label}: {', '.join(items)}" if items else ""
+
+
+def resume_digest(profile, limit, focus=""):
+    """
+    Compact resume context of at most `limit` characters: experience, skills and the roles and
+    projects that share the most words with `focus` (the question or answer at hand). Falls back
+    to the start of the text when the resume had no recognisable sections.
+    """
+    if not profile:
+        return ""
+    if not profile["structured"] and not profile["skills"]:
+        return profile["head"][:limit]
+    focus_terms = _terms(focus)
+    skills = _ranked(profile["skills"], focus_terms)
+    lines = [
+        f"Experience: about {profile['years']} years" if profile["years"] else "",
+        _list_line("Skills", skills, 20),
+        f"Summary: {profile['summary'][:250]}" if profile["summary"] else "",
+    ]
+    for role in _ranked(profile["experience"], focus_terms, key=lambda role: " ".join([role["role"]] + role["highlights"]))[:3]:
+        lines.append(f"- {role['role']}")
+        lines += [f"  * {item}" for item in _ranked(role["highlights"], focus_terms)[:2]]
+    lines += [f"- Project: {item}" for item in _ranked(profile["projects"], focus_terms)[:3]]
+    lines.append(_list_line("Education", profile["education"], 1))
+    lines.append(_list_line("Certifications", profile["certifications"]))
+    if not profile["structured"]:
+        lines.append(profile["head"])
+    return _fit(lines, limit)
+
+
+def jd_digest(profile, limit, focus=""):
+    """Compact job description of at most `limit` characters, requirements first."""
+    if not profile:
+        return ""
+    if not profile["structured"] and not profile["requirements"]:
+        return profile["head"][:limit]
+    focus_terms = _terms(focus)
+    lines = [
+        f"Role: {profile['title'][0]}" if profile["title"] else "",
+        f"Experience required: {profile['years']}+ years" if profile["years"] else "",
+        _list_line("Key skills", _ranked(profile["skills"], focus_terms), 15),
+    ]
+    lines += [f"- {item}" for item in _ranked(profile["requirements"], focus_terms)]
+    lines += [f"- Responsibility: {item}" for item in _ranked(profile["responsibilities"], focus_terms)[:4]]
+    lines.append(_list_line("Nice to have", profile["nice_to_have"]))
+    return _fit(lines, limit)
@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from services.llm_scheduler import llm_session
+from services.metrics import MetricsRegistry
+
+
+class FeedbackDrafts:
+    """
+    Feedback reports kept up to date in the background, one per interview session.
+
+    After each graded turn the app passes the session's per-question notes to schedule(); a
+    worker folds the new notes into the previous draft. Jobs for one session never overlap: a
+    schedule() arriving while a job runs is parked, and only the newest parked request runs when
+    that job finishes. latest() returns the last completed draft without waiting, so the final
+    report is usually ready before the candidate asks for it.
+    """
+
+    def __init__(self, generator, max_workers=4, max_sessions=10000, wait_timeout=60, metrics=None):
+        self.generator = generator
+        self.max_sessions = max_sessions
+        self.wait_timeout = wait_timeout
+        self._drafts = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="feedback")
+
+        metrics = metrics or MetricsRegistry()
+        self._duration = metrics.histogram(
+            "feedback_draft_duration_seconds", "Time to fold new question notes into a feedback draft")
+        self._jobs = metrics.counter(
+            "feedback_draft_jobs_total", "Background feedback drafts by outcome", ["result"])
+        self._finals = metrics.counter(
+            "feedback_final_reports_total", "End-of-interview reports by how they were produced", ["source"])
+
+    @staticmethod
+    def _new_entry():
+        return {"report": None, "version": 0, "status": "idle", "error": None, "updated_at": None,
+                "running": None, "running_version": 0, "queued": None}
+
+    def schedule(self, session_id, notes, resume, jd, score_stats, question_count):
+        """Queue a draft covering `notes`; returns immediately."""
+        inputs = (list(notes), resume, jd, score_stats.copy(), question_count)
+        with self._lock:
+            entry = self._drafts.get(session_id)
+            if entry is None:
+                entry = self._drafts[session_id] = self._new_entry()
+                while len(self._drafts) > self.max_sessions:
+                    self._drafts.popitem(last=False)
+            self._drafts.move_to_end(session_id)
+
+            if entry["running"] is not None:
+                if entry["queued"] is not None:
+                    self._jobs.inc(result="superseded")
+                entry["queued"] = inputs
+                return
+            self._start(session_id, entry, inputs)
+
+    def _start(self, session_id, entry, inputs):
+        # Caller holds self._lock
+        entry["status"] = "running"
+        entry["running_version"] = len(inputs[0])
+        entry["running"] = self._pool.submit(self._run, session_id, entry, inputs)
+
+    def _run(self, session_id, entry, inputs):
+        notes, resume, jd, score_stats, question_count = inputs
+        with self._lock:
+            previous, covered = entry["report"], entry["version"]
+
+        start = time.perf_counter()
+        try:
+            with llm_session(session_id):
+                report = self.generator.draft_feedback(notes, resume, jd, score_stats, question_count, previous, covered)
+            error = None
+        except Exception as e:
+            report, error = None, str(e) or type(e).__name__
+        self._duration.observe(time.perf_counter() - start)
+        self._jobs.inc(result="failed" if error else "completed")
+
+        with self._lock:
+            self._store(entry, report, len(notes), error)
+            queued, entry["queued"] = entry["queued"], None
+            if queued is not None and self._drafts.get(session_id) is entry:
+                self._start(session_id, entry, queued)
+            else:
+                entry["running"] = None
+                entry["status"] = "failed" if error else "idle"
+
+    @staticmethod
+    def _store(entry, report, version, error):
+        # Caller holds self._lock
+        entry["error"] = error
+        if error is None and version >= entry["version"]:
+            entry["report"] = report
+            entry["version"] = version
+            entry["updated_at"] = time.time()
+
+    def latest(self, session_id):
+        """The last completed draft as {"report", "version", ...}, or None if there is none yet."""
+        with self._lock:
+            entry = self._drafts.get(session_id)
+            if entry is None or entry["report"] is None:
+                return None
+            return {"report": entry["report"], "version": entry["version"], "updated_at": entry["updated_at"]}
+
+    def status(self, session_id, questions):
+        """Job status for a session whose notes list currently has `questions` entries."""
+        with self._lock:
+            entry = self._drafts.get(session_id) or self._new_entry()
+            return {
+                "status": entry["status"],
+                "version": entry["version"],
+                "questions": questions,
+                "up_to_date": entry["report"] is not None and entry["version"] >= questions,
+                "pending": entry["queued"] is not None,
+                "error": entry["error"],
+                "updated_at": entry["updated_at"]
+            }
+
+    def finalize(self, session_id, notes, resume, jd, score_stats, question_count):
+        """
+        A report covering every note: the current draft when it is up to date, the running job's
+        result when that job already covers all notes, otherwise a synchronous update of the
+        latest draft. Returns None when there are no notes or the update fails.
+        """
+        target = len(notes)
+        if not target:
+            return None
+        deadline = time.monotonic() + self.wait_timeout
+
+        with self._lock:
+            entry = self._drafts.get(session_id)
+            future = entry["running"] if entry is not None and entry["running_version"] >= target else None
+        if future is not None:
+            try:
+                future.result(timeout=max(0, deadline - time.monotonic()))
+            except Exception:
+                pass
+
+        with self._lock:
+            entry = self._drafts.get(session_id)
+            if entry is None:
+                entry = self._drafts[session_id] = self._new_entry()
+            if entry["report"] is not None and entry["version"] >= target:
+                self._finals.inc(source="draft")
+                return entry["report"]
+            # The merge below covers anything still parked
+            entry["queued"] = None
+            previous, covered = entry["report"], entry["version"]
+
+        try:
+            report = self.generator.draft_feedback(notes, resume, jd, score_stats, question_count, previous, covered)
+        except Exception as e:
+            with self._lock:
+                entry["error"] = str(e) or type(e).__name__
+            self._finals.inc(source="failed")
+            return None
+        with self._lock:
+            self._store(entry, report, target, None)
+        self._finals.inc(source="merge" if previous else "full")
+        return report
+
+    def discard(self, session_id):
+        """Forget a session's draft; a job still running for it finishes without being stored."""
+        with self._lock:
+            self._drafts.pop(session_id, None)
@@ -0,0 +1,167 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from services.llm_scheduler import llm_session
+from services.lru_cache import LRUCache
+from services.metrics import MetricsRegistry
+from services.score_stats import SCORE_BUCKETS, score_band
+
+FUNDAMENTALS = "Fundamental concepts"
+CORE_SKILLS = "Core technical skills"
+
+# weak_areas() cut-offs: an average below FUNDAMENTALS_BELOW, or any score below CORE_SKILLS_BELOW
+FUNDAMENTALS_BELOW = 60
+CORE_SKILLS_BELOW = 50
+
+
+def weak_areas(scores, average):
+    areas = []
+    if average < FUNDAMENTALS_BELOW:
+        areas.append(FUNDAMENTALS)
+    if any(s < CORE_SKILLS_BELOW for s in scores):
+        areas.append(CORE_SKILLS)
+    return tuple(sorted(areas))
+
+
+def resource_profile(scores, role):
+    """(role, score band, weak areas): what the recommendations depend on, and their cache key."""
+    average = sum(scores) / len(scores) if scores else 0
+    return role, score_band(average), weak_areas(scores, average)
+
+
+def band_weak_areas():
+    """
+    Every weak-area set a candidate in each score band can map to, for pre-warming. Derived from
+    resource_profile(): each band's averages at its edges and either side of the cut-offs, with
+    every score at the average or with one low score among them, plus a candidate with no
+    graded answers yet.
+    """
+    table = {name: set() for name, _ in SCORE_BUCKETS}
+    _, band, areas = resource_profile([], None)
+    table[band].add(areas)
+    lower = 0
+    for name, upper in SCORE_BUCKETS:
+        top = 100 if upper is None else upper - 0.5
+        averages = {lower, top} | {cut + step for cut in (FUNDAMENTALS_BELOW, CORE_SKILLS_BELOW) for step in (-0.5, 0)}
+        for average in averages:
+            if lower <= average <= top:
+                table[name].update(weak_areas(scores, average) for scores in ([average], [0]))
+        lower = upper
+    return {name: sorted(areas) for name, areas in table.items()}
+
+
+BAND_WEAK_AREAS = band_weak_areas()
+
+
+def prewarm_profiles(roles):
+    """Every profile a candidate for one of `roles` can map to."""
+    return [(role, band, areas) for role in roles for band, _ in SCORE_BUCKETS for areas in BAND_WEAK_AREAS[band]]
+
+
+class LearningResourceCache:
+    """
+    Learning-resource recommendations cached per (role, score band, weak areas).
+
+    Recommendations for a profile are generated once by `fetch(profile)` and then served from a
+    TTL'd LRU cache, so candidates with the same role and performance band get an answer without
+    a model call. Concurrent misses for one profile share a single fetch, whether they come from
+    get() or get_async(); failed fetches are not cached. prewarm() fills the cache in the
+    background, one profile at a time.
+    """
+
+    def __init__(self, fetch, ttl=86400, max_entries=1024, wait_timeout=60, metrics=None):
+        self.fetch = fetch
+        self.wait_timeout = wait_timeout
+        self.cache = LRUCache(max_entries=max_entries, sizeof=lambda value: 1, ttl=ttl)
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+        metrics = metrics or MetricsRegistry()
+        self._lookups = metrics.counter(
+            "learning_resources_cache_total", "Learning-resource lookups by cache outcome", ["result"])
+        metrics.gauge("learning_resources_cache_entries", "Learning-resource profiles cached", lambda: len(self.cache))
+
+    def lookup(self, profile):
+        """Cached recommendations for a profile, or None (counted as a miss)."""
+        resources = self.cache.get(profile)
+        self._lookups.inc(result="hit" if resources is not None else "miss")
+        return resources
+
+    def store(self, profile, resources):
+        self.cache.put(profile, resources)
+
+    def get(self, profile):
+        """Return (recommendations, cached); raises when the fetch fails."""
+        resources = self.lookup(profile)
+        if resources is not None:
+            return resources, True
+
+        future, owner = self._claim(profile)
+        if not owner:
+            return future.result(timeout=self.wait_timeout), False
+
+        try:
+            resources = self.fetch(profile)
+        except Exception as e:
+            self._settle(profile, future, error=e)
+            raise
+        self._settle(profile, future, resources)
+        return resources, False
+
+    async def get_async(self, profile, fetch):
+        """get() for coroutines; `fetch` is the coroutine function that generates a profile's recommendations."""
+        resources = self.lookup(profile)
+        if resources is not None:
+            return resources, True
+
+        future, owner = self._claim(profile)
+        if not owner:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.wait_timeout), False
+
+        try:
+            resources = await fetch(profile)
+        except BaseException as e:
+            # Cancellation too: waiters must not be left on a fetch that will never finish
+            self._settle(profile, future, error=e if isinstance(e, Exception) else RuntimeError("Fetch cancelled"))
+            raise
+        self._settle(profile, future, resources)
+        return resources, False
+
+    def _claim(self, profile):
+        """Return (future, owner): the profile's in-flight fetch, which the caller runs when `owner`."""
+        with self._lock:
+            future = self._inflight.get(profile)
+            owner = future is None
+            if owner:
+                future = self._inflight[profile] = Future()
+        if not owner:
+            self._lookups.inc(result="shared")
+        return future, owner
+
+    def _settle(self, profile, future, resources=None, error=None):
+        if error is None:
+            self.store(profile, resources)
+        with self._lock:
+            self._inflight.pop(profile, None)
+        if error is None:
+            future.set_result(resources)
+        else:
+            future.set_exception(error)
+
+    def prewarm(self, profiles):
+        """Fetch every profile not already cached, in a daemon thread; returns the thread."""
+        def run():
+            for profile in profiles:
+                if profile in self.cache:
+                    continue
+                try:
+                    with llm_session("learning-resources-prewarm"):
+                        self.store(profile, self.fetch(profile))
+                    self._lookups.inc(result="prewarmed")
+                except Exception:
+                    self._lookups.inc(result="prewarm_failed")
+
+        thread = threading.Thread(target=run, name="learning-resources-prewarm", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,427 @@
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import httpx
+from groq import AsyncGroq, Groq, APIConnectionError, APIStatusError
+
+from services.llm_scheduler import estimate_tokens
+from services.metrics import MetricsRegistry
+
+
+# Per-request trace of LLM calls (agent, latency, tokens), collected by LLMClient.trace()
+_current_trace = contextvars.ContextVar("llm_trace", default=None)
+
+DEFAULT_TIMEOUTS = {
+    "profiler": 10.0,
+    "grader": 20.0,
+    "assessor": 20.0,
+    "interviewer": 45.0,
+    "feedback": 90.0,
+    "learning_resources": 30.0
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the API while an agent's circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls fail fast for
+    `reset_timeout` seconds; then a single trial call is let through to decide whether to close.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def release(self):
+        """End a call that neither succeeded nor failed (abandoned by the caller) without counting it."""
+        with self._lock:
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+def is_retryable(error):
+    """Timeouts, connection errors, 429 and 5xx are worth retrying; other 4xx are not."""
+    if isinstance(error, APIConnectionError):  # includes APITimeoutError
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def retry_after_seconds(error):
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class BaseLLMClient:
+    """
+    Retry, circuit-breaking and accounting shared by the sync and async clients.
+
+    Each call is tagged with the agent name, which selects its timeout and circuit breaker,
+    and is retried with exponential backoff plus jitter on 429/5xx/timeouts. Latency and
+    token usage are tallied per agent and exported through `metrics`. With a `scheduler`
+    (LLMScheduler), every attempt first waits for rate-limit capacity in the agent's priority class.
+    With a `router` (ModelRouter), the model and max_tokens of each call are chosen per agent,
+    and each call's latency is fed back to the router.
+    """
+
+    def __init__(self, timeouts=None, default_timeout=30.0, max_retries=3, backoff_base=0.5,
+                 backoff_max=8.0, breaker_threshold=5, breaker_reset=30.0, metrics=None, scheduler=None,
+                 router=None):
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.default_timeout = default_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.scheduler = scheduler
+        self.router = router
+        self._breakers = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+        self.metrics = metrics or MetricsRegistry()
+        self._latency = self.metrics.histogram(
+            "llm_request_duration_seconds", "LLM completion latency per agent (streams: until the last chunk)", ["agent", "model"])
+        self._tokens = self.metrics.counter("llm_tokens_total", "Tokens reported by the LLM API", ["agent", "kind"])
+        self._errors = self.metrics.counter("llm_errors_total", "LLM calls that failed after retries", ["agent"])
+        self._retries = self.metrics.counter("llm_retries_total", "Retried LLM attempts", ["agent"])
+        self._fallbacks = self.metrics.counter(
+            "agent_fallbacks_total", "Agent results replaced by safe defaults after an error", ["agent", "error"])
+        self.metrics.gauge("llm_circuit_open", "1 while an agent's circuit breaker is open", self._circuit_states, ["agent"])
+
+    def breaker(self, agent):
+        with self._lock:
+            if agent not in self._breakers:
+                self._breakers[agent] = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+            return self._breakers[agent]
+
+    def _admit(self, agent):
+        """Return the agent's breaker, or raise CircuitOpenError without calling the API."""
+        breaker = self.breaker(agent)
+        if not breaker.allow():
+            self._record(agent, error=True)
+            raise CircuitOpenError(f"Circuit open for {agent}")
+        return breaker
+
+    def _retry_delay(self, agent, breaker, error, attempt):
+        """Seconds to wait before retry number `attempt`, or None if `error` should be raised."""
+        if is_retryable(error) and attempt <= self.max_retries:
+            self._record(agent, retry=True)
+            delay = self._backoff(attempt, retry_after_seconds(error))
+            if self.scheduler is not None and getattr(error, "status_code", None) == 429:
+                # Rate limited: hold every agent's calls, not just this retry
+                self.scheduler.pause(delay)
+            return delay
+        if is_retryable(error):
+            breaker.record_failure()
+        else:
+            # The service answered (e.g. 400); that says nothing about its health
+            breaker.record_success()
+        self._record(agent, error=True)
+        return None
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        # Full jitter: uniform in [0, base * 2^attempt], capped
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _chunk_usage(chunk, usage):
+        return getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None) or usage
+
+    def _route(self, agent, kwargs):
+        if self.router is None:
+            return kwargs, None
+        return self.router.route(agent, kwargs)
+
+    def _record(self, agent, latency_ms=None, usage=None, retry=False, error=False, model=None, route=None):
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        if retry:
+            self._retries.inc(agent=agent)
+        elif error:
+            self._errors.inc(agent=agent)
+        else:
+            self._latency.observe(latency_ms / 1000, agent=agent, model=model or "")
+            if self.router is not None:
+                self.router.observe(agent, model, latency_ms)
+            self._tokens.inc(prompt_tokens, agent=agent, kind="prompt")
+            self._tokens.inc(completion_tokens, agent=agent, kind="completion")
+        with self._lock:
+            stats = self._stats.setdefault(agent, {
+                "calls": 0, "errors": 0, "retries": 0, "latency_ms_total": 0.0,
+                "prompt_tokens": 0, "completion_tokens": 0
+            })
+            if retry:
+                stats["retries"] += 1
+            elif error:
+                stats["errors"] += 1
+            else:
+                stats["calls"] += 1
+                stats["latency_ms_total"] += latency_ms
+                stats["prompt_tokens"] += prompt_tokens
+                stats["completion_tokens"] += completion_tokens
+
+        trace = _current_trace.get()
+        if trace is not None and latency_ms is not None:
+            trace.append({
+                "agent": agent,
+                "model": model,
+                "route": route,
+                "latency_ms": round(latency_ms, 1),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens
+            })
+
+    def _settle(self, estimated, usage):
+        if self.scheduler is not None and usage is not None:
+            self.scheduler.settle(estimated, (getattr(usage, "prompt_tokens", 0) or 0) +
+                                  (getattr(usage, "completion_tokens", 0) or 0))
+
+    def _finish_stream(self, agent, breaker, outcome, start, usage, model, estimated, route):
+        """
+        Settle the breaker, stats and token estimate once a stream ends. `outcome` is "completed",
+        "failed" (the stream raised) or "abandoned" (closed early or cancelled by the caller, e.g.
+        a candidate closing the tab). Abandoning says nothing about the upstream, so it only
+        frees a half-open trial.
+        """
+        if outcome == "completed":
+            breaker.record_success()
+            self._record(agent, latency_ms=(time.perf_counter() - start) * 1000, usage=usage, model=model, route=route)
+        elif outcome == "failed":
+            breaker.record_failure()
+            self._record(agent, error=True)
+        else:
+            breaker.release()
+        self._settle(estimated, usage)
+
+    def record_fallback(self, agent, error):
+        """Called by agents when they swallow an error and answer with defaults."""
+        self._fallbacks.inc(agent=agent, error=type(error).__name__)
+
+    def _circuit_states(self):
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {(agent,): int(breaker.state == "open") for agent, breaker in breakers.items()}
+
+    def stats(self):
+        """Per-agent call counts, average latency, token totals and breaker state."""
+        with self._lock:
+            snapshot = {agent: dict(values) for agent, values in self._stats.items()}
+            breakers = dict(self._breakers)
+        for agent, values in snapshot.items():
+            values["avg_latency_ms"] = round(values["latency_ms_total"] / values["calls"], 1) if values["calls"] else 0.0
+            values["circuit"] = breakers[agent].state if agent in breakers else "closed"
+        return snapshot
+
+    @contextmanager
+    def trace(self):
+        """Collect every call made in this context (and contexts copied from it) into a list."""
+        calls = []
+        token = _current_trace.set(calls)
+        try:
+            yield calls
+        finally:
+            _current_trace.reset(token)
+
+
+class LLMClient(BaseLLMClient):
+    """
+    Shared chat-completion layer used by every agent.
+
+    One pooled keep-alive HTTP client serves all agents; see BaseLLMClient for retries,
+    breakers and metrics. Point `base_url` at a local OpenAI-compatible server to exercise
+    it without Groq.
+    """
+
+    def __init__(self, api_key=None, base_url=None, timeouts=None, default_timeout=30.0,
+                 max_retries=3, backoff_base=0.5, backoff_max=8.0, pool_size=32,
+                 breaker_threshold=5, breaker_reset=30.0, metrics=None, scheduler=None, router=None):
+        super().__init__(timeouts, default_timeout, max_retries, backoff_base, backoff_max,
+                         breaker_threshold, breaker_reset, metrics, scheduler, router)
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size, keepalive_expiry=60),
+            timeout=default_timeout
+        )
+        # Retries are handled here so they can feed the circuit breaker and metrics
+        self.client = Groq(api_key=api_key, base_url=base_url, http_client=self.http_client, max_retries=0)
+
+    def complete(self, agent, **kwargs):
+        """
+        Create a chat completion on behalf of `agent`.
+
+        Accepts the same keyword arguments as `chat.completions.create`. With stream=True the
+        returned iterator yields chunks; retries only apply until the stream is opened.
+        """
+        breaker = self._admit(agent)
+        timeout = self.timeouts.get(agent, self.default_timeout)
+        kwargs, route = self._route(agent, kwargs)
+        estimated = estimate_tokens(agent, kwargs)
+        attempt = 0
+        while True:
+            if self.scheduler is not None:
+                self.scheduler.acquire(agent, estimated)
+            start = time.perf_counter()
+            try:
+                response = self.client.chat.completions.create(timeout=timeout, **kwargs)
+            except Exception as e:
+                attempt += 1
+                delay = self._retry_delay(agent, breaker, e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+
+            if kwargs.get("stream"):
+                return self._stream(agent, breaker, response, start, kwargs.get("model"), estimated, route)
+
+            breaker.record_success()
+            self._record(agent, latency_ms=(time.perf_counter() - start) * 1000, usage=getattr(response, "usage", None),
+                         model=kwargs.get("model"), route=route)
+            self._settle(estimated, getattr(response, "usage", None))
+            return response
+
+    def _stream(self, agent, breaker, stream, start, model=None, estimated=0, route=None):
+        usage = None
+        outcome = "abandoned"
+        try:
+            for chunk in stream:
+                usage = self._chunk_usage(chunk, usage)
+                yield chunk
+            outcome = "completed"
+        except Exception:
+            outcome = "failed"
+            raise
+        finally:
+            try:
+                # Return the pooled connection now rather than when the stream is collected
+                stream.close()
+            finally:
+                self._finish_stream(agent, breaker, outcome, start, usage, model, estimated, route)
+
+
+class AsyncLLMClient(BaseLLMClient):
+    """
+    Asyncio counterpart of LLMClient for the ASGI app (asgi.py).
+
+    Waiting on the model parks a coroutine instead of an OS thread, so one event loop can keep
+    thousands of interviews open. Pass the same `metrics` registry as the sync client to get
+    one set of series; breakers and stats are kept per client.
+    """
+
+    def __init__(self, api_key=None, base_url=None, timeouts=None, default_timeout=30.0,
+                 max_retries=3, backoff_base=0.5, backoff_max=8.0, pool_size=100,
+                 breaker_threshold=5, breaker_reset=30.0, metrics=None, scheduler=None, router=None):
+        super().__init__(timeouts, default_timeout, max_retries, backoff_base, backoff_max,
+                         breaker_threshold, breaker_reset, metrics, scheduler, router)
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size, keepalive_expiry=60),
+            timeout=default_timeout
+        )
+        self.client = AsyncGroq(api_key=api_key, base_url=base_url, http_client=self.http_client, max_retries=0)
+
+    async def complete(self, agent, **kwargs):
+        """Async version of LLMClient.complete; with stream=True returns an async iterator."""
+        breaker = self._admit(agent)
+        timeout = self.timeouts.get(agent, self.default_timeout)
+        kwargs, route = self._route(agent, kwargs)
+        estimated = estimate_tokens(agent, kwargs)
+        attempt = 0
+        while True:
+            if self.scheduler is not None:
+                await self.scheduler.acquire_async(agent, estimated)
+            start = time.perf_counter()
+            try:
+                response = await self.client.chat.completions.create(timeout=timeout, **kwargs)
+            except Exception as e:
+                attempt += 1
+                delay = self._retry_delay(agent, breaker, e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            if kwargs.get("stream"):
+                return self._stream(agent, breaker, response, start, kwargs.get("model"), estimated, route)
+
+            breaker.record_success()
+            self._record(agent, latency_ms=(time.perf_counter() - start) * 1000, usage=getattr(response, "usage", None),
+                         model=kwargs.get("model"), route=route)
+            self._settle(estimated, getattr(response, "usage", None))
+            return response
+
+    async def _stream(self, agent, breaker, stream, start, model=None, estimated=0, route=None):
+        usage = None
+        outcome = "abandoned"
+        try:
+            async for chunk in stream:
+                usage = self._chunk_usage(chunk, usage)
+                yield chunk
+            outcome = "completed"
+        except Exception:
+            outcome = "failed"
+            raise
+        finally:
+            try:
+                # Return the pooled connection now rather than when the stream is collected
+                await stream.close()
+            finally:
+                self._finish_stream(agent, breaker, outcome, start, usage, model, estimated, route)
+
+    async def aclose(self):
+        await self.http_client.aclose()
@@ -0,0 +1,216 @@
+import asyncio
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from services.metrics import MetricsRegistry
+
+
+# Lower runs first: the reply a candidate is waiting on beats background work
+DEFAULT_PRIORITIES = {
+    "interviewer": 0,
+    "grader": 1,
+    "assessor": 1,
+    "profiler": 2,
+    "feedback": 3,
+    "learning_resources": 3
+}
+
+# Expected completion size per agent, used when a request does not set max_tokens
+COMPLETION_ESTIMATES = {
+    "interviewer": 400,
+    "grader": 300,
+    "assessor": 500,
+    "profiler": 200,
+    "feedback": 1500,
+    "learning_resources": 500
+}
+
+# Session the current request belongs to; calls are queued fairly across sessions
+_current_session = contextvars.ContextVar("llm_session", default=None)
+
+
+@contextmanager
+def llm_session(session_id):
+    """Attribute LLM calls made in this context (and contexts copied from it) to a session."""
+    token = _current_session.set(session_id)
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+
+def estimate_tokens(agent, kwargs):
+    """Rough token cost of a completion: ~4 characters per prompt token plus the expected reply."""
+    prompt_chars = sum(len(str(message.get("content") or "")) for message in kwargs.get("messages", []))
+    return prompt_chars // 4 + (kwargs.get("max_tokens") or COMPLETION_ESTIMATES.get(agent, 500))
+
+
+class TokenBucket:
+    """`per_minute` units per minute, up to one minute's worth banked. Not thread-safe."""
+
+    def __init__(self, per_minute):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def shortfall(self, amount):
+        """Seconds until `amount` is available (a request larger than the bucket waits for a full one)."""
+        needed = min(amount, self.capacity) - self.level
+        return needed / self.rate if needed > 0 else 0.0
+
+
+class _Waiter:
+    __slots__ = ("priority", "session", "tokens")
+
+    def __init__(self, priority, session, tokens):
+        self.priority = priority
+        self.session = session
+        self.tokens = tokens
+
+
+class LLMScheduler:
+    """
+    Process-wide admission control for LLM calls.
+
+    Every attempt takes one request and its estimated tokens from two token buckets (RPM and
+    TPM; either may be None for no limit). While the buckets have room and nobody is queued, a
+    call goes straight through. Otherwise callers queue: the highest-priority class is served
+    first and, within a class, sessions take turns so one candidate's burst cannot starve the
+    others. A 429 pauses all admissions for the server's Retry-After.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, priorities=None, poll_interval=0.01,
+                 metrics=None):
+        self.priorities = {**DEFAULT_PRIORITIES, **(priorities or {})}
+        self.lowest = max(self.priorities.values()) + 1
+        self.poll_interval = poll_interval
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self._queues = [OrderedDict() for _ in range(self.lowest + 1)]
+        self._waiting = 0
+        self._cond = threading.Condition()
+
+        metrics = metrics or MetricsRegistry()
+        self._wait = metrics.histogram(
+            "llm_queue_wait_seconds", "Time an LLM call waited for rate-limit capacity", ["agent"],
+            buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60))
+        self._pauses = metrics.counter("llm_rate_limit_pauses_total", "429 responses that paused the scheduler")
+        metrics.gauge("llm_queue_waiting", "LLM calls queued for rate-limit capacity, per priority class",
+                      self._waiting_by_priority, ["priority"])
+
+    # Everything below with a leading underscore expects self._cond to be held
+
+    def _take(self, tokens):
+        """Take capacity for one call and return 0, or return the seconds to wait."""
+        now = time.monotonic()
+        wait = max(0.0, self._paused_until - now)
+        for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+            if bucket is not None:
+                bucket.refill(now)
+                wait = max(wait, bucket.shortfall(amount))
+        if wait > 0:
+            return wait
+        if self._requests is not None:
+            self._requests.level -= 1
+        if self._tokens is not None:
+            self._tokens.level -= tokens
+        return 0.0
+
+    def _head(self):
+        for queue in self._queues:
+            if queue:
+                return next(iter(queue.values()))[0]
+        return None
+
+    def _enqueue(self, waiter):
+        self._queues[waiter.priority].setdefault(waiter.session, deque()).append(waiter)
+        self._waiting += 1
+
+    def _dequeue(self, waiter):
+        queue = self._queues[waiter.priority]
+        waiters = queue.pop(waiter.session)
+        waiters.remove(waiter)
+        if waiters:
+            # Back of the line: the next session in this class goes first
+            queue[waiter.session] = waiters
+        self._waiting -= 1
+        self._cond.notify_all()
+
+    def _waiter(self, agent, tokens):
+        return _Waiter(self.priorities.get(agent, self.lowest), _current_session.get(), tokens)
+
+    def acquire(self, agent, tokens):
+        """Block until the call may be sent; returns the seconds spent waiting."""
+        start = time.monotonic()
+        with self._cond:
+            if not self._waiting and self._take(tokens) == 0:
+                self._wait.observe(0, agent=agent)
+                return 0.0
+            waiter = self._waiter(agent, tokens)
+            self._enqueue(waiter)
+            try:
+                while True:
+                    wait = None
+                    if self._head() is waiter:
+                        wait = self._take(tokens)
+                        if wait == 0:
+                            break
+                    # Non-head waiters sleep until the queue moves; async heads poll, so cap the nap
+                    self._cond.wait(min(wait, 1.0) if wait is not None else 1.0)
+            finally:
+                self._dequeue(waiter)
+        waited = time.monotonic() - start
+        self._wait.observe(waited, agent=agent)
+        return waited
+
+    async def acquire_async(self, agent, tokens):
+        """acquire() for coroutines: polls instead of blocking the event loop."""
+        start = time.monotonic()
+        with self._cond:
+            if not self._waiting and self._take(tokens) == 0:
+                self._wait.observe(0, agent=agent)
+                return 0.0
+            waiter = self._waiter(agent, tokens)
+            self._enqueue(waiter)
+        try:
+            while True:
+                with self._cond:
+                    wait = self.poll_interval
+                    if self._head() is waiter:
+                        wait = self._take(tokens)
+                        if wait == 0:
+                            break
+                await asyncio.sleep(min(max(wait, self.poll_interval), 1.0))
+        finally:
+            with self._cond:
+                self._dequeue(waiter)
+        waited = time.monotonic() - start
+        self._wait.observe(waited, agent=agent)
+        return waited
+
+    def settle(self, estimated, actual):
+        """Correct the token bucket once a call reports its real usage."""
+        if self._tokens is None or not actual:
+            return
+        with self._cond:
+            self._tokens.level = min(self._tokens.capacity, self._tokens.level + estimated - actual)
+
+    def pause(self, seconds):
+        """Hold every admission for `seconds` (the server said it is rate limiting us)."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._pauses.inc()
+
+    def _waiting_by_priority(self):
+        with self._cond:
+            return {(str(priority),): sum(len(waiters) for waiters in queue.values())
+                    for priority, queue in enumerate(self._queues) if queue}
@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by entry count and, optionally, total size.
+
+    `sizeof` returns the cost of a value (defaults to len()); entries are evicted least
+    recently used first until both limits are satisfied. With `ttl` (seconds) an entry also
+    expires that long after it was stored, and reads of an expired entry count as misses.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=None, sizeof=len, ttl=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._expires = {}
+        self._total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _expired(self, key):
+        # Caller holds self._lock; drops the entry if its ttl has passed
+        if self.ttl is None or self._expires[key] > time.monotonic():
+            return False
+        del self._data[key]
+        self._total -= self._sizes.pop(key)
+        del self._expires[key]
+        return True
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data or self._expired(key):
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._total -= self._sizes[key]
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._sizes[key] = size
+            self._expires[key] = time.monotonic() + self.ttl if self.ttl is not None else None
+            self._total += size
+            while self._data and (
+                len(self._data) > self.max_entries
+                or (self.max_bytes is not None and self._total > self.max_bytes)
+            ):
+                old_key, _ = self._data.popitem(last=False)
+                self._total -= self._sizes.pop(old_key)
+                del self._expires[old_key]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data and not self._expired(key)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._data), "size": self._total, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,197 @@
+import bisect
+import threading
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _ShardedMetric:
+    """
+    Base for metrics whose hot path takes no lock.
+
+    Every thread writes to its own shard (a dict keyed by label values), so increments are
+    plain dict updates by a single writer. Collection sums the shards; shards of threads that
+    have exited are folded into `_retired` so per-request threads do not accumulate.
+    """
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            self._local.shard = shard
+            with self._lock:
+                self._sweep()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _sweep(self):
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                self._merge(self._retired, dict(shard))
+        self._shards = alive
+
+    def _snapshot(self):
+        with self._lock:
+            self._sweep()
+            totals = {}
+            self._merge(totals, self._retired)
+            for _, shard in self._shards:
+                # dict() copies in one step under the GIL, so a concurrent writer cannot tear it
+                self._merge(totals, dict(shard))
+        return totals
+
+    def _merge(self, into, shard):
+        raise NotImplementedError
+
+    def render(self):
+        raise NotImplementedError
+
+
+class Counter(_ShardedMetric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def _merge(self, into, shard):
+        for key, value in shard.items():
+            into[key] = into.get(key, 0) + value
+
+    def value(self, **labels):
+        return self._snapshot().get(self._key(labels), 0)
+
+    def render(self):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._snapshot().items())]
+
+
+class Histogram(_ShardedMetric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        slots = shard.get(key)
+        if slots is None:
+            # One count per bucket, then +Inf, then the running sum
+            slots = shard[key] = [0] * (len(self.buckets) + 2)
+        slots[bisect.bisect_left(self.buckets, value)] += 1
+        slots[-1] += value
+
+    def _merge(self, into, shard):
+        for key, slots in shard.items():
+            slots = list(slots)
+            if key in into:
+                into[key] = [a + b for a, b in zip(into[key], slots)]
+            else:
+                into[key] = slots
+
+    def render(self):
+        lines = []
+        for key, slots in sorted(self._snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), slots[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, [("le", _format_value(float(bound)))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(float(slots[-1]))}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """A value read at scrape time from `fn`, which returns a number or {label tuple: number}."""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, fn, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.fn = fn
+        self.labelnames = tuple(labelnames)
+
+    def render(self):
+        value = self.fn()
+        if not isinstance(value, dict):
+            return [f"{self.name} {_format_value(value)}"]
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(item)}"
+                for key, item in sorted(value.items())]
+
+
+class MetricsRegistry:
+    """
+    In-process metrics rendered in the Prometheus text exposition format.
+
+    Asking for an existing name returns the metric already registered, so components that share
+    a registry can declare the metrics they use without coordinating.
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, name, factory):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = factory()
+            return self._metrics[name]
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(name, lambda: Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(name, lambda: Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, fn, labelnames=()):
+        return self._register(name, lambda: Gauge(name, documentation, fn, labelnames))
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
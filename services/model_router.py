@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import deque
+
+from services.metrics import MetricsRegistry
+
+
+def rolling_percentile(samples, pct):
+    """Nearest-rank percentile of a small window of samples."""
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))]
+
+
+class ModelRouter:
+    """
+    Picks the model (and max_tokens) for each agent's calls.
+
+    `routes` maps an agent to {"model", "max_tokens", "slo_ms", "fallback"}, all optional; an
+    agent without a model keeps the one its request names. The router keeps each (agent, model)'s
+    last `window` latencies. When an agent's primary model has at least `min_samples` of them
+    and their `percentile` is above the agent's SLO, the agent is switched to its fallback model
+    for `cooldown` seconds. After that the primary starts over with an empty window, so it has
+    to breach the SLO again to be dropped.
+    """
+
+    def __init__(self, routes=None, window=50, min_samples=10, percentile=90, cooldown=60.0, metrics=None):
+        self.routes = routes or {}
+        self.window = window
+        self.min_samples = min(min_samples, window)
+        self.percentile = percentile
+        self.cooldown = cooldown
+        self._samples = {}
+        self._primary = {}
+        self._degraded_until = {}
+        self._lock = threading.Lock()
+
+        metrics = metrics or MetricsRegistry()
+        self._decisions = metrics.counter(
+            "llm_route_decisions_total", "Model chosen for each LLM call", ["agent", "model", "decision"])
+        self._switches = metrics.counter(
+            "llm_route_slo_breaches_total", "Times an agent was moved to its fallback model for breaching its SLO", ["agent"])
+        metrics.gauge("llm_route_degraded", "1 while an agent is routed to its fallback model", self._degraded_states, ["agent"])
+        metrics.gauge("llm_route_rolling_latency_seconds", "Rolling latency percentile the SLO is checked against",
+                      self._rolling_latencies, ["agent", "model"])
+
+    def route(self, agent, kwargs):
+        """Return (request kwargs with the routed model and max_tokens, decision)."""
+        config = self.routes.get(agent, {})
+        primary = config.get("model") or kwargs.get("model")
+        fallback = config.get("fallback")
+        model, decision = primary, "primary"
+        now = time.monotonic()
+        with self._lock:
+            self._primary[agent] = primary
+            degraded_until = self._degraded_until.get(agent)
+            if fallback and fallback != primary and degraded_until is not None:
+                if now < degraded_until:
+                    model, decision = fallback, "slo_fallback"
+                else:
+                    # Cooldown over: give the primary a clean window
+                    del self._degraded_until[agent]
+                    self._samples.pop((agent, primary), None)
+
+        routed = dict(kwargs, model=model)
+        if config.get("max_tokens") and "max_tokens" not in kwargs:
+            routed["max_tokens"] = config["max_tokens"]
+        self._decisions.inc(agent=agent, model=model or "", decision=decision)
+        return routed, decision
+
+    def observe(self, agent, model, latency_ms):
+        """Feed a successful call's latency; may move the agent to its fallback model."""
+        config = self.routes.get(agent, {})
+        slo_ms = config.get("slo_ms")
+        with self._lock:
+            samples = self._samples.get((agent, model))
+            if samples is None:
+                samples = self._samples[(agent, model)] = deque(maxlen=self.window)
+            samples.append(latency_ms)
+            if (not slo_ms or not config.get("fallback") or model != self._primary.get(agent)
+                    or agent in self._degraded_until or len(samples) < self.min_samples):
+                return
+            if rolling_percentile(samples, self.percentile) <= slo_ms:
+                return
+            self._degraded_until[agent] = time.monotonic() + self.cooldown
+        self._switches.inc(agent=agent)
+
+    def snapshot(self):
+        """Per-agent routing state: models, SLO, rolling latency and whether the fallback is in use."""
+        now = time.monotonic()
+        with self._lock:
+            state = {}
+            for agent, config in self.routes.items():
+                primary = config.get("model") or self._primary.get(agent)
+                samples = self._samples.get((agent, primary))
+                degraded_until = self._degraded_until.get(agent)
+                state[agent] = {
+                    "model": primary,
+                    "fallback": config.get("fallback"),
+                    "slo_ms": config.get("slo_ms"),
+                    "max_tokens": config.get("max_tokens"),
+                    f"p{self.percentile}_ms": round(rolling_percentile(samples, self.percentile), 1) if samples else None,
+                    "degraded": degraded_until is not None and now < degraded_until
+                }
+            return state
+
+    def _degraded_states(self):
+        now = time.monotonic()
+        with self._lock:
+            return {(agent,): int(until > now) for agent, until in self._degraded_until.items()}
+
+    def _rolling_latencies(self):
+        with self._lock:
+            return {(agent, model or ""): rolling_percentile(samples, self.percentile) / 1000
+                    for (agent, model), samples in self._samples.items() if samples}
@@ -0,0 +1,208 @@
+import hashlib
+import signal
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+from services.lru_cache import LRUCache
+from services.metrics import MetricsRegistry
+
+
+class ExtractionError(Exception):
+    pass
+
+
+def extract_text(data):
+    """Parse a PDF and concatenate the text of every page. Runs inside a worker process."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(BytesIO(data))
+    return "".join([p.extract_text() or "" for p in reader.pages])
+
+
+def reset_worker_signals():
+    """
+    Pool initializer. Forked workers inherit the server's Python-level SIGTERM/SIGINT handlers
+    (uvicorn's only set a flag), which would leave them running after the server is stopped.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class ResumeExtractor:
+    """
+    Background resume text extraction with a content-addressed cache.
+
+    Uploads are keyed by the SHA-256 of the file, so re-uploading the same resume (or reusing it
+    across roles) is answered from the LRU cache without parsing. Misses are parsed in a process
+    pool; each document has a deadline after which it is reported as failed. A document still
+    parsing at its deadline would keep its worker busy, so the pool is killed and rebuilt, and the
+    other documents it was parsing are resubmitted to the new one.
+    """
+
+    def __init__(self, max_workers=2, timeout=20, cache_entries=256, cache_bytes=32 * 1024 * 1024, max_jobs=1024,
+                 metrics=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = LRUCache(max_entries=cache_entries, max_bytes=cache_bytes)
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._pool = None
+
+        metrics = metrics or MetricsRegistry()
+        self._duration = metrics.histogram(
+            "pdf_extraction_duration_seconds", "Resume extraction time from submit to parsed text (queueing included)")
+        self._outcomes = metrics.counter("pdf_extractions_total", "Resume uploads by outcome", ["result"])
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=reset_worker_signals)
+        return self._pool
+
+    def submit(self, data):
+        """Start extracting `data` (PDF bytes) and return a job id."""
+        digest = hashlib.sha256(data).hexdigest()
+        job = {"task": None, "text": None, "error": None}
+
+        cached = self.cache.get(digest)
+        with self._lock:
+            if cached is not None:
+                job["text"] = cached
+                self._outcomes.inc(result="cache_hit")
+            elif digest in self._inflight:
+                # Same document is already being parsed; share that work
+                job["task"] = self._inflight[digest]
+                self._outcomes.inc(result="shared")
+            else:
+                task = {"digest": digest, "data": data, "future": None, "timed_out": False,
+                        "deadline": time.monotonic() + self.timeout, "submitted": time.perf_counter()}
+                self._start(task)
+                self._inflight[digest] = task
+                job["task"] = task
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = job
+            self._evict()
+        return job_id
+
+    def _evict(self):
+        """Drop the oldest finished jobs beyond max_jobs; pending ones are kept until they settle."""
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        finished = [job_id for job_id, job in self._jobs.items()
+                    if job["task"] is None or job["task"]["timed_out"] or job["task"]["future"].done()]
+        for job_id in finished[:excess]:
+            del self._jobs[job_id]
+
+    def _start(self, task):
+        """Parse the task's document on the current pool. Called with the lock held."""
+        try:
+            future = self._executor().submit(extract_text, task["data"])
+        except BrokenProcessPool:
+            self._pool = None
+            future = self._executor().submit(extract_text, task["data"])
+        task["future"] = future
+        future.add_done_callback(lambda f, t=task: self._on_done(t, f))
+
+    def _on_done(self, task, future):
+        with self._lock:
+            # A future replaced by a resubmission (or given up on at the deadline) is not the outcome
+            if future is not task["future"] or task["timed_out"]:
+                return
+            if self._inflight.get(task["digest"]) is task:
+                del self._inflight[task["digest"]]
+            task["data"] = None
+        self._duration.observe(time.perf_counter() - task["submitted"])
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(task["digest"], future.result())
+            self._outcomes.inc(result="parsed")
+        else:
+            self._outcomes.inc(result="failed")
+
+    def _time_out(self, task):
+        """
+        Give up on a task past its deadline. Its worker is still parsing it, so the pool is
+        replaced: documents also past their deadline fail with it, the rest are resubmitted
+        with a fresh deadline (they lost their time queueing behind it).
+        """
+        with self._lock:
+            if task["timed_out"] or task["future"].done():
+                return
+            now = time.monotonic()
+            pool, self._pool = self._pool, None
+            for other in [task] + [t for t in self._inflight.values() if t is not task and not t["future"].done()]:
+                if other["deadline"] <= now:
+                    other["timed_out"] = True
+                    other["data"] = None
+                    if self._inflight.get(other["digest"]) is other:
+                        del self._inflight[other["digest"]]
+                    self._outcomes.inc(result="timed_out")
+                else:
+                    other["deadline"] = now + self.timeout
+                    self._start(other)
+        if pool is not None:
+            # ProcessPoolExecutor has no public way to stop a running call
+            for process in list((getattr(pool, "_processes", None) or {}).values()):
+                process.terminate()
+            pool.shutdown(wait=False)
+
+    def status(self, job_id):
+        """Return {"status": "pending" | "ready" | "failed", ...} for a job."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return {"status": "failed", "error": "Unknown job"}
+        self._poll(job)
+        if job["text"] is not None:
+            return {"status": "ready", "characters": len(job["text"])}
+        if job["error"] is not None:
+            return {"status": "failed", "error": job["error"]}
+        return {"status": "pending"}
+
+    def result(self, job_id):
+        """Wait for a job (up to its deadline) and return the text, or raise ExtractionError."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise ExtractionError("Unknown job")
+        while job["text"] is None and job["error"] is None:
+            task = job["task"]
+            future = task["future"]
+            if task["timed_out"]:
+                job["error"] = "Timed out reading resume"
+                break
+            try:
+                job["text"] = future.result(timeout=max(0, task["deadline"] - time.monotonic()))
+            except FutureTimeoutError:
+                self._time_out(task)
+            except Exception as e:
+                if future is task["future"]:
+                    job["error"] = str(e) or type(e).__name__
+                # Otherwise the pool was recycled under it and the document resubmitted; wait again
+        if job["error"] is not None:
+            raise ExtractionError(job["error"])
+        return job["text"]
+
+    def _poll(self, job):
+        if job["text"] is not None or job["error"] is not None:
+            return
+        task = job["task"]
+        future = task["future"]
+        if task["timed_out"]:
+            job["error"] = "Timed out reading resume"
+        elif future.done():
+            try:
+                job["text"] = future.result()
+            except Exception as e:
+                if future is task["future"]:
+                    job["error"] = str(e) or type(e).__name__
+        elif time.monotonic() > task["deadline"]:
+            self._time_out(task)
+            job["error"] = "Timed out reading resume"
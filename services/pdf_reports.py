@@ -0,0 +1,289 @@
+import hashlib
+import json
+import math
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+from services.lru_cache import LRUCache
+from services.metrics import MetricsRegistry
+from services.pdf_extraction import reset_worker_signals
+
+# Optional PDF export (requires reportlab)
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+
+
+class RenderError(Exception):
+    pass
+
+
+_styles = None
+
+
+def report_styles():
+    """The report's paragraph and table styles, built once per process."""
+    global _styles
+    if _styles is None:
+        sample = getSampleStyleSheet()
+        _styles = {
+            "normal": sample['Normal'],
+            "title": ParagraphStyle(
+                'CustomTitle',
+                parent=sample['Heading1'],
+                fontSize=24,
+                textColor=colors.HexColor('#9333ea'),
+                spaceAfter=30,
+                alignment=TA_CENTER
+            ),
+            "heading": ParagraphStyle(
+                'CustomHeading',
+                parent=sample['Heading2'],
+                fontSize=16,
+                textColor=colors.HexColor('#a855f7'),
+                spaceAfter=12
+            ),
+            "summary_table": TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#9333ea')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 12),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#1f2937')),
+                ('TEXTCOLOR', (0, 1), (-1, -1), colors.whitesmoke),
+                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#4b5563')),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#1f2937'), colors.HexColor('#111827')])
+            ])
+        }
+    return _styles
+
+
+def init_render_worker():
+    """Pool initializer: reset inherited signal handlers and build the styles up front."""
+    reset_worker_signals()
+    report_styles()
+
+
+def render_report(feedback_text, analytics, role, generated_on):
+    """Build the feedback report PDF and return its bytes. Runs inside a worker process."""
+    styles = report_styles()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+    story = []
+
+    # Title
+    story.append(Paragraph(f"{role} Interview Feedback Report", styles['title']))
+    story.append(Spacer(1, 0.2*inch))
+    story.append(Paragraph(f"Generated on {generated_on}", styles['normal']))
+    story.append(Spacer(1, 0.3*inch))
+
+    # Analytics Summary
+    if analytics:
+        story.append(Paragraph("Performance Summary", styles['heading']))
+        summary_data = [
+            ['Metric', 'Value'],
+            ['Total Questions', str(analytics.get('total_questions', 0))],
+            ['Average Score', f"{analytics.get('average_score', 0):.1f}%"],
+            ['Highest Score', f"{analytics.get('highest_score', 0):.1f}%"],
+            ['Lowest Score', f"{analytics.get('lowest_score', 0):.1f}%"],
+        ]
+        if analytics.get('edge_cases_count', 0) > 0:
+            summary_data.append(['Edge Cases Detected', str(analytics.get('edge_cases_count', 0))])
+
+        summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
+        summary_table.setStyle(styles['summary_table'])
+        story.append(summary_table)
+        story.append(Spacer(1, 0.3*inch))
+
+    # Feedback Content
+    story.append(Paragraph("Detailed Feedback", styles['heading']))
+    # Simple text formatting for feedback
+    feedback_paragraphs = feedback_text.split('\n\n')
+    for para in feedback_paragraphs:
+        if para.strip():
+            # Remove markdown formatting for PDF
+            clean_para = para.replace('**', '').replace('#', '').replace('|', ' ')
+            if clean_para.strip().startswith('##'):
+                clean_para = clean_para.replace('##', '').strip()
+                story.append(Paragraph(clean_para, styles['heading']))
+            elif clean_para.strip().startswith('#'):
+                clean_para = clean_para.replace('#', '').strip()
+                story.append(Paragraph(clean_para, styles['heading']))
+            else:
+                story.append(Paragraph(clean_para, styles['normal']))
+            story.append(Spacer(1, 0.1*inch))
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def report_key(feedback_text, analytics, role):
+    """Content hash identifying a report; also used as its ETag."""
+    payload = json.dumps([feedback_text, analytics, role], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ReportRenderer:
+    """
+    PDF feedback reports rendered in a process pool and cached by content.
+
+    Reports are keyed by report_key(feedback, analytics, role), so exporting the same feedback
+    again is answered from the LRU cache, and concurrent exports of one report share a single
+    render. The cached PDF keeps the generation date of its first render. A render still running
+    past its deadline would keep its worker busy, so, as in ResumeExtractor, the pool is killed
+    and rebuilt and the other reports it was rendering are resubmitted to the new one.
+    """
+
+    def __init__(self, max_workers=2, timeout=30, cache_entries=256, cache_bytes=64 * 1024 * 1024, metrics=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = LRUCache(max_entries=cache_entries, max_bytes=cache_bytes)
+        self._inflight = {}
+        # Reentrant: a done-callback can run inline on the thread that registers it
+        self._lock = threading.RLock()
+        self._pool = None
+
+        metrics = metrics or MetricsRegistry()
+        self._duration = metrics.histogram(
+            "pdf_report_duration_seconds", "Feedback report render time from submit to PDF bytes (queueing included)")
+        self._outcomes = metrics.counter("pdf_reports_total", "Feedback report exports by outcome", ["result"])
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_render_worker)
+        return self._pool
+
+    def cached(self, key):
+        return self.cache.get(key)
+
+    def submit(self, feedback_text, analytics, role, generated_on, timeout=None):
+        """
+        Start rendering (or reuse a cached/in-flight render); returns (key, task or bytes).
+        A shared render's deadline is pushed out to cover this caller's `timeout` as well.
+        """
+        key = report_key(feedback_text, analytics, role)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._outcomes.inc(result="cache_hit")
+            return key, cached
+
+        deadline = time.monotonic() + (timeout or self.timeout)
+        with self._lock:
+            task = self._inflight.get(key)
+            if task is not None:
+                task["deadline"] = max(task["deadline"], deadline)
+                self._outcomes.inc(result="shared")
+                return key, task
+            task = {"key": key, "args": (feedback_text, analytics, role, generated_on), "future": None,
+                    "timed_out": False, "deadline": deadline, "submitted": time.perf_counter()}
+            self._start(task)
+            self._inflight[key] = task
+        return key, task
+
+    def _start(self, task):
+        """Render the task's report on the current pool. Called with the lock held."""
+        try:
+            future = self._executor().submit(render_report, *task["args"])
+        except BrokenProcessPool:
+            self._pool = None
+            future = self._executor().submit(render_report, *task["args"])
+        task["future"] = future
+        future.add_done_callback(lambda f, t=task: self._on_done(t, f))
+
+    def _on_done(self, task, future):
+        with self._lock:
+            # A future replaced by a resubmission (or given up on at the deadline) is not the outcome
+            if future is not task["future"] or task["timed_out"]:
+                return
+            if self._inflight.get(task["key"]) is task:
+                del self._inflight[task["key"]]
+            task["args"] = None
+        self._duration.observe(time.perf_counter() - task["submitted"])
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(task["key"], future.result())
+            self._outcomes.inc(result="rendered")
+        else:
+            self._outcomes.inc(result="failed")
+
+    def _time_out(self, task):
+        """
+        Give up on a render past its deadline. Its worker is still busy with it, so the pool is
+        replaced: renders also past their deadline fail with it, the rest are resubmitted with a
+        fresh deadline (they lost their time queueing behind it).
+        """
+        with self._lock:
+            now = time.monotonic()
+            if task["timed_out"] or task["future"].done() or task["deadline"] > now:
+                return
+            pool, self._pool = self._pool, None
+            for other in [task] + [t for t in self._inflight.values() if t is not task and not t["future"].done()]:
+                if other["deadline"] <= now:
+                    other["timed_out"] = True
+                    other["args"] = None
+                    if self._inflight.get(other["key"]) is other:
+                        del self._inflight[other["key"]]
+                    self._outcomes.inc(result="timed_out")
+                else:
+                    other["deadline"] = now + self.timeout
+                    self._start(other)
+        if pool is not None:
+            # ProcessPoolExecutor has no public way to stop a running call
+            for process in list((getattr(pool, "_processes", None) or {}).values()):
+                process.terminate()
+            pool.shutdown(wait=False)
+
+    def _wait(self, pending, deadline):
+        if isinstance(pending, bytes):
+            return pending
+        task = pending
+        while True:
+            if task["timed_out"]:
+                raise RenderError("Timed out rendering report")
+            future = task["future"]
+            try:
+                return future.result(timeout=max(0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                # Only kills the render if no other caller is still within its deadline
+                self._time_out(task)
+                raise RenderError("Timed out rendering report")
+            except Exception as e:
+                if future is task["future"]:
+                    raise RenderError(str(e) or type(e).__name__)
+                # Otherwise the pool was recycled under it and the report resubmitted; wait again
+
+    def render(self, feedback_text, analytics, role, generated_on):
+        """Return (key, pdf bytes), or raise RenderError."""
+        key, pending = self.submit(feedback_text, analytics, role, generated_on)
+        return key, self._wait(pending, time.monotonic() + self.timeout)
+
+    def render_many(self, reports, generated_on):
+        """
+        Render several reports in parallel. `reports` is a list of (feedback, analytics, role);
+        returns a list of (key, pdf bytes or None, error or None) in the same order.
+
+        The per-report timeout is scaled by how many rounds the pool needs for the batch, so a
+        large export of quick reports does not time out just for queueing.
+        """
+        rounds = max(1, math.ceil(len(reports) / self.max_workers))
+        timeout = self.timeout * rounds
+        deadline = time.monotonic() + timeout
+        submitted = [self.submit(feedback_text, analytics, role, generated_on, timeout)
+                     for feedback_text, analytics, role in reports]
+        results = []
+        for key, pending in submitted:
+            try:
+                results.append((key, self._wait(pending, deadline), None))
+            except RenderError as e:
+                results.append((key, None, str(e)))
+        return results
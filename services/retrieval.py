@@ -0,0 +1,80 @@
+import heapq
+import math
+import re
+from collections import Counter
+
+TOKEN = re.compile(r"[a-z0-9+#]+")
+
+STOPWORDS = frozenset((
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "did", "do", "does", "for", "from", "had", "has", "have",
+    "how", "i", "in", "is", "it", "its", "me", "my", "of", "on", "or", "our", "so", "that", "the", "their", "this",
+    "to", "was", "we", "were", "what", "when", "which", "who", "why", "will", "with", "would", "you", "your",
+))
+
+
+# Longest first; enough stemming for "idempotent"/"idempotency" or "cache"/"caching" to meet
+SUFFIXES = ("ations", "ation", "ency", "ence", "ing", "ent", "ies", "ed", "es", "ly", "s")
+
+
+def stem(token):
+    if len(token) > 4:
+        for suffix in SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+                return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text):
+    return [stem(token) for token in TOKEN.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a small set of text chunks (one resume and one JD).
+
+    `chunks` are dicts with at least a "text" key. The per-(term, chunk) weight does not
+    depend on the query, so it is computed once here and search() only sums the postings
+    of the query's terms.
+    """
+
+    def __init__(self, chunks, k1=1.2, b=0.75):
+        self.chunks = list(chunks)
+        frequencies = [Counter(tokenize(chunk["text"])) for chunk in self.chunks]
+        lengths = [sum(tf.values()) for tf in frequencies]
+        avg_length = (sum(lengths) / len(lengths)) if lengths and sum(lengths) else 1.0
+
+        postings = {}
+        for i, tf in enumerate(frequencies):
+            for term, count in tf.items():
+                postings.setdefault(term, []).append((i, count))
+
+        total = len(self.chunks)
+        self._weights = {}
+        for term, docs in postings.items():
+            idf = math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+            self._weights[term] = [
+                (i, idf * count * (k1 + 1) / (count + k1 * (1 - b + b * lengths[i] / avg_length)))
+                for i, count in docs
+            ]
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def search(self, query, k=5):
+        """Up to `k` (chunk, score) pairs sharing at least one term with `query`, best first."""
+        scores = {}
+        for term in set(tokenize(query)):
+            for i, weight in self._weights.get(term, ()):
+                scores[i] = scores.get(i, 0.0) + weight
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(self.chunks[i], score) for i, score in best]
+
+    def select(self, query, k, max_tokens, cost=lambda text: len(text) // 4 + 1):
+        """Chunks from the top `k` for `query`, best first, skipping any that would take the total past `max_tokens`."""
+        picked, used = [], 0
+        for chunk, _ in self.search(query, k):
+            size = cost(chunk["text"])
+            if used + size <= max_tokens:
+                picked.append(chunk)
+                used += size
+        return picked, used
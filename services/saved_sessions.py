@@ -0,0 +1,221 @@
+import atexit
+import base64
+import json
+import logging
+import sqlite3
+import threading
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saved_sessions (
+    session_id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    role TEXT NOT NULL DEFAULT '',
+    question_count INTEGER NOT NULL DEFAULT 0,
+    average_score REAL NOT NULL DEFAULT 0,
+    duration REAL NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_saved_sessions_timestamp ON saved_sessions (timestamp DESC, session_id DESC);
+CREATE INDEX IF NOT EXISTS idx_saved_sessions_role ON saved_sessions (role, timestamp DESC, session_id DESC);
+CREATE INDEX IF NOT EXISTS idx_saved_sessions_score ON saved_sessions (average_score);
+"""
+
+logger = logging.getLogger(__name__)
+
+INSERT = (
+    "INSERT OR REPLACE INTO saved_sessions "
+    "(session_id, timestamp, role, question_count, average_score, duration, data) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+SUMMARY_FIELDS = ("session_id", "timestamp", "role", "question_count", "average_score", "duration")
+
+
+def encode_cursor(timestamp, session_id):
+    return base64.urlsafe_b64encode(json.dumps([timestamp, session_id]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return (timestamp, session_id) from an opaque cursor, raising ValueError if malformed."""
+    try:
+        timestamp, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(timestamp), str(session_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+class SavedSessionStore:
+    """
+    Durable store for saved interview sessions, backed by SQLite in WAL mode.
+
+    save() only queues the row; a background writer commits queued rows in batches so the
+    request thread never waits on fsync. Queued rows are visible to load() and list()
+    immediately. Listing uses keyset pagination over the (timestamp, session_id) index, so
+    each page costs the same regardless of how many sessions are stored.
+    """
+
+    def __init__(self, path, batch_size=64, flush_interval=0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flushed = threading.Condition(self._pending_lock)
+        self._closed = False
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+        self._writer = threading.Thread(target=self._write_loop, name="saved-sessions-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def save(self, session_data):
+        """Queue a session for writing; returns without touching the disk."""
+        with self._pending_lock:
+            self._pending[session_data["session_id"]] = session_data
+            queued = len(self._pending)
+        if queued >= self.batch_size:
+            self._wakeup.set()
+
+    def load(self, session_id):
+        with self._pending_lock:
+            if session_id in self._pending:
+                return self._pending[session_id]
+        row = self._connection().execute(
+            "SELECT data FROM saved_sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def list(self, limit=50, cursor=None, role=None, min_score=None, max_score=None):
+        """
+        Return (sessions, next_cursor), newest first.
+
+        Filters are optional; next_cursor is None on the last page.
+        """
+        clauses, params = [], []
+        after = decode_cursor(cursor) if cursor else None
+        if after:
+            clauses.append("(timestamp < ? OR (timestamp = ? AND session_id < ?))")
+            params.extend([after[0], after[0], after[1]])
+        if role:
+            clauses.append("role = ?")
+            params.append(role)
+        if min_score is not None:
+            clauses.append("average_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("average_score <= ?")
+            params.append(max_score)
+
+        query = f"SELECT {', '.join(SUMMARY_FIELDS)} FROM saved_sessions"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY timestamp DESC, session_id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        rows = {row["session_id"]: dict(row) for row in self._connection().execute(query, params)}
+
+        # Merge rows still waiting for the writer so a save is listed straight away
+        with self._pending_lock:
+            pending = list(self._pending.values())
+        for data in pending:
+            summary = {field: data.get(field) for field in SUMMARY_FIELDS}
+            if after and (summary["timestamp"], summary["session_id"]) >= after:
+                continue
+            if role and summary["role"] != role:
+                continue
+            if min_score is not None and summary["average_score"] < min_score:
+                continue
+            if max_score is not None and summary["average_score"] > max_score:
+                continue
+            rows[summary["session_id"]] = summary
+
+        sessions = sorted(rows.values(), key=lambda s: (s["timestamp"], s["session_id"]), reverse=True)
+        next_cursor = None
+        if len(sessions) > limit:
+            sessions = sessions[:limit]
+            next_cursor = encode_cursor(sessions[-1]["timestamp"], sessions[-1]["session_id"])
+        return sessions, next_cursor
+
+    def flush(self):
+        """Block until everything queued so far has been committed."""
+        self._wakeup.set()
+        with self._pending_lock:
+            while self._pending and not self._closed:
+                self._flushed.wait(timeout=self.flush_interval)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._writer.join(timeout=5)
+
+    def _write_loop(self):
+        conn = self._connection()
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            with self._pending_lock:
+                batch = list(self._pending.values())
+            if batch:
+                try:
+                    self._write(conn, batch)
+                except Exception:
+                    # Keep the writer alive; the rows stay queued for the next cycle
+                    logger.exception("Saved-session writer failed; %d rows left queued", len(batch))
+                else:
+                    with self._pending_lock:
+                        for data in batch:
+                            # Only drop rows that were not re-saved while we were writing
+                            if self._pending.get(data["session_id"]) is data:
+                                del self._pending[data["session_id"]]
+                        self._flushed.notify_all()
+            if self._closed:
+                with self._pending_lock:
+                    if not self._pending:
+                        return
+
+    def _write(self, conn, batch):
+        """
+        Commit `batch` in one transaction. If that fails, the rows are written one by one and any
+        row that still fails is logged and dropped, so one bad row cannot hold up the others.
+        """
+        try:
+            with conn:
+                conn.executemany(INSERT, [self._row(data) for data in batch])
+            return
+        except Exception:
+            logger.exception("Saved-session batch of %d rows failed; retrying row by row", len(batch))
+        for data in batch:
+            try:
+                with conn:
+                    conn.execute(INSERT, self._row(data))
+            except Exception:
+                logger.exception("Dropping saved session %r that could not be written", data.get("session_id"))
+
+    @staticmethod
+    def _row(data):
+        return (
+            data["session_id"],
+            data.get("timestamp", ""),
+            data.get("role", ""),
+            data.get("question_count", 0),
+            data.get("average_score", 0),
+            data.get("duration", 0),
+            json.dumps(data)
+        )
@@ -0,0 +1,160 @@
+import math
+from array import array
+
+
+# Score bands used by the feedback analytics, as (name, exclusive upper bound)
+SCORE_BUCKETS = (
+    ("needs_improvement", 50),
+    ("satisfactory", 70),
+    ("good", 90),
+    ("excellent", None),
+)
+
+
+def score_band(score):
+    """Name of the SCORE_BUCKETS band a score (or an average) falls in."""
+    for name, upper in SCORE_BUCKETS:
+        if upper is None or score < upper:
+            return name
+
+
+# Indexes into RunningScoreStats._state
+_COUNT, _MEAN, _M2, _MIN, _MAX, _EWMA, _LAST, _SLOPE = range(8)
+
+
+class RunningScoreStats:
+    """
+    Running statistics over an interview's scores, updated once per score in O(1).
+
+    Count, mean and variance use Welford's update. The trend is an exponentially weighted average
+    of the change between consecutive scores, so it follows the direction of recent answers
+    without a single outlier flipping it the way a first-vs-last comparison does. State lives in
+    two small arrays, which keeps the object compact and trivial to serialize.
+    """
+
+    __slots__ = ("alpha", "trend_threshold", "_state", "_buckets")
+
+    def __init__(self, alpha=0.5, trend_threshold=3.0):
+        self.alpha = alpha
+        self.trend_threshold = trend_threshold
+        self._state = array("d", [0.0] * 8)
+        self._buckets = array("l", [0] * len(SCORE_BUCKETS))
+
+    @classmethod
+    def from_scores(cls, scores, **kwargs):
+        stats = cls(**kwargs)
+        for score in scores:
+            stats.add(score)
+        return stats
+
+    def add(self, score):
+        state = self._state
+        score = float(score)
+        state[_COUNT] += 1
+        if state[_COUNT] == 1:
+            state[_MIN] = state[_MAX] = state[_EWMA] = score
+        else:
+            state[_MIN] = min(state[_MIN], score)
+            state[_MAX] = max(state[_MAX], score)
+            state[_EWMA] += self.alpha * (score - state[_EWMA])
+            step = score - state[_LAST]
+            state[_SLOPE] = step if state[_COUNT] == 2 else state[_SLOPE] + self.alpha * (step - state[_SLOPE])
+        state[_LAST] = score
+        delta = score - state[_MEAN]
+        state[_MEAN] += delta / state[_COUNT]
+        state[_M2] += delta * (score - state[_MEAN])
+
+        for i, (_, upper) in enumerate(SCORE_BUCKETS):
+            if upper is None or score < upper:
+                self._buckets[i] += 1
+                break
+
+    def copy(self):
+        other = RunningScoreStats(self.alpha, self.trend_threshold)
+        other._state = array("d", self._state)
+        other._buckets = array("l", self._buckets)
+        return other
+
+    def __len__(self):
+        return int(self._state[_COUNT])
+
+    @property
+    def count(self):
+        return int(self._state[_COUNT])
+
+    @property
+    def mean(self):
+        return self._state[_MEAN]
+
+    @property
+    def variance(self):
+        """Sample variance; 0 until there are two scores."""
+        count = self._state[_COUNT]
+        return self._state[_M2] / (count - 1) if count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def min(self):
+        return self._state[_MIN]
+
+    @property
+    def max(self):
+        return self._state[_MAX]
+
+    @property
+    def ewma(self):
+        return self._state[_EWMA]
+
+    def trend_delta(self):
+        """Smoothed points gained (or lost) per answer; positive when scores are rising."""
+        return self._state[_SLOPE]
+
+    def trend(self):
+        """"baseline" (fewer than two scores), "improving", "declining" or "stable"."""
+        if self.count < 2:
+            return "baseline"
+        delta = self.trend_delta()
+        if delta >= self.trend_threshold:
+            return "improving"
+        if delta <= -self.trend_threshold:
+            return "declining"
+        return "stable"
+
+    def distribution(self):
+        return {name: self._buckets[i] for i, (name, _) in enumerate(SCORE_BUCKETS)}
+
+    def summary(self):
+        """Aggregates in the shape the analytics payloads use (scores as whole numbers where they were)."""
+        return {
+            "count": self.count,
+            "average": self.mean,
+            "highest": _number(self.max),
+            "lowest": _number(self.min),
+            "stdev": round(self.stdev, 2),
+            "ewma": round(self.ewma, 2),
+            "trend": self.trend(),
+            "trend_delta": round(self.trend_delta(), 2),
+            "distribution": self.distribution()
+        }
+
+    def to_dict(self):
+        return {
+            "alpha": self.alpha,
+            "trend_threshold": self.trend_threshold,
+            "state": list(self._state),
+            "buckets": list(self._buckets)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data.get("alpha", 0.5), data.get("trend_threshold", 3.0))
+        stats._state = array("d", data["state"])
+        stats._buckets = array("l", data["buckets"])
+        return stats
+
+
+def _number(value):
+    return int(value) if float(value).is_integer() else value
@@ -0,0 +1,200 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from services.score_stats import RunningScoreStats
+
+
+def new_session_context(session_id=None):
+    """Fresh interview state for one candidate. Plain data only, so any backend can serialize it."""
+    return {
+        "resume": "",
+        "resume_job": None,
+        "resume_error": None,
+        "resume_profile": None,
+        "jd": "",
+        "jd_profile": None,
+        "context_index_key": None,
+        "selected_role": "",
+        "current_question": "Introduction",
+        "pending_question": "",
+        "interview_phase": "Introduction",
+        "question_count": 0,
+        "all_scores": [],
+        "score_stats": RunningScoreStats().to_dict(),
+        "interview_history": [],
+        "started": False,
+        "edge_cases_detected": [],
+        "red_flags_history": [],
+        "feedback_notes": [],
+        "nudges_used": {},
+        "bank_focus_used": [],
+        "history_seq": 0,
+        "conversation_window": {},
+        "start_time": None,
+        "question_times": [],
+        "session_id": session_id
+    }
+
+
+class SessionBackend:
+    """
+    Storage interface for live interview sessions.
+
+    Implementations only need to load/save whole session dicts; locking is handled by
+    SessionManager. A shared backend (Redis, database) can implement the same methods
+    to serve sessions across processes.
+    """
+
+    def load(self, session_id):
+        """Return the stored context dict, or None if the session does not exist."""
+        raise NotImplementedError
+
+    def save(self, session_id, context):
+        raise NotImplementedError
+
+    def delete(self, session_id):
+        raise NotImplementedError
+
+    def expire(self, idle_seconds):
+        """Drop sessions idle for longer than idle_seconds; returns the removed ids."""
+        raise NotImplementedError
+
+    def count(self):
+        raise NotImplementedError
+
+
+class InMemorySessionBackend(SessionBackend):
+    """Process-local backend. Contexts are kept as live dicts, so save() is just bookkeeping."""
+
+    def __init__(self):
+        self._sessions = {}
+        self._last_access = {}
+        self._lock = threading.Lock()
+
+    def load(self, session_id):
+        with self._lock:
+            context = self._sessions.get(session_id)
+            if context is not None:
+                self._last_access[session_id] = time.monotonic()
+            return context
+
+    def save(self, session_id, context):
+        with self._lock:
+            self._sessions[session_id] = context
+            self._last_access[session_id] = time.monotonic()
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._last_access.pop(session_id, None)
+
+    def expire(self, idle_seconds):
+        cutoff = time.monotonic() - idle_seconds
+        with self._lock:
+            expired = [sid for sid, ts in self._last_access.items() if ts < cutoff]
+            for sid in expired:
+                self._sessions.pop(sid, None)
+                self._last_access.pop(sid, None)
+        return expired
+
+    def count(self):
+        with self._lock:
+            return len(self._sessions)
+
+
+class SessionManager:
+    """
+    Multi-tenant session store keyed by session id, with one lock per session.
+
+    Requests for different candidates never contend; concurrent requests for the same
+    candidate are serialized so a turn always sees a consistent context.
+    """
+
+    def __init__(self, backend=None, idle_timeout=3600, purge_interval=60):
+        self.backend = backend or InMemorySessionBackend()
+        self.idle_timeout = idle_timeout
+        self.purge_interval = purge_interval
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._expired_held = set()  # Expired sessions whose lock entry was claimed at purge time
+        self._last_purge = time.monotonic()
+
+    @contextmanager
+    def _lock_for(self, session_id):
+        """
+        The session's lock. Each entry counts the callers holding or waiting for it, and the
+        purge only drops entries nobody has claimed, so two requests can never end up with
+        different locks for the same session. An entry that was claimed when its session expired
+        is dropped by its last holder instead.
+        """
+        with self._locks_guard:
+            entry = self._locks.get(session_id)
+            if entry is None:
+                entry = self._locks[session_id] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            yield entry[0]
+        finally:
+            with self._locks_guard:
+                entry[1] -= 1
+                if entry[1] == 0 and session_id in self._expired_held:
+                    self._expired_held.discard(session_id)
+                    if self._locks.get(session_id) is entry:
+                        del self._locks[session_id]
+
+    @contextmanager
+    def session(self, session_id):
+        """Lock the session, yield its context dict and write it back on exit."""
+        self._maybe_purge()
+        with self._lock_for(session_id) as lock, lock:
+            context = self.backend.load(session_id)
+            if context is None:
+                context = new_session_context(session_id)
+            yield context
+            self.backend.save(session_id, context)
+
+    @asynccontextmanager
+    async def async_session(self, session_id, poll_interval=0.005):
+        """
+        session() for coroutines. Takes the same per-session lock as the sync path (so Flask
+        and ASGI handlers stay serialized), but waits for it without blocking the event loop.
+        """
+        self._maybe_purge()
+        with self._lock_for(session_id) as lock:
+            while not lock.acquire(blocking=False):
+                await asyncio.sleep(poll_interval)
+            try:
+                context = self.backend.load(session_id)
+                if context is None:
+                    context = new_session_context(session_id)
+                yield context
+                self.backend.save(session_id, context)
+            finally:
+                lock.release()
+
+    def reset(self, session_id):
+        """Replace the session with a fresh context."""
+        with self._lock_for(session_id) as lock, lock:
+            self.backend.save(session_id, new_session_context(session_id))
+
+    def active_count(self):
+        return self.backend.count()
+
+    def _maybe_purge(self):
+        now = time.monotonic()
+        if now - self._last_purge < self.purge_interval:
+            return
+        self._last_purge = now
+        expired = self.backend.expire(self.idle_timeout)
+        with self._locks_guard:
+            for session_id in expired:
+                entry = self._locks.get(session_id)
+                if entry is None:
+                    continue
+                if entry[1] == 0:
+                    del self._locks[session_id]
+                else:
+                    # Held or handed out: those requests still use it, and the last one drops it
+                    self._expired_held.add(session_id)
@@ -0,0 +1,151 @@
+"""Build the question bank used for opening and phase-transition questions.
+
+For every role in app.AVAILABLE_ROLES (or --roles), every bank phase and every focus area of
+the role, asks the model for --per-slot question templates and writes them to the file the
+app loads (QUESTION_BANK_PATH, default question_bank.json):
+
+    python -m tools.build_question_bank --output question_bank.json --concurrency 4 --per-slot 4
+
+Templates may use the placeholders {role}, {focus_area}, {skill}, {project}, {recent_role} and
+{years}, which the app fills from the candidate's parsed resume. Entries that use anything
+else, or that do not ask a question, are dropped. Slots already in the output file are kept,
+so an interrupted run can simply be restarted; --force regenerates them. The file is rewritten
+after every slot. Uses the same GROQ_API_KEY / LLM_BASE_URL / LLM_MAX_RETRIES settings as the app.
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from agents.question_bank import FIELDS, PHASES, valid_template
+from services.agent_json import AgentJSON, field
+from services.llm_client import LLMClient
+from services.llm_scheduler import LLMScheduler
+
+PHASE_GUIDES = {
+    "Introduction": "the opening of the interview: greet the candidate as Byte, the interviewer, say what the "
+                    "interview will cover, and ask them to introduce their background",
+    "Technical": "the first technical question, moving on from the introduction: start from fundamentals of the "
+                 "focus area but ask for practical experience and trade-offs",
+    "Behavioral": "the first behavioral question: a STAR-style question (situation, task, action, result) about "
+                  "collaboration, ownership, conflict or failure",
+    "Deep_Dive": "the start of the in-depth part: an open design or architecture question about the focus area "
+                 "that invites discussion of scale, failure modes and trade-offs",
+}
+
+
+class BankBuilder:
+
+    def __init__(self, client, per_slot=4):
+        self.client = client
+        self.per_slot = per_slot
+        self.output = AgentJSON(client, "question_bank", {"questions": field(list, required=True)})
+
+    def _request(self, role_info, phase, focus_area):
+        placeholders = ", ".join("{" + name + "}" for name in FIELDS)
+        return dict(
+            model="openai/gpt-oss-20b",
+            messages=[
+                {"role": "system", "content": (
+                    "You write interview question templates for Byte, a rigorous but friendly technical interviewer. "
+                    f"Each template is one short spoken reply (2-3 sentences) ending in a question. Templates may use "
+                    f"these placeholders, which are filled in from the candidate's resume: {placeholders}. Use no "
+                    "other braces. Vary the templates: some generic, some using one or two placeholders. "
+                    'Respond with JSON: {"questions": ["...", "..."]}'
+                )},
+                {"role": "user", "content": (
+                    f"Role: {role_info['name']} - {role_info['description']}\n"
+                    f"Focus area: {focus_area}\n"
+                    f"Write {self.per_slot} templates for {PHASE_GUIDES[phase]}."
+                )}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.7
+        )
+
+    def build(self, role_info, phase, focus_area):
+        completion = self.client.complete("question_bank", **self._request(role_info, phase, focus_area))
+        questions = self.output.parse(completion.choices[0].message.content)["questions"]
+        return [question.strip() for question in questions if valid_template(question)][:self.per_slot]
+
+
+def load_bank(path):
+    if os.path.exists(path):
+        with open(path) as handle:
+            return json.load(handle)
+    return {"roles": {}}
+
+
+def save_bank(path, bank):
+    bank["generated_at"] = datetime.datetime.now().isoformat()
+    tmp = path + ".tmp"
+    with open(tmp, "w") as handle:
+        json.dump(bank, handle, indent=2)
+    os.replace(tmp, path)
+
+
+def run(args, builder, roles):
+    bank = load_bank(args.output)
+    slots = [(role_key, phase, area) for role_key in roles for phase in PHASES
+             for area in roles[role_key]["focus_areas"]
+             if args.force or not bank["roles"].get(role_key, {}).get(phase, {}).get(area)]
+    lock = threading.Lock()
+    counts = {"built": 0, "failed": 0, "kept": sum(len(r["focus_areas"]) for r in roles.values()) * len(PHASES) - len(slots)}
+
+    def work(slot):
+        role_key, phase, area = slot
+        try:
+            templates = builder.build(roles[role_key], phase, area)
+        except Exception as e:
+            templates = []
+            print(json.dumps({"slot": slot, "error": str(e) or type(e).__name__}), file=sys.stderr, flush=True)
+        with lock:
+            if templates:
+                bank["roles"].setdefault(role_key, {}).setdefault(phase, {})[area] = templates
+                save_bank(args.output, bank)
+            counts["built" if templates else "failed"] += 1
+
+    with ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="bank") as pool:
+        list(pool.map(work, slots))
+    print(json.dumps(counts), file=sys.stderr)
+    return counts
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="question_bank.json", help="Bank file to write (and resume from)")
+    parser.add_argument("--roles", help="Comma-separated role keys (default: every role)")
+    parser.add_argument("--per-slot", type=int, default=4, help="Templates per (role, phase, focus area)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Slots generated at once")
+    parser.add_argument("--rpm", type=float, help="Maximum model calls per minute")
+    parser.add_argument("--force", action="store_true", help="Regenerate slots already in the output file")
+    return parser
+
+
+def main():
+    load_dotenv()
+    args = build_parser().parse_args()
+
+    from app import AVAILABLE_ROLES  # Imported late: loading the app reads its environment
+    wanted = [key.strip() for key in args.roles.split(",")] if args.roles else list(AVAILABLE_ROLES)
+    unknown = [key for key in wanted if key not in AVAILABLE_ROLES]
+    if unknown:
+        sys.exit(f"Unknown roles: {', '.join(unknown)}")
+
+    client = LLMClient(
+        api_key=os.environ.get("GROQ_API_KEY"),
+        base_url=os.environ.get("LLM_BASE_URL") or None,
+        max_retries=int(os.environ.get("LLM_MAX_RETRIES", "3")),
+        pool_size=args.concurrency,
+        scheduler=LLMScheduler(requests_per_minute=args.rpm)
+    )
+    run(args, BankBuilder(client, args.per_slot), {key: AVAILABLE_ROLES[key] for key in wanted})
+
+
+if __name__ == "__main__":
+    main()
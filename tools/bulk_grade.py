@@ -0,0 +1,242 @@
+"""Offline bulk grading of interview answers with GraderAgent.
+
+Reads a JSONL stream of records such as
+
+    {"id": "cand-17/q3", "question": "...", "answer": "...", "jd": "...", "resume": "..."}
+
+grades each answer (optionally profiling it first) and appends one JSON line per record to
+the output file, in completion order and tagged with the input line number:
+
+    python -m tools.bulk_grade answers.jsonl --output graded.jsonl --concurrency 8 --rpm 600
+
+Only a bounded window of records is in memory at once. Progress is checkpointed next to the
+output (graded.jsonl.checkpoint); rerunning the same command after an interruption skips what
+is done and retries records whose grading failed or fell back to the grader's defaults. An
+output file that has results but no checkpoint is not appended to unless --force is given. --rpm/--tpm cap model calls and estimated
+tokens per minute (through the same LLMScheduler the app uses), and workers pause while the
+grader's circuit breaker is open instead of failing the backlog.
+Uses the same GROQ_API_KEY / LLM_BASE_URL / LLM_MAX_RETRIES settings as the app.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from agents.grader import GraderAgent
+from agents.profiler import ProfilerAgent
+from services.llm_client import LLMClient
+from services.llm_scheduler import LLMScheduler
+
+
+class Checkpoint:
+    """
+    Resumable progress for one output file.
+
+    `line` is the first input line not yet known to be finished; `done` holds finished lines
+    beyond it (results complete out of order) and `failed` the lines to retry on the next run.
+    `output_bytes` is the output size at the last save, so a run that died between writing a
+    result and saving the checkpoint is truncated back rather than duplicating that result.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.line = 0
+        self.done = set()
+        self.failed = set()
+        self.output_bytes = 0
+        self.loaded = os.path.exists(path)
+        if self.loaded:
+            with open(path) as handle:
+                state = json.load(handle)
+            self.line = state["line"]
+            self.done = set(state["done"])
+            self.failed = set(state["failed"])
+            self.output_bytes = state["output_bytes"]
+
+    def pending(self, line):
+        return line in self.failed or (line >= self.line and line not in self.done)
+
+    def finish(self, line, retry, output_bytes):
+        self.failed.discard(line)
+        if retry:
+            self.failed.add(line)
+        self.done.add(line)
+        while self.line in self.done:
+            self.done.discard(self.line)
+            self.line += 1
+        self.output_bytes = output_bytes
+
+    def save(self):
+        state = {"line": self.line, "done": sorted(self.done), "failed": sorted(self.failed),
+                 "output_bytes": self.output_bytes}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as handle:
+            json.dump(state, handle)
+        os.replace(tmp, self.path)
+
+
+class BulkGrader:
+
+    def __init__(self, client, grader, profiler=None):
+        self.client = client
+        self.grader = grader
+        self.profiler = profiler
+
+    def _wait_for_circuit(self, agent):
+        # An open breaker fails calls without trying; wait for its half-open trial instead
+        while self.client.breaker(agent).state == "open":
+            time.sleep(1.0)
+
+    def _call(self, agent, fn, *args):
+        self._wait_for_circuit(agent)
+        with self.client.trace() as calls:
+            result = fn(*args)
+        # Agents answer with defaults (marked "fallback") when the model call fails or its reply
+        # cannot be read; only a traced call whose result is not a fallback counts
+        return result, any(call["agent"] == agent for call in calls) and not result.get("fallback")
+
+    def grade(self, record):
+        """Return (result dict, ok)."""
+        started = time.perf_counter()
+        output = {}
+        if self.profiler is not None:
+            # Best effort: a failed profiler call leaves its defaults and profile_ok false
+            output["profile"], output["profile_ok"] = self._call("profiler", self.profiler.analyze, record.get("answer", ""), [])
+        grade, ok = self._call(
+            "grader", self.grader.evaluate,
+            record.get("answer", ""), record.get("question", ""), record.get("jd", ""), record.get("resume", "")
+        )
+        if not ok:
+            return {"error": "grader reply unusable" if grade.get("fallback") else "grader call failed"}, False
+        output["score"] = grade["score"]
+        output["grade"] = grade
+        output["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return output, True
+
+
+def read_records(handle):
+    """Yield (line number, record or None, error) for each non-blank input line."""
+    for number, line in enumerate(handle):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line), None
+        except ValueError as e:
+            yield number, None, f"invalid JSON: {e}"
+
+
+def run(args, bulk_grader):
+    checkpoint = Checkpoint(args.checkpoint or args.output + ".checkpoint")
+    if not checkpoint.loaded and os.path.exists(args.output) and os.path.getsize(args.output) and not args.force:
+        sys.exit(f"{args.output} already has results but no checkpoint; pass --force to append to it")
+    output = open(args.output, "a+b")
+    if checkpoint.loaded:
+        # Drop a result written after the last checkpoint save; it is graded again
+        output.truncate(checkpoint.output_bytes)
+    output.seek(0, os.SEEK_END)
+
+    lock = threading.Lock()
+    window = threading.BoundedSemaphore(args.concurrency * 2)
+    counts = {"graded": 0, "failed": 0, "skipped": 0}
+    started = time.monotonic()
+    last_report = [started]
+
+    def report(final=False):
+        elapsed = time.monotonic() - started
+        processed = counts["graded"] + counts["failed"]
+        summary = {
+            **counts,
+            "elapsed_seconds": round(elapsed, 1),
+            "records_per_minute": round(processed / elapsed * 60, 1) if elapsed else 0.0,
+        }
+        if final:
+            summary["retry_on_next_run"] = len(checkpoint.failed)
+        print(json.dumps(summary), file=sys.stderr, flush=True)
+
+    def finish(number, record_id, result, ok, retry=False):
+        line = json.dumps({"line": number, "id": record_id, "ok": ok, **result}) + "\n"
+        with lock:
+            if not retry:
+                output.write(line.encode())
+                output.flush()
+            checkpoint.finish(number, retry, output.tell())
+            checkpoint.save()
+            counts["graded" if ok else "failed"] += 1
+            if time.monotonic() - last_report[0] >= args.progress_interval:
+                last_report[0] = time.monotonic()
+                report()
+
+    def work(number, record):
+        try:
+            result, ok = bulk_grader.grade(record)
+        except Exception as e:
+            result, ok = {"error": str(e) or type(e).__name__}, False
+        finally:
+            window.release()
+        # Failed grades are not written; they stay in the checkpoint and are retried next run
+        finish(number, record.get("id"), result, ok, retry=not ok)
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    pool = ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="grade")
+    try:
+        submitted = 0
+        for number, record, error in read_records(source):
+            if not checkpoint.pending(number):
+                counts["skipped"] += 1
+                continue
+            if args.limit and submitted >= args.limit:
+                break
+            if error:
+                # Malformed input will not get better on retry; record it and move on
+                finish(number, None, {"error": error}, False)
+                continue
+            window.acquire()
+            pool.submit(work, number, record)
+            submitted += 1
+    except KeyboardInterrupt:
+        print("Interrupted; finishing in-flight records", file=sys.stderr)
+    finally:
+        pool.shutdown(wait=True)
+        if source is not sys.stdin:
+            source.close()
+        output.close()
+        report(final=True)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL file of records, or - for stdin")
+    parser.add_argument("--output", required=True, help="JSONL file results are appended to")
+    parser.add_argument("--checkpoint", help="Checkpoint path (default: <output>.checkpoint)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Records graded at once")
+    parser.add_argument("--rpm", type=float, help="Maximum model calls per minute across all workers")
+    parser.add_argument("--tpm", type=float, help="Maximum estimated tokens per minute across all workers")
+    parser.add_argument("--profile", action="store_true", help="Also run ProfilerAgent.analyze on each answer")
+    parser.add_argument("--force", action="store_true", help="Append to an output file that has results but no checkpoint")
+    parser.add_argument("--limit", type=int, help="Stop after submitting this many records")
+    parser.add_argument("--progress-interval", type=float, default=10.0, help="Seconds between progress lines")
+    return parser
+
+
+def main():
+    load_dotenv()
+    args = build_parser().parse_args()
+
+    client = LLMClient(
+        api_key=os.environ.get("GROQ_API_KEY"),
+        base_url=os.environ.get("LLM_BASE_URL") or None,
+        max_retries=int(os.environ.get("LLM_MAX_RETRIES", "3")),
+        pool_size=args.concurrency,
+        scheduler=LLMScheduler(requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+    )
+    bulk_grader = BulkGrader(client, GraderAgent(client), ProfilerAgent(client) if args.profile else None)
+    run(args, bulk_grader)
+
+
+if __name__ == "__main__":
+    main()